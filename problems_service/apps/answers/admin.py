@@ -1,4 +1,7 @@
 from django.contrib import admin
+from django.db import transaction
+from apps.questions.cache import invalidate_questions
+from apps.questions.hot import rebuild_ranks
 from .models import Answer
 
 
@@ -31,4 +34,15 @@ class AnswerAdmin(admin.ModelAdmin):
 
     def get_queryset(self, request):
         """Оптимизация запроса с предзагрузкой вопроса"""
-        return super().get_queryset(request).select_related('question')
\ No newline at end of file
+        return super().get_queryset(request).select_related('question')
+
+    def delete_queryset(self, request, queryset):
+        """
+        Удаление выбранных одним запросом минует Answer.delete: рейтинг
+        затронутых вопросов пересчитывается и кэш сбрасывается здесь
+        """
+        question_ids = set(queryset.values_list('question_id', flat=True))
+        with transaction.atomic():
+            super().delete_queryset(request, queryset)
+            rebuild_ranks(list(question_ids))
+        invalidate_questions(question_ids)
@@ -0,0 +1,137 @@
+import csv
+import io
+import logging
+from dataclasses import dataclass, field
+from typing import Any
+
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+from apps.answers.models import Answer
+from apps.questions.cache import invalidate_questions
+from apps.questions.hot import record_answers
+from apps.questions.sequences import reserve_ids
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+@dataclass
+class FailedChunk:
+    start: int
+    size: int
+    error: str
+
+
+@dataclass
+class IngestResult:
+    created: list[Answer] = field(default_factory=list)
+    failed_chunks: list[FailedChunk] = field(default_factory=list)
+
+
+def copy_answers(answers: list[Answer]) -> None:
+    """
+    Вставка через COPY ... FROM STDIN. RETURNING у COPY нет, поэтому id
+    резервируются заранее одним запросом и передаются явно.
+    """
+    now = timezone.now()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for answer, pk in zip(answers, reserve_ids(Answer, len(answers))):
+        answer.id = pk
+        answer.created_at = answer.created_at or now
+        writer.writerow(
+            [
+                answer.id,
+                answer.question_id,
+                answer.user_id,
+                answer.text,
+                answer.created_at.isoformat(),
+            ]
+        )
+
+    sql = (
+        f"COPY {Answer._meta.db_table} (id, question_id, user_id, text, created_at) "
+        "FROM STDIN WITH (FORMAT csv)"
+    )
+    with connection.cursor() as cursor:
+        with cursor.copy(sql) as copy:
+            copy.write(buffer.getvalue())
+    # Как после bulk_create: объекты сохранены
+    for answer in answers:
+        answer._state.adding = False
+        answer._state.db = connection.alias
+
+
+def ingest_answers(
+    answers: list[Answer],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    use_copy: bool = False,
+) -> IngestResult:
+    """
+    Массовая вставка ответов чанками. Каждый чанк коммитится отдельно,
+    поэтому ошибка в одном чанке (например, вопрос удален параллельно)
+    не отменяет уже вставленные.
+    """
+    result = IngestResult()
+    for start in range(0, len(answers), chunk_size):
+        chunk = answers[start : start + chunk_size]
+        try:
+            with transaction.atomic():
+                if use_copy:
+                    copy_answers(chunk)
+                else:
+                    Answer.objects.bulk_create(chunk)
+                # save() не вызывается, поэтому рейтинг и кэш обновляются явно
+                record_answers(chunk)
+                invalidate_questions({answer.question_id for answer in chunk})
+        except DatabaseError as exc:
+            logger.warning("Bulk insert of answers chunk at %s failed: %s", start, exc)
+            result.failed_chunks.append(FailedChunk(start, len(chunk), str(exc)))
+            continue
+        result.created.extend(chunk)
+
+    logger.info(
+        "Bulk inserted %s answers, %s chunks failed",
+        len(result.created),
+        len(result.failed_chunks),
+    )
+    return result
+
+
+def ingest_items(
+    items: list[tuple[int, dict[str, Any]]],
+    question_id: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    use_copy: bool = False,
+) -> tuple[IngestResult, list[dict[str, Any]]]:
+    """
+    Вставка проверенных элементов массовой загрузки (индекс, данные).
+    Ошибки упавших чанков возвращаются по индексам их элементов.
+    """
+    answers = [
+        Answer(
+            question_id=question_id or data["question_id"],
+            user_id=data["user_id"],
+            text=data["text"],
+        )
+        for _, data in items
+    ]
+    result = ingest_answers(answers, chunk_size, use_copy)
+    errors = [
+        {"index": index, "errors": {"non_field_errors": [chunk.error]}}
+        for chunk in result.failed_chunks
+        for index, _ in items[chunk.start : chunk.start + chunk.size]
+    ]
+    return result, errors
+
+
+def summarize(result: IngestResult, errors: list[dict[str, Any]]) -> dict[str, Any]:
+    """Итог массовой загрузки (AnswerBulkResultSerializer)"""
+    return {
+        "created": len(result.created),
+        "failed": len(errors),
+        "ids": [answer.id for answer in result.created if answer.id is not None],
+        "errors": sorted(errors, key=lambda error: error["index"]),
+    }
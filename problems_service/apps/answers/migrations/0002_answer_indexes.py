@@ -0,0 +1,55 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:43
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции
+    atomic = False
+
+    dependencies = [
+        ('answers', '0001_initial'),
+        # расширение pg_trgm
+        ('questions', '0002_question_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='answer',
+            index=models.Index(fields=['question', 'created_at', 'id'], name='answers_question_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='answer',
+            index=models.Index(fields=['user_id', 'created_at', 'id'], name='answers_user_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='answer',
+            index=models.Index(fields=['created_at'], name='answers_created_at_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='answer',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('text'), name='gin_trgm_ops'), name='answers_text_trgm_idx'),
+        ),
+        # Индекс внешнего ключа стал префиксом answers_question_created_idx;
+        # удаляется только после построения нового, без блокировки записи
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    'DROP INDEX CONCURRENTLY IF EXISTS "answers_question_id_1c8a95ab"',
+                    reverse_sql='CREATE INDEX CONCURRENTLY IF NOT EXISTS "answers_question_id_1c8a95ab" ON "answers" ("question_id")',
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='answer',
+                    name='question',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='answers', to='questions.question', verbose_name='Вопрос'),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:47
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Добавление хранимой генерируемой колонки переписывает таблицу
+    # под ACCESS EXCLUSIVE, индекс затем строится без блокировки записи
+    atomic = False
+
+    dependencies = [
+        ('answers', '0002_answer_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='answer',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('text', config='russian'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        AddIndexConcurrently(
+            model_name='answer',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='answers_search_idx'),
+        ),
+    ]
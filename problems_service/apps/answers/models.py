@@ -1,9 +1,82 @@
 from typing import Any
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import IntegrityError, connections, models, transaction
+from django.db.models.functions import Upper
+from django.utils import timezone
 import logging
 
+from apps.questions.cache import invalidate_question
+from apps.questions.hot import forget_answer, record_answer
+
 logger = logging.getLogger(__name__)
 
+# Существование вопроса проверяется тем же запросом, что вставляет ответ.
+# Вопрос, удаленный параллельно до коммита, отсекает внешний ключ
+INSERT_FOR_QUESTION_SQL = """
+INSERT INTO answers (question_id, user_id, text, created_at)
+SELECT id, %(user_id)s, %(text)s, %(created_at)s
+FROM questions
+WHERE id = %(question_id)s AND deleted_at IS NULL
+RETURNING id
+"""
+
+FOREIGN_KEY_VIOLATION = "23503"
+
+
+class AnswerQuerySet(models.QuerySet["Answer"]):
+    def visible(self) -> "AnswerQuerySet":
+        """Без ответов на удаленные (soft delete), но еще не вычищенные вопросы"""
+        return self.filter(question__deleted_at__isnull=True)
+
+    def create_for_question(
+        self, question_id: int, user_id: str, text: str
+    ) -> "Answer | None":
+        """
+        Ответ на неудаленный вопрос без предварительного SELECT вопроса;
+        None - вопроса нет или он удален
+        """
+        answer = self.model(
+            question_id=question_id,
+            user_id=user_id,
+            text=text,
+            created_at=timezone.now(),
+        )
+        params: dict[str, Any] = {
+            "question_id": question_id,
+            "user_id": user_id,
+            "text": text,
+            "created_at": answer.created_at,
+        }
+        try:
+            with transaction.atomic(using=self.db):
+                with connections[self.db].cursor() as cursor:
+                    cursor.execute(INSERT_FOR_QUESTION_SQL, params)
+                    row = cursor.fetchone()
+                if row is None:
+                    return None
+                answer.pk = row[0]
+                answer._state.adding = False
+                answer._state.db = self.db
+                record_answer(answer)
+        except IntegrityError as exc:
+            # Внешний ключ отложенный: нарушение всплывает при коммите
+            if getattr(exc.__cause__, "sqlstate", None) != FOREIGN_KEY_VIOLATION:
+                raise
+            return None
+        invalidate_question(question_id)
+        logger.info("Created answer %s for question %s", answer.id, question_id)
+        return answer
+
+
+BaseAnswerManager = models.Manager.from_queryset(AnswerQuerySet)
+
+
+class AnswerManager(BaseAnswerManager["Answer"]):
+    def get_queryset(self) -> AnswerQuerySet:
+        # tsvector нужен только поиску, не тянем его в каждый SELECT
+        return AnswerQuerySet(self.model, using=self._db).defer("search_vector")
+
 
 class Answer(models.Model):
     question = models.ForeignKey(
@@ -11,35 +84,84 @@ class Answer(models.Model):
         on_delete=models.CASCADE,
         related_name="answers",
         verbose_name=("Вопрос"),
+        # покрывается индексом answers_question_created_idx
+        db_index=False,
     )
     user_id = models.CharField(
         max_length=36, help_text="Идентификатор пользователя (UUID)"
     )
     text = models.TextField(max_length=2000, help_text="Текс ответа")
     created_at = models.DateTimeField(auto_now_add=True)
+    search_vector = models.GeneratedField(
+        expression=SearchVector("text", config="russian"),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = AnswerManager()
 
     class Meta:
         db_table = "answers"
         verbose_name = "Ответ"
         verbose_name_plural = "Ответы"
+        indexes = [
+            # Ответы вопроса по времени (встраивание последних, keyset-пагинация)
+            models.Index(
+                fields=["question", "created_at", "id"],
+                name="answers_question_created_idx",
+            ),
+            # Ответы пользователя по времени
+            models.Index(
+                fields=["user_id", "created_at", "id"],
+                name="answers_user_created_idx",
+            ),
+            models.Index(fields=["created_at"], name="answers_created_at_idx"),
+            # icontains в поиске админки строится как UPPER(text) LIKE UPPER(...)
+            GinIndex(
+                OpClass(Upper("text"), name="gin_trgm_ops"),
+                name="answers_text_trgm_idx",
+            ),
+            GinIndex(fields=["search_vector"], name="answers_search_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"Answer {self.id} to {self.question_id}"
 
     def save(self, *args: Any, **kwargs: Any) -> None:
         is_new = self.pk is None
-        result = super().save(*args, **kwargs)
+        with transaction.atomic():
+            # Ответ, перенесенный к другому вопросу (админка), переходит в его рейтинг
+            moved_from = None
+            if not is_new:
+                previous = (
+                    Answer.objects.filter(pk=self.pk)
+                    .values_list("question_id", "created_at")
+                    .first()
+                )
+                if previous is not None and previous[0] != self.question_id:
+                    moved_from = previous
+            result = super().save(*args, **kwargs)
+            if moved_from is not None:
+                forget_answer(*moved_from)
+            if is_new or moved_from is not None:
+                record_answer(self)
+        if moved_from is not None:
+            invalidate_question(moved_from[0])
+        invalidate_question(self.question_id)
 
         if is_new:
-            logger.info(f"Created answer {self.id} for question {self.question_id}")
+            logger.info("Created answer %s for question %s", self.id, self.question_id)
             return result
         else:
-            logger.info(f"Updated answer {self.id} for question {self.question_id}")
+            logger.info("Updated answer %s for question %s", self.id, self.question_id)
             return result
 
     def delete(self, *args: Any, **kwargs: Any) -> tuple[int, dict[str, int]]:
         answer_id = self.id
         question_id = self.question_id
-        result = super().delete(*args, **kwargs)
-        logger.info(f"Delete answer {answer_id} from question {question_id}")
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            forget_answer(question_id, self.created_at)
+        invalidate_question(question_id)
+        logger.info("Delete answer %s from question %s", answer_id, question_id)
         return result
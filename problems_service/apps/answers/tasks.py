@@ -0,0 +1,20 @@
+from typing import Any
+
+from apps.answers.bulk import DEFAULT_CHUNK_SIZE, ingest_items, summarize
+from apps.jobs.models import Job
+from apps.jobs.queue import task
+
+
+# Чанки коммитятся по отдельности, и повтор вставил бы их второй раз
+@task("answers.bulk_ingest", max_attempts=1)
+def bulk_ingest(
+    job: Job,
+    items: list[tuple[int, dict[str, Any]]],
+    question_id: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    use_copy: bool = False,
+    errors: list[dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    """Массовая загрузка ответов из POST .../bulk/?async=true"""
+    result, chunk_errors = ingest_items(items, question_id, chunk_size, use_copy)
+    return summarize(result, (errors or []) + chunk_errors)
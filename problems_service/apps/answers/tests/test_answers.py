@@ -1,9 +1,22 @@
+import json
+import threading
+import time
 import pytest
 import uuid
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.db.models import Count
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from apps.answers.bulk import ingest_answers
+from apps.api.pagination import (
+    LatestFirstKeysetPagination,
+    QuestionGroupPagination,
+    UserAnswersPagination,
+)
 from apps.questions.models import Question
 from apps.answers.models import Answer
 
@@ -114,6 +127,14 @@ class TestAnswerAPI:
         )
         assert response.status_code == status.HTTP_404_NOT_FOUND
     
+    def test_create_answer_invalid_question_and_body(self, api_client):
+        """Тест: для несуществующего вопроса 404 важнее ошибок тела"""
+        url = reverse('api:answers:answer-create', kwargs={'question_id': 999})
+
+        response = api_client.post(url, {'user_id': 'user_1', 'text': ''}, format='json')
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
     def test_get_answer_detail(self, api_client, sample_answer):
         """Тест получения деталей ответа"""
         response = api_client.get(
@@ -130,4 +151,435 @@ class TestAnswerAPI:
             reverse('api:answers:answer-detail', kwargs={'pk': answer_id})
         )
         assert response.status_code == status.HTTP_204_NO_CONTENT
-        assert not Answer.objects.filter(id=answer_id).exists()
\ No newline at end of file
+        assert not Answer.objects.filter(id=answer_id).exists()
+
+@pytest.mark.django_db
+class TestAnswerQueryCount:
+    """Регрессионные тесты количества SQL-запросов"""
+
+    @pytest.fixture
+    def api_client(self):
+        return APIClient()
+
+    @pytest.fixture
+    def sample_answer(self):
+        question = Question.objects.create(text="Вопрос?")
+        return Answer.objects.create(question=question, user_id="user_1", text="Ответ")
+
+    def test_detail_queries(self, api_client, sample_answer, django_assert_num_queries):
+        """Детали ответа: один запрос с вопросом"""
+        with django_assert_num_queries(1):
+            response = api_client.get(
+                reverse('api:answers:answer-detail', kwargs={'pk': sample_answer.id})
+            )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['question_id'] == sample_answer.question_id
+
+    def test_create_queries(self, api_client, sample_answer):
+        """Создание ответа: вопрос не читается отдельным запросом"""
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(
+                reverse('api:answers:answer-create', kwargs={'question_id': sample_answer.question_id}),
+                {'user_id': 'user_2', 'text': 'Еще ответ'},
+                format='json',
+            )
+        statements = [
+            query['sql'] for query in queries.captured_queries
+            if not query['sql'].startswith(('SAVEPOINT', 'RELEASE SAVEPOINT'))
+        ]
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(statements) == 2
+        assert statements[0].lstrip().startswith('INSERT INTO answers')
+        assert statements[1].lstrip().startswith('INSERT INTO question_ranks')
+
+
+@pytest.mark.django_db
+class TestQuestionAnswersList:
+    """Тесты постраничного списка ответов на вопрос"""
+
+    @pytest.fixture
+    def api_client(self):
+        return APIClient()
+
+    @pytest.fixture
+    def question_with_answers(self, monkeypatch):
+        monkeypatch.setattr(LatestFirstKeysetPagination, "page_size", 2)
+        question = Question.objects.create(text="Популярный вопрос?")
+        answers = [
+            Answer.objects.create(question=question, user_id=f"user_{i}", text=f"Ответ {i}")
+            for i in range(5)
+        ]
+        Answer.objects.create(
+            question=Question.objects.create(text="Другой вопрос?"),
+            user_id="other",
+            text="Чужой ответ",
+        )
+        return question, answers
+
+    def test_list_answers_latest_first(self, api_client, question_with_answers):
+        """Тест обхода всех ответов вопроса по курсору"""
+        question, answers = question_with_answers
+        url = reverse('api:answers:answer-create', kwargs={'question_id': question.id})
+
+        ids = []
+        while url:
+            response = api_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert len(response.data['results']) <= 2
+            ids += [item['id'] for item in response.data['results']]
+            url = response.data['next']
+
+        assert ids == [answer.id for answer in reversed(answers)]
+
+    def test_list_answers_invalid_question(self, api_client):
+        """Тест списка ответов несуществующего вопроса"""
+        response = api_client.get(
+            reverse('api:answers:answer-create', kwargs={'question_id': 999})
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_embedded_answers_limit(self, api_client, question_with_answers, django_assert_num_queries):
+        """Тест встраивания только последних ответов в список вопросов"""
+        question, answers = question_with_answers
+        url = reverse('api:questions:question-list-create') + '?answers_limit=2'
+
+        with django_assert_num_queries(3):
+            response = api_client.get(url)
+
+        data = next(item for item in response.data['results'] if item['id'] == question.id)
+        assert [item['id'] for item in data['answers']] == [answers[4].id, answers[3].id]
+        assert data['answers_count'] == 5
+
+    def test_embedded_answers_limit_detail(self, api_client, question_with_answers):
+        """Тест ограничения ответов в деталях вопроса"""
+        question, answers = question_with_answers
+        response = api_client.get(
+            reverse('api:questions:question-detail', kwargs={'pk': question.id}),
+            {'answers_limit': 1},
+        )
+        assert [item['id'] for item in response.data['answers']] == [answers[4].id]
+        assert response.data['answers_count'] == 5
+
+
+@pytest.mark.django_db
+class TestUserAnswersList:
+    """Тесты истории ответов пользователя"""
+
+    @pytest.fixture
+    def api_client(self):
+        return APIClient()
+
+    @pytest.fixture
+    def user_answers(self, monkeypatch):
+        monkeypatch.setattr(UserAnswersPagination, "page_size", 2)
+        monkeypatch.setattr(QuestionGroupPagination, "page_size", 2)
+        questions = [Question.objects.create(text=f"Вопрос {i}?") for i in range(3)]
+        answers = [
+            Answer.objects.create(question=questions[i % 3], user_id="moderated", text=f"Ответ {i}")
+            for i in range(5)
+        ]
+        Answer.objects.create(question=questions[0], user_id="other", text="Чужой ответ")
+        return questions, answers
+
+    def url(self, user_id="moderated"):
+        return reverse('api:answers:user-answer-list', kwargs={'user_id': user_id})
+
+    def test_list_latest_first(self, api_client, user_answers):
+        """Тест обхода всех ответов пользователя по курсору"""
+        _, answers = user_answers
+        url = self.url() + '?count=exact'
+
+        ids = []
+        while url:
+            response = api_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert response.data['count'] == 5
+            ids += [item['id'] for item in response.data['results']]
+            url = response.data['next']
+
+        assert ids == [answer.id for answer in reversed(answers)]
+
+    def test_ordering_by_id_is_ignored(self, api_client, user_answers):
+        """Порядок по id не поддерживается индексом и заменяется порядком по умолчанию"""
+        _, answers = user_answers
+        response = api_client.get(self.url(), {'ordering': 'id'})
+        assert [item['id'] for item in response.data['results']] == [answers[4].id, answers[3].id]
+
+    def test_unknown_user(self, api_client, user_answers):
+        response = api_client.get(self.url('nobody'))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['results'] == []
+
+    def test_group_by_question(self, api_client, user_answers):
+        """Тест группировки ответов пользователя по вопросам"""
+        questions, answers = user_answers
+        response = api_client.get(self.url(), {'group_by': 'question'})
+        assert response.status_code == status.HTTP_200_OK
+        assert [(item['question_id'], item['answers_count']) for item in response.data['results']] == [
+            (questions[0].id, 2),
+            (questions[1].id, 2),
+        ]
+
+        response = api_client.get(response.data['next'])
+        assert response.data['results'] == [
+            {
+                'question_id': questions[2].id,
+                'answers_count': 1,
+                'last_answer_at': answers[2].created_at.isoformat().replace('+00:00', 'Z'),
+            }
+        ]
+        assert response.data['next'] is None
+
+    def test_invalid_group_by(self, api_client, user_answers):
+        response = api_client.get(self.url(), {'group_by': 'user'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_queries(self, api_client, user_answers, django_assert_num_queries):
+        """Страница ответов пользователя - один запрос"""
+        with django_assert_num_queries(1):
+            response = api_client.get(self.url())
+        assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+class TestAnswerBulkCreate:
+    """Тесты массовой загрузки ответов"""
+
+    @pytest.fixture
+    def api_client(self):
+        return APIClient()
+
+    @pytest.fixture
+    def sample_question(self):
+        return Question.objects.create(text="Вопрос для импорта?")
+
+    def test_bulk_create_for_question(self, api_client, sample_question):
+        """Тест загрузки JSON-массива в один вопрос"""
+        data = [
+            {"user_id": "user_1", "text": "Первый ответ"},
+            {"user_id": "user_2", "text": "Второй ответ"},
+        ]
+        response = api_client.post(
+            reverse('api:answers:question-answer-bulk-create', kwargs={'question_id': sample_question.id}),
+            data,
+            format='json',
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['created'] == 2
+        assert response.data['errors'] == []
+        assert sorted(response.data['ids']) == sorted(sample_question.answers.values_list('id', flat=True))
+
+    def test_bulk_create_reports_invalid_items(self, api_client, sample_question):
+        """Тест частичной загрузки с отчетом по невалидным элементам"""
+        data = [
+            {"user_id": "user_1", "text": "Валидный ответ"},
+            {"user_id": "", "text": "Без пользователя"},
+            "не объект",
+        ]
+        response = api_client.post(
+            reverse('api:answers:question-answer-bulk-create', kwargs={'question_id': sample_question.id}),
+            data,
+            format='json',
+        )
+        assert response.status_code == status.HTTP_207_MULTI_STATUS
+        assert response.data['created'] == 1
+        assert [error['index'] for error in response.data['errors']] == [1, 2]
+        assert 'user_id' in response.data['errors'][0]['errors']
+
+    def test_bulk_create_ndjson_cross_question(self, api_client, sample_question):
+        """Тест загрузки NDJSON в разные вопросы"""
+        other = Question.objects.create(text="Другой вопрос?")
+        body = "\n".join([
+            json.dumps({"question_id": sample_question.id, "user_id": "u1", "text": "Ответ 1"}),
+            json.dumps({"question_id": other.id, "user_id": "u2", "text": "Ответ 2"}),
+            json.dumps({"question_id": 999999, "user_id": "u3", "text": "Ответ 3"}),
+        ])
+        response = api_client.post(
+            reverse('api:answers:answer-bulk-create'),
+            body,
+            content_type='application/x-ndjson',
+        )
+        assert response.status_code == status.HTTP_207_MULTI_STATUS
+        assert response.data['created'] == 2
+        assert response.data['errors'] == [{'index': 2, 'errors': {'question_id': ['Вопрос не найден']}}]
+        assert other.answers.count() == 1
+
+    def test_bulk_create_copy(self, api_client, sample_question):
+        """Тест загрузки через COPY"""
+        data = [{"user_id": f"user_{i}", "text": f"Ответ {i}"} for i in range(5)]
+        response = api_client.post(
+            reverse('api:answers:question-answer-bulk-create', kwargs={'question_id': sample_question.id})
+            + '?method=copy&chunk_size=2',
+            data,
+            format='json',
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['created'] == 5
+        assert sample_question.answers.count() == 5
+        assert sample_question.answers.filter(created_at__isnull=True).count() == 0
+        # id резервируются заранее и возвращаются, как у bulk_create
+        assert response.data['ids'] == list(
+            sample_question.answers.order_by('id').values_list('id', flat=True)
+        )
+        assert response.data['ids'] == sorted(response.data['ids'])
+
+    def test_bulk_create_invalid_question(self, api_client):
+        """Тест загрузки в несуществующий вопрос"""
+        response = api_client.post(
+            reverse('api:answers:question-answer-bulk-create', kwargs={'question_id': 999}),
+            [{"user_id": "user_1", "text": "Ответ"}],
+            format='json',
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_bulk_create_requires_list(self, api_client, sample_question):
+        """Тест тела запроса не в виде массива"""
+        response = api_client.post(
+            reverse('api:answers:question-answer-bulk-create', kwargs={'question_id': sample_question.id}),
+            {"user_id": "user_1", "text": "Ответ"},
+            format='json',
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_bulk_create_invalidates_cache(self, api_client, sample_question):
+        """Тест сброса кэша деталей вопроса после загрузки"""
+        detail_url = reverse('api:questions:question-detail', kwargs={'pk': sample_question.id})
+        api_client.get(detail_url)
+
+        api_client.post(
+            reverse('api:answers:question-answer-bulk-create', kwargs={'question_id': sample_question.id}),
+            [{"user_id": "user_1", "text": "Ответ"}],
+            format='json',
+        )
+        assert api_client.get(detail_url).data['answers_count'] == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_ingest_answers_commits_chunks_separately():
+    """Тест частичного коммита: чанк с удаленным вопросом не отменяет остальные"""
+    question = Question.objects.create(text="Вопрос?")
+    answers = [
+        Answer(question_id=question.id, user_id="u1", text="Ответ 1"),
+        Answer(question_id=question.id, user_id="u2", text="Ответ 2"),
+        Answer(question_id=question.id + 1000, user_id="u3", text="Ответ 3"),
+    ]
+
+    result = ingest_answers(answers, chunk_size=2)
+
+    assert len(result.created) == 2
+    assert [(chunk.start, chunk.size) for chunk in result.failed_chunks] == [(2, 1)]
+    assert Answer.objects.count() == 2
+
+
+def wait_for_lock(timeout=5):
+    """Ждать, пока другое соединение не встанет в ожидание блокировки строки"""
+    deadline = time.monotonic() + timeout
+    with connection.cursor() as cursor:
+        while time.monotonic() < deadline:
+            cursor.execute(
+                "SELECT count(*) FROM pg_stat_activity "
+                "WHERE wait_event_type = 'Lock' AND datname = current_database()"
+            )
+            if cursor.fetchone()[0]:
+                return True
+            time.sleep(0.01)
+    return False
+
+
+@pytest.mark.django_db(transaction=True)
+def test_create_answer_concurrent_question_delete():
+    """Тест: вопрос удален, пока создавался ответ - 404 без осиротевших ответов"""
+    question = Question.objects.create(text="Вопрос?")
+    other = Question.objects.create(text="Другой вопрос?")
+    before = Answer.objects.create(question=other, user_id='user_1', text='Ответ')
+    deleted, release = threading.Event(), threading.Event()
+    responses = []
+
+    def delete_question():
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute('DELETE FROM questions WHERE id = %s', [question.id])
+            deleted.set()
+            release.wait(5)
+        connection.close()
+
+    def create_answer():
+        responses.append(APIClient().post(
+            reverse('api:answers:answer-create', kwargs={'question_id': question.id}),
+            {'user_id': 'user_1', 'text': 'Ответ'},
+            format='json',
+        ))
+        connection.close()
+
+    deleter = threading.Thread(target=delete_question)
+    deleter.start()
+    assert deleted.wait(5)
+    # Незакоммиченное удаление еще не видно: ответ вставляется, и проверка
+    # отложенного внешнего ключа при коммите ждет блокировку строки вопроса
+    creator = threading.Thread(target=create_answer)
+    creator.start()
+    locked = wait_for_lock()
+    release.set()
+    deleter.join()
+    creator.join()
+
+    assert locked
+    assert responses[0].status_code == status.HTTP_404_NOT_FOUND
+    assert not Answer.objects.filter(question_id=question.id).exists()
+    # INSERT выполнился и откатился по внешнему ключу: его id пропущен
+    after = Answer.objects.create(question=other, user_id='user_1', text='Ответ')
+    assert after.id == before.id + 2
+
+
+@pytest.mark.django_db
+class TestAnswerIndexes:
+    """Планировщик использует индексы для типовых запросов к ответам"""
+
+    @pytest.fixture(autouse=True)
+    def answers(self):
+        questions = Question.objects.bulk_create(
+            [Question(text=f"Вопрос {i}?") for i in range(20)]
+        )
+        Answer.objects.bulk_create(
+            Answer(question=question, user_id=f"user_{j}", text=f"Ответ номер {j}")
+            for question in questions
+            for j in range(50)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE answers")
+            # На тестовом объеме чтение всей таблицы и сортировка всегда дешевле,
+            # поэтому проверяем, что индекс подходит под форму запроса
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_sort = off")
+
+    def test_question_answers_latest_first(self):
+        question_id = Question.objects.values_list('id', flat=True).first()
+        plan = Answer.objects.filter(question_id=question_id).order_by('-created_at', '-id')[:20].explain()
+        assert 'answers_question_created_idx' in plan
+        assert 'Sort' not in plan
+
+    def test_user_answers_latest_first(self):
+        plan = Answer.objects.filter(user_id='user_7').order_by('-created_at', '-id')[:20].explain()
+        assert 'answers_user_created_idx' in plan
+        assert 'Sort' not in plan
+
+    def test_user_answers_by_question(self):
+        """Группы сортируются после выборки ответов пользователя по индексу"""
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_sort = on")
+        plan = (
+            Answer.objects.filter(user_id='user_7')
+            .values('question_id')
+            .annotate(count=Count('id'))
+            .order_by('question_id')[:20]
+            .explain()
+        )
+        assert 'answers_user_created_idx' in plan
+
+    def test_created_at_range(self):
+        plan = Answer.objects.filter(created_at__gte=timezone.now()).explain()
+        assert 'answers_created_at_idx' in plan
+
+    def test_text_icontains(self):
+        plan = Answer.objects.filter(text__icontains='номер 4').order_by().explain()
+        assert 'answers_text_trgm_idx' in plan
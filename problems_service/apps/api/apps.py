@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.api'
+
+    def ready(self) -> None:
+        from apps.api.metrics import install_query_wrapper
+
+        # Счетчик SQL-запросов для метрик запроса (PerformanceMiddleware)
+        connection_created.connect(install_query_wrapper)
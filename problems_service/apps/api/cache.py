@@ -0,0 +1,104 @@
+import hashlib
+import time
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.http.response import HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from apps.questions.cache import get_api_cache, get_versions
+
+
+class CachedResponseMixin:
+    """
+    Read-through кэш GET-ответов: обработчик GET сначала вызывает
+    aget_cached_response и возвращает его результат, если он есть.
+    Ключ строится из версий данных (get_cache_version_keys) и параметров
+    запроса, поэтому запись не удаляется при изменениях, а просто перестает
+    совпадать. ETag и Last-Modified вычисляются из версий, и условный
+    запрос получает 304 без обращения к базе.
+
+    Last-Modified точен до секунды: вторая запись в ту же секунду не
+    изменила бы его, и If-Modified-Since вернул бы устаревший 304. Поэтому
+    он отдается и проверяется, только когда секунда последней версии
+    прошла - тогда любая следующая запись даст больший Last-Modified.
+    До этого условные запросы работают по ETag.
+    """
+
+    cache_prefix = "response"
+
+    def get_cache_version_keys(self) -> list[str]:
+        raise NotImplementedError
+
+    def get_cache_key(self, request: Request, versions: dict[str, int]) -> str:
+        query = sorted(request.query_params.lists())
+        parts = [
+            self.cache_prefix,
+            # Ссылки next/previous абсолютные, поэтому хост входит в ключ
+            request.build_absolute_uri(request.path),
+            request.accepted_media_type or "",
+            repr(query),
+            *(f"{key}={version}" for key, version in sorted(versions.items())),
+        ]
+        digest = hashlib.md5(
+            "|".join(parts).encode(), usedforsecurity=False
+        ).hexdigest()
+        return f"{self.cache_prefix}:{digest}"
+
+    def get_cached_response(self, request: Request) -> HttpResponseBase | None:
+        """
+        304 или закэшированный ответ. Если ответа в кэше нет, запоминает
+        ключ, и finalize_response сохранит сформированный ответ.
+        """
+        versions = get_versions(self.get_cache_version_keys())
+        cache_key = self.get_cache_key(request, versions)
+        self.etag = quote_etag(cache_key.rsplit(":", 1)[-1])
+        modified = max(versions.values(), default=0) // 10**9
+        self.last_modified = modified if time.time() >= modified + 1 else None
+
+        not_modified = get_conditional_response(
+            request._request, etag=self.etag, last_modified=self.last_modified
+        )
+        if not_modified is not None:
+            return self.set_validators(not_modified)
+
+        cached = get_api_cache().get(cache_key)
+        if cached is not None:
+            content, content_type = cached
+            return self.set_validators(HttpResponse(content, content_type=content_type))
+
+        self.cache_miss_key = cache_key
+        return None
+
+    async def aget_cached_response(
+        self, request: Request
+    ) -> HttpResponseBase | None:
+        return await sync_to_async(self.get_cached_response)(request)
+
+    def finalize_response(
+        self, request: Request, response: Response, *args: Any, **kwargs: Any
+    ) -> Response:
+        response = super().finalize_response(  # type: ignore[misc]
+            request, response, *args, **kwargs
+        )
+        cache_key = getattr(self, "cache_miss_key", None)
+        if cache_key and isinstance(response, Response) and response.status_code == 200:
+            response.render()
+            get_api_cache().set(
+                cache_key,
+                (response.content, response["Content-Type"]),
+                settings.API_CACHE_TIMEOUT,
+            )
+            self.set_validators(response)
+        return response
+
+    def set_validators(self, response: HttpResponseBase) -> HttpResponseBase:
+        response["ETag"] = self.etag
+        if self.last_modified is not None:
+            response["Last-Modified"] = http_date(self.last_modified)
+        return response
@@ -0,0 +1,113 @@
+import csv
+import itertools
+from datetime import datetime
+from typing import Any, AsyncIterator, Iterator
+
+from asgiref.sync import sync_to_async
+from django.db.models import QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.utils.encoders import JSONEncoder
+
+from apps.answers.models import Answer
+from apps.questions.models import Question
+
+DEFAULT_CHUNK_SIZE = 2000
+
+# Выгружаемые таблицы и их колонки; удаленные вопросы и их ответы не выгружаются
+EXPORT_TABLES: dict[str, tuple[QuerySet[Any], list[str]]] = {
+    "questions": (Question.objects.all(), ["id", "text", "created_at"]),
+    "answers": (
+        Answer.objects.visible(),
+        ["id", "question_id", "user_id", "text", "created_at"],
+    ),
+}
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+class Echo:
+    """Буфер для csv.writer, возвращающий строку вместо записи"""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def parse_since(value: str | None) -> datetime | None:
+    """Граница инкрементальной выгрузки; ValueError для некорректного значения"""
+    if not value:
+        return None
+    since = parse_datetime(value)
+    if since is None:
+        raise ValueError(value)
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+def export_rows(
+    table: str,
+    since: datetime | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[dict[str, Any]]:
+    """
+    Строки таблицы по возрастанию id. iterator() на PostgreSQL читает
+    через серверный курсор, поэтому память не растет с размером таблицы.
+    """
+    queryset, fields = EXPORT_TABLES[table]
+    queryset = queryset.order_by("id").values(*fields)
+    if since is not None:
+        queryset = queryset.filter(created_at__gte=since)
+    return queryset.iterator(chunk_size=chunk_size)
+
+
+def render_ndjson(rows: Iterator[dict[str, Any]]) -> Iterator[str]:
+    encoder = JSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(row) + "\n"
+
+
+def render_csv(rows: Iterator[dict[str, Any]], fields: list[str]) -> Iterator[str]:
+    writer = csv.DictWriter(Echo(), fieldnames=fields)
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow(
+            {
+                key: value.isoformat() if isinstance(value, datetime) else value
+                for key, value in row.items()
+            }
+        )
+
+
+def export_table(
+    table: str,
+    output_format: str,
+    since: datetime | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[str]:
+    rows = export_rows(table, since, chunk_size)
+    if output_format == "csv":
+        return render_csv(rows, EXPORT_TABLES[table][1])
+    return render_ndjson(rows)
+
+
+async def aiterate(
+    iterator: Iterator[str], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> AsyncIterator[str]:
+    """
+    Асинхронная обертка выгрузки для ASGI: синхронный итератор ASGI-обработчик
+    Django сначала читает целиком в память. Пачки строк читаются в потоке
+    sync_to_async запроса, там же, где открыт серверный курсор.
+    """
+    next_chunk = sync_to_async(lambda: list(itertools.islice(iterator, chunk_size)))
+    try:
+        while chunk := await next_chunk():
+            yield "".join(chunk)
+    finally:
+        # При обрыве соединения курсор закрывается в том же потоке
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await sync_to_async(close)()
@@ -0,0 +1,115 @@
+from inspect import iscoroutinefunction
+from typing import Any, TypeVar
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db.models import Model, QuerySet
+from django.http import Http404, HttpRequest
+from django.http.response import HttpResponseBase
+from rest_framework import generics, views
+from rest_framework.response import Response
+
+from apps.api.metrics import track_serialize
+
+_MT = TypeVar("_MT", bound=Model)
+_RT = TypeVar("_RT")
+
+
+class AsyncAPIView(views.APIView):
+    """
+    APIView с async-обработчиками (async def get/post/delete). Под ASGI
+    запрос не занимает поток, пока ждет базу: обработчик использует async
+    API ORM. Аутентификация, проверка прав и финализация ответа остаются
+    синхронными и выполняются через sync_to_async.
+    """
+
+    def dispatch(  # type: ignore[override]
+        self, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> Any:
+        if not self.view_is_async:
+            return super().dispatch(request, *args, **kwargs)
+        return self.adispatch(request, *args, **kwargs)
+
+    async def adispatch(
+        self, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase:
+        """То же, что APIView.dispatch, но с ожиданием обработчика"""
+        self.args = args
+        self.kwargs = kwargs
+        drf_request = self.initialize_request(request, *args, **kwargs)
+        self.request = drf_request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(drf_request, *args, **kwargs)
+
+            method = (drf_request.method or "").lower()
+            if method in self.http_method_names:
+                handler = getattr(self, method, self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if iscoroutinefunction(handler):
+                response = await handler(drf_request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(drf_request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = await sync_to_async(self.finalize_response)(
+            drf_request, response, *args, **kwargs
+        )
+        return self.response
+
+
+class AsyncGenericAPIView(AsyncAPIView, generics.GenericAPIView[_MT]):
+    """
+    Async-аналоги get_object, paginate_queryset и list из GenericAPIView.
+    Для быстрого пути чтения get_queryset может вернуть .values(),
+    а aserialize - собрать данные из строк без сериализатора.
+    """
+
+    async def aget_object(self) -> _MT:
+        return await self.alookup(self.filter_queryset(self.get_queryset()))
+
+    async def aget_row(self, *fields: str) -> dict[str, Any]:
+        """Как aget_object, но строка .values(*fields) вместо модели"""
+        return await self.alookup(
+            self.filter_queryset(self.get_queryset()).values(*fields)
+        )
+
+    async def alookup(self, queryset: QuerySet[Any, _RT]) -> _RT:
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        filter_kwargs = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        try:
+            obj = await queryset.aget(**filter_kwargs)
+        except (ObjectDoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def apaginate_queryset(self, queryset: QuerySet[Any]) -> list[Any] | None:
+        paginator = self.paginator
+        if paginator is None:
+            return None
+        apaginate = getattr(paginator, "apaginate_queryset", None)
+        if apaginate is None:
+            page: list[Any] | None = await sync_to_async(paginator.paginate_queryset)(
+                queryset, self.request, view=self
+            )
+            return page
+        return await apaginate(queryset, self.request, view=self)  # type: ignore[no-any-return]
+
+    async def aserialize(self, rows: list[Any]) -> Any:
+        """Данные ответа для строк списка"""
+        return self.get_serializer(rows, many=True).data
+
+    async def alist(self) -> Response:
+        queryset = self.filter_queryset(self.get_queryset())
+        page = await self.apaginate_queryset(queryset)
+        if page is None:
+            page = [obj async for obj in queryset]
+            with track_serialize():
+                return Response(await self.aserialize(page))
+        with track_serialize():
+            return self.get_paginated_response(await self.aserialize(page))
@@ -0,0 +1,81 @@
+import atexit
+import json
+import logging
+import logging.config
+import random
+from typing import Any, Iterable
+
+# Стандартные атрибуты LogRecord; остальные пришли через extra=
+RECORD_ATTRIBUTES = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", None, None))
+) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна JSON-строка на запись: время, уровень, логгер, сообщение и поля из extra"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "message": record.getMessage(),
+        }
+        payload.update(
+            (key, value)
+            for key, value in vars(record).items()
+            if key not in RECORD_ATTRIBUTES
+        )
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Пропускает долю rate частых записей: уровня не выше level, шаблон
+    сообщения которых начинается с одного из prefixes. Остальные записи
+    проходят всегда. Отброшенная запись не форматируется.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        level: int | str = logging.INFO,
+        prefixes: Iterable[str] = ("Retrieved",),
+    ) -> None:
+        super().__init__()
+        self.rate = rate
+        self.level = (
+            level if isinstance(level, int) else logging.getLevelNamesMapping()[level]
+        )
+        self.prefixes = tuple(prefixes)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate >= 1 or record.levelno > self.level:
+            return True
+        if not isinstance(record.msg, str) or not record.msg.startswith(self.prefixes):
+            return True
+        return random.random() < self.rate
+
+
+def configure_logging(config: dict[str, Any]) -> None:
+    """
+    LOGGING_CONFIG: dictConfig и запуск QueueListener у обработчиков
+    QueueHandler (dictConfig создает слушателя, но не запускает). При выходе
+    слушатель останавливается и дописывает оставшиеся в очереди записи.
+    """
+    logging.config.dictConfig(config)
+    loggers = [logging.getLogger(), *map(logging.getLogger, config.get("loggers", {}))]
+    listeners = {
+        id(listener): listener
+        for logger in loggers
+        for handler in logger.handlers
+        if (listener := getattr(handler, "listener", None)) is not None
+    }
+    for listener in listeners.values():
+        listener.start()
+        atexit.register(listener.stop)
@@ -0,0 +1,48 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from apps.api.export import (
+    DEFAULT_CHUNK_SIZE,
+    EXPORT_FORMATS,
+    EXPORT_TABLES,
+    export_table,
+    parse_since,
+)
+
+
+class Command(BaseCommand):
+    help = "Потоковая выгрузка вопросов или ответов в NDJSON или CSV"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("table", choices=list(EXPORT_TABLES))
+        parser.add_argument(
+            "--format",
+            dest="output_format",
+            choices=list(EXPORT_FORMATS),
+            default="ndjson",
+        )
+        parser.add_argument(
+            "--since", help="Только записи с created_at >= since (ISO 8601)"
+        )
+        parser.add_argument(
+            "--output", "-o", help="Файл для записи (по умолчанию stdout)"
+        )
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            since = parse_since(options["since"])
+        except ValueError:
+            raise CommandError("--since: ожидается дата и время в формате ISO 8601")
+
+        lines = export_table(
+            options["table"], options["output_format"], since, options["chunk_size"]
+        )
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
+        self.stderr.write(f"Export of {options['table']} finished")
@@ -0,0 +1,361 @@
+"""
+Метрики производительности запросов.
+
+PerformanceMiddleware заводит на каждый запрос RequestStats
+в contextvar. Обертка выполнения запросов (connection.execute_wrappers)
+считает SQL-запросы и их время, рендерер и alist - время сериализации.
+Контекст копируется в потоки sync_to_async, поэтому запросы async-views
+тоже попадают в статистику своего запроса.
+
+Гистограммы копятся в памяти процесса. При METRICS_DIR (gunicorn.conf.py
+задает его всем воркерам) каждый процесс не чаще раза в
+METRICS_FLUSH_INTERVAL секунд и при выходе записывает свои ряды в
+METRICS_DIR/<pid>.json, а эндпоинт метрик складывает файлы всех
+процессов: любой воркер за балансировщиком отдает общие ряды. Мастер
+gunicorn (хук child_exit) переносит ряды завершившегося воркера в
+dead.json и удаляет его файл, поэтому число файлов не растет при
+перезапусках воркеров, а суммы не убывают и при повторном pid. Слияние
+и чтение файлов разделены блокировкой каталога. Время чтения
+серверного курсора (iterator, выгрузка) учитывается только для первой
+пачки строк.
+"""
+
+import atexit
+import bisect
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+from django.conf import settings
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Сумма рядов завершившихся процессов в METRICS_DIR
+DEAD_PROCESSES_FILE = "dead.json"
+
+
+@dataclass
+class RequestStats:
+    started: float = field(default_factory=time.perf_counter)
+    queries: int = 0
+    db_time: float = 0.0
+    serialize_time: float = 0.0
+    # Текст SQL для QueryGuardMiddleware; None - не записывать
+    statements: list[str] | None = None
+
+
+current_stats: ContextVar[RequestStats | None] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def record_query(
+    execute: Callable[..., Any], sql: str, params: Any, many: bool, context: Any
+) -> Any:
+    stats = current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - start
+        if stats.statements is not None:
+            stats.statements.append(sql)
+
+
+def install_query_wrapper(
+    sender: Any, connection: BaseDatabaseWrapper, **kwargs: Any
+) -> None:
+    """connection_created: обертка ставится один раз на соединение потока"""
+    # В конец списка - ближе всех к базе, время других оберток не считается
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def track_serialize() -> Iterator[None]:
+    stats = current_stats.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if stats is not None:
+            stats.serialize_time += time.perf_counter() - start
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    pairs = ",".join(
+        f'{name}="{escape_label(value)}"' for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+class Histogram:
+    """Гистограмма в формате Prometheus: накопительные корзины, сумма, число"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: tuple[float, ...],
+        labels: tuple[str, ...] = ("view", "method"),
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self.labels = labels
+        # Метки -> (число наблюдений по корзинам без накопления, сумма)
+        self.series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        counts, total = self.series.setdefault(
+            labels, ([0] * (len(self.buckets) + 1), [0.0])
+        )
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def dump(self) -> list[Any]:
+        return [
+            [list(labels), counts, total[0]]
+            for labels, (counts, total) in self.series.items()
+        ]
+
+    def load(self, rows: list[Any]) -> None:
+        """Прибавить ряды из dump() другого процесса"""
+        for labels, counts, value in rows:
+            current, total = self.series.setdefault(
+                tuple(labels), ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            for index, count in enumerate(counts):
+                current[index] += count
+            total[0] += value
+
+    def expose(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for values, (counts, total) in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                labels = format_labels((*self.labels, "le"), (*values, str(bound)))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = format_labels(self.labels, values)
+            yield f"{self.name}_sum{labels} {total[0]}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...]) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.series: dict[tuple[str, ...], int] = {}
+
+    def inc(self, labels: tuple[str, ...], amount: int = 1) -> None:
+        self.series[labels] = self.series.get(labels, 0) + amount
+
+    def dump(self) -> list[Any]:
+        return [[list(labels), count] for labels, count in self.series.items()]
+
+    def load(self, rows: list[Any]) -> None:
+        for labels, count in rows:
+            self.inc(tuple(labels), count)
+
+    def expose(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        for values, count in sorted(self.series.items()):
+            yield f"{self.name}{format_labels(self.labels, values)} {count}"
+
+
+class RequestMetrics:
+    """Метрики запросов по имени маршрута (api:questions:question-detail)"""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        # Отложенная запись в METRICS_DIR, не больше одной на интервал
+        self.flush_timer: threading.Timer | None = None
+        self.requests = Counter(
+            "http_requests_total",
+            "Обработанные запросы",
+            ("view", "method", "status"),
+        )
+        self.duration = Histogram(
+            "http_request_duration_seconds", "Время обработки запроса", LATENCY_BUCKETS
+        )
+        self.db_queries = Histogram(
+            "http_request_db_queries", "SQL-запросов на запрос", QUERY_COUNT_BUCKETS
+        )
+        self.db_duration = Histogram(
+            "http_request_db_duration_seconds",
+            "Время SQL-запросов на запрос",
+            LATENCY_BUCKETS,
+        )
+        self.serialize_duration = Histogram(
+            "http_request_serialize_duration_seconds",
+            "Время сериализации ответа",
+            LATENCY_BUCKETS,
+        )
+        self.response_size = Histogram(
+            "http_response_size_bytes",
+            "Размер тела ответа (без потоковых)",
+            SIZE_BUCKETS,
+        )
+        self.metrics: tuple[Counter | Histogram, ...] = (
+            self.requests,
+            self.duration,
+            self.db_queries,
+            self.db_duration,
+            self.serialize_duration,
+            self.response_size,
+        )
+
+    def observe(
+        self,
+        view: str,
+        method: str,
+        status: int,
+        stats: RequestStats,
+        duration: float,
+        size: int | None,
+    ) -> None:
+        labels = (view, method)
+        with self.lock:
+            self.requests.inc((*labels, str(status)))
+            self.duration.observe(labels, duration)
+            self.db_queries.observe(labels, stats.queries)
+            self.db_duration.observe(labels, stats.db_time)
+            self.serialize_duration.observe(labels, stats.serialize_time)
+            if size is not None:
+                self.response_size.observe(labels, size)
+            if settings.METRICS_DIR and self.flush_timer is None:
+                self.flush_timer = threading.Timer(
+                    settings.METRICS_FLUSH_INTERVAL, self.flush
+                )
+                self.flush_timer.daemon = True
+                self.flush_timer.start()
+
+    def dump(self) -> dict[str, list[Any]]:
+        with self.lock:
+            return {metric.name: metric.dump() for metric in self.metrics}
+
+    def load(self, snapshot: dict[str, list[Any]]) -> None:
+        with self.lock:
+            for metric in self.metrics:
+                metric.load(snapshot.get(metric.name, []))
+
+    def flush(self) -> None:
+        """Записать ряды процесса в METRICS_DIR/<pid>.json (атомарной заменой)"""
+        with self.lock:
+            if self.flush_timer is not None:
+                self.flush_timer.cancel()
+                self.flush_timer = None
+        # Мастер gunicorn импортирует модуль для child_exit без настроек Django
+        directory = settings.METRICS_DIR if settings.configured else None
+        if not directory:
+            return
+        path = os.path.join(directory, f"{os.getpid()}.json")
+        try:
+            os.makedirs(directory, exist_ok=True)
+            write_snapshot(path, self.dump())
+        except OSError:
+            logger.warning("Failed to write metrics to %s", path, exc_info=True)
+
+    def expose(self) -> str:
+        """Текстовый формат Prometheus: ряды всех процессов при METRICS_DIR"""
+        metrics = self
+        directory = settings.METRICS_DIR
+        if directory:
+            self.flush()
+            metrics = RequestMetrics()
+            with locked_directory(directory, fcntl.LOCK_SH):
+                for name in sorted(os.listdir(directory)):
+                    if name.endswith(".json"):
+                        snapshot = read_snapshot(os.path.join(directory, name))
+                        if snapshot is not None:
+                            metrics.load(snapshot)
+        with metrics.lock:
+            lines = [line for metric in metrics.metrics for line in metric.expose()]
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self.lock:
+            for metric in self.metrics:
+                metric.series.clear()
+
+
+def write_snapshot(path: str, snapshot: dict[str, list[Any]]) -> None:
+    """Атомарная запись: читатели видят старый или новый файл целиком"""
+    with open(f"{path}.tmp", "w") as file:
+        json.dump(snapshot, file)
+    os.replace(f"{path}.tmp", path)
+
+
+def read_snapshot(path: str) -> dict[str, list[Any]] | None:
+    try:
+        with open(path) as file:
+            snapshot: dict[str, list[Any]] = json.load(file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        logger.warning("Skipped metrics file %s", path, exc_info=True)
+        return None
+    return snapshot
+
+
+@contextmanager
+def locked_directory(directory: str, operation: int) -> Iterator[None]:
+    """flock на METRICS_DIR/.lock; снимается при закрытии файла"""
+    with open(os.path.join(directory, ".lock"), "a") as file:
+        fcntl.flock(file, operation)
+        yield
+
+
+def mark_process_dead(pid: int, directory: str) -> None:
+    """
+    Перенести ряды завершившегося процесса в dead.json и удалить его файл.
+    Вызывается мастером gunicorn после выхода воркера, до запуска замены.
+    """
+    path = os.path.join(directory, f"{pid}.json")
+    if not os.path.exists(path):
+        return
+    with locked_directory(directory, fcntl.LOCK_EX):
+        merged = RequestMetrics()
+        for name in (DEAD_PROCESSES_FILE, f"{pid}.json"):
+            snapshot = read_snapshot(os.path.join(directory, name))
+            if snapshot is not None:
+                merged.load(snapshot)
+        write_snapshot(os.path.join(directory, DEAD_PROCESSES_FILE), merged.dump())
+        os.remove(path)
+
+
+METRICS = RequestMetrics()
+# Ряды с последней отложенной записи не теряются при остановке воркера
+atexit.register(METRICS.flush)
+
+
+def server_timing(stats: RequestStats, duration: float) -> str:
+    """Заголовок Server-Timing: длительности в миллисекундах"""
+    return (
+        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries", '
+        f"serialize;dur={stats.serialize_time * 1000:.1f}, "
+        f"total;dur={duration * 1000:.1f}"
+    )
@@ -0,0 +1,147 @@
+import logging
+import time
+from typing import Any, Awaitable, Callable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
+
+from apps.api.metrics import METRICS, RequestStats, current_stats, server_timing
+from apps.api.queryguard import (
+    QueryBudgetExceeded,
+    QueryReport,
+    view_budget,
+    view_class,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PerformanceMiddleware:
+    """
+    Время запроса, число и время SQL-запросов, время сериализации и размер
+    ответа по имени маршрута (см. apps.api.metrics). Добавляет заголовок
+    Server-Timing при SERVER_TIMING. Ставится первым в MIDDLEWARE, чтобы
+    учитывать и остальные middleware. У потоковых ответов время - до
+    начала отдачи тела, размер не учитывается.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(
+        self, request: HttpRequest
+    ) -> HttpResponseBase | Awaitable[HttpResponseBase]:
+        if self.async_mode:
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = current_stats.set(stats)
+        try:
+            response: HttpResponseBase = self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        return self.finish(request, response, stats)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        stats = RequestStats()
+        token = current_stats.set(stats)
+        try:
+            response: HttpResponseBase = await self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        return self.finish(request, response, stats)
+
+    def finish(
+        self, request: HttpRequest, response: HttpResponseBase, stats: RequestStats
+    ) -> HttpResponseBase:
+        duration = time.perf_counter() - stats.started
+        match = request.resolver_match
+        # Имя маршрута вместо пути: число рядов не растет с числом id
+        view = match.view_name if match is not None else "unresolved"
+        size = None if response.streaming else len(response.content)  # type: ignore[attr-defined]
+        METRICS.observe(
+            view, request.method or "", response.status_code, stats, duration, size
+        )
+        if settings.SERVER_TIMING:
+            response["Server-Timing"] = server_timing(stats, duration)
+        return response
+
+
+class QueryGuardMiddleware:
+    """
+    Проверка N+1 и бюджета запросов представления (apps.api.queryguard)
+    при QUERY_GUARD. Ставится после PerformanceMiddleware; без нее
+    заводит статистику запроса сама.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(
+        self, request: HttpRequest
+    ) -> HttpResponseBase | Awaitable[HttpResponseBase]:
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.QUERY_GUARD:
+            return self.get_response(request)  # type: ignore[no-any-return]
+        stats, token = self.start()
+        try:
+            response: HttpResponseBase = self.get_response(request)
+        finally:
+            if token is not None:
+                current_stats.reset(token)
+        self.check(request, stats)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        if not settings.QUERY_GUARD:
+            return await self.get_response(request)  # type: ignore[no-any-return]
+        stats, token = self.start()
+        try:
+            response: HttpResponseBase = await self.get_response(request)
+        finally:
+            if token is not None:
+                current_stats.reset(token)
+        self.check(request, stats)
+        return response
+
+    def start(self) -> tuple[RequestStats, Any]:
+        stats = current_stats.get()
+        token = None
+        if stats is None:
+            stats = RequestStats()
+            token = current_stats.set(stats)
+        stats.statements = []
+        return stats, token
+
+    def check(self, request: HttpRequest, stats: RequestStats) -> None:
+        match = request.resolver_match
+        report = QueryReport(
+            view=match.view_name if match is not None else request.path,
+            method=request.method or "",
+            statements=stats.statements or [],
+            budget=view_budget(request),
+            repeat_threshold=(
+                None
+                if getattr(view_class(request), "allow_repeated_queries", False)
+                else settings.QUERY_GUARD_REPEAT
+            ),
+        )
+        if not report.problems():
+            return
+        if settings.QUERY_GUARD == "raise":
+            raise QueryBudgetExceeded(report.describe())
+        logger.warning("Query guard: %s", report.describe())
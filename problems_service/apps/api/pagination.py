@@ -0,0 +1,326 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Any, Sequence, cast
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage, Page
+from django.db import connections
+from django.db.models import Field, Model, Q, QuerySet
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+@dataclass(frozen=True)
+class Cursor:
+    ordering: str
+    position: tuple[Any, ...]
+    reverse: bool = False
+
+
+def estimate_count(queryset: QuerySet[Any]) -> int:
+    """Оценка числа строк по статистике планировщика (EXPLAIN) без COUNT(*)"""
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class PageNumberPagination(pagination.PageNumberPagination):
+    """PageNumberPagination с async-вариантом для AsyncGenericAPIView"""
+
+    async def apaginate_queryset(
+        self, queryset: QuerySet[Any], request: Request, view: Any = None
+    ) -> list[Any] | None:
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        # count - cached_property, заранее заполняем его async-запросом
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise NotFound(
+                self.invalid_page_message.format(
+                    page_number=page_number, message=str(exc)
+                )
+            )
+
+        # Границы страницы как в Paginator.page()
+        bottom = (number - 1) * paginator.per_page
+        top = bottom + paginator.per_page
+        if top + paginator.orphans >= paginator.count:
+            top = paginator.count
+        rows = [row async for row in queryset[bottom:top]]
+        self.page = Page(rows, number, paginator)
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return rows
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) пагинация: страница выбирается условием по ключу
+    сортировки вместо OFFSET, общее количество по умолчанию не считается.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = "cursor"
+    ordering_query_param = "ordering"
+    count_query_param = "count"
+    invalid_cursor_message = "Некорректный курсор"
+
+    # Значение параметра ordering -> поля ключа (последнее поле уникально)
+    orderings: dict[str, tuple[str, ...]] = {
+        "id": ("id",),
+        "created_at": ("created_at", "id"),
+    }
+    default_ordering = "id"
+
+    def paginate_queryset(  # type: ignore[override]
+        self, queryset: QuerySet[Any], request: Request, view: Any = None
+    ) -> list[Any] | None:
+        page_queryset = self.get_page_queryset(queryset, request)
+        if page_queryset is None:
+            return None
+        self.count = self.get_count(queryset, request)
+        return self.set_page(list(page_queryset))
+
+    async def apaginate_queryset(
+        self, queryset: QuerySet[Any], request: Request, view: Any = None
+    ) -> list[Any] | None:
+        page_queryset = self.get_page_queryset(queryset, request)
+        if page_queryset is None:
+            return None
+        self.count = await self.aget_count(queryset, request)
+        return self.set_page([row async for row in page_queryset])
+
+    def get_page_queryset(
+        self, queryset: QuerySet[Any], request: Request
+    ) -> QuerySet[Any] | None:
+        """Запрос страницы (page_size + 1 строк, чтобы узнать о следующей)"""
+        page_size = self.page_size
+        if not page_size:
+            return None
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request)
+        self.fields = self.orderings[self.ordering.lstrip("-")]
+        self.cursor = self.decode_cursor(request, queryset.model)
+
+        self.reverse = self.cursor is not None and self.cursor.reverse
+        descending = self.ordering.startswith("-") != self.reverse
+        prefix = "-" if descending else ""
+        page_queryset = queryset.order_by(*(prefix + field for field in self.fields))
+        if self.cursor is not None:
+            page_queryset = page_queryset.filter(
+                self.after_position(self.cursor.position, descending)
+            )
+        return page_queryset[: page_size + 1]
+
+    def set_page(self, rows: list[Any]) -> list[Any]:
+        page_size = self.page_size
+        assert page_size
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if self.reverse:
+            rows.reverse()
+
+        self.has_next = self.cursor is not None if self.reverse else has_more
+        self.has_previous = has_more if self.reverse else self.cursor is not None
+        self.page = rows
+        return rows
+
+    def get_ordering(self, request: Request) -> str:
+        ordering = request.query_params.get(
+            self.ordering_query_param, self.default_ordering
+        )
+        if ordering.lstrip("-") not in self.orderings:
+            return self.default_ordering
+        return ordering
+
+    def get_count(self, queryset: QuerySet[Any], request: Request) -> int | None:
+        mode = request.query_params.get(self.count_query_param)
+        if mode == "approximate":
+            return estimate_count(queryset)
+        if mode == "exact":
+            return queryset.count()
+        return None
+
+    async def aget_count(
+        self, queryset: QuerySet[Any], request: Request
+    ) -> int | None:
+        mode = request.query_params.get(self.count_query_param)
+        if mode == "approximate":
+            return await sync_to_async(estimate_count)(queryset)
+        if mode == "exact":
+            return await queryset.acount()
+        return None
+
+    def after_position(self, position: Sequence[Any], descending: bool) -> Q:
+        """Условие "строго после position" для составного ключа сортировки"""
+        lookup = "lt" if descending else "gt"
+        condition = Q(**{f"{self.fields[-1]}__{lookup}": position[-1]})
+        for field, value in zip(self.fields[-2::-1], position[-2::-1]):
+            condition = Q(**{f"{field}__{lookup}": value}) | (
+                Q(**{field: value}) & condition
+            )
+        if len(self.fields) > 1:
+            # Граница по первому полю позволяет использовать индекс как диапазон
+            condition &= Q(**{f"{self.fields[0]}__{lookup}e": position[0]})
+        return condition
+
+    def decode_cursor(self, request: Request, model: type[Model]) -> Cursor | None:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            if payload["o"] != self.ordering or len(payload["p"]) != len(self.fields):
+                raise ValueError(encoded)
+            position = tuple(
+                cast("Field[Any, Any]", model._meta.get_field(field)).to_python(
+                    value
+                )
+                for field, value in zip(self.fields, payload["p"])
+            )
+            reverse = bool(payload.get("r", 0))
+        except (
+            binascii.Error, KeyError, TypeError, ValueError, UnicodeError, ValidationError
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Cursor(ordering=self.ordering, position=position, reverse=reverse)
+
+    def encode_cursor(self, cursor: Cursor) -> str:
+        payload: dict[str, Any] = {
+            "o": cursor.ordering,
+            "p": [
+                value.isoformat() if hasattr(value, "isoformat") else value
+                for value in cursor.position
+            ],
+        }
+        if cursor.reverse:
+            payload["r"] = 1
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(",", ":")).encode("ascii")
+        ).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_position(self, instance: Any) -> tuple[Any, ...]:
+        if isinstance(instance, dict):
+            return tuple(instance[field] for field in self.fields)
+        return tuple(getattr(instance, field) for field in self.fields)
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next:
+            return None
+        return self.encode_cursor(
+            Cursor(ordering=self.ordering, position=self.get_position(self.page[-1]))
+        )
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous:
+            return None
+        if self.page:
+            position = self.get_position(self.page[0])
+        else:
+            # Пустая страница после курсора: предыдущая заканчивается на нем
+            assert self.cursor is not None
+            position = self.cursor.position
+        return self.encode_cursor(
+            Cursor(ordering=self.ordering, position=position, reverse=True)
+        )
+
+    def get_paginated_response(self, data: Any) -> Response:
+        payload: dict[str, Any] = {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+        if self.count is not None:
+            payload = {"count": self.count, **payload}
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {"type": "integer", "example": 123},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class KeysetPaginationMixin:
+    """Включает keyset-пагинацию по параметру запроса ?pagination=cursor"""
+
+    keyset_pagination_class: type[BasePagination] = KeysetPagination
+    pagination_mode_query_param = "pagination"
+
+    @property
+    def paginator(self) -> BasePagination | None:
+        if not hasattr(self, "_paginator"):
+            request = getattr(self, "request", None)
+            if (
+                request is not None
+                and request.query_params.get(self.pagination_mode_query_param)
+                == "cursor"
+            ):
+                self._paginator: BasePagination | None = self.keyset_pagination_class()
+            else:
+                pagination_class = getattr(self, "pagination_class", None)
+                self._paginator = pagination_class() if pagination_class else None
+        return self._paginator
+
+
+class LatestFirstKeysetPagination(KeysetPagination):
+    """Keyset-пагинация, по умолчанию новые записи первыми"""
+
+    default_ordering = "-created_at"
+
+
+class UserAnswersPagination(LatestFirstKeysetPagination):
+    """
+    Ответы пользователя: только порядок по времени, его обслуживает
+    индекс (user_id, created_at, id). Порядок по id читал бы индекс
+    первичного ключа по всей таблице.
+    """
+
+    orderings = {"created_at": ("created_at", "id")}
+
+
+class QuestionGroupPagination(KeysetPagination):
+    """Группы ответов по вопросам (values + annotate) в порядке question_id"""
+
+    orderings = {"question_id": ("question_id",)}
+    default_ordering = "question_id"
+
+
+class HotQuestionsPagination(KeysetPagination):
+    """
+    Лента горячих вопросов: страница - начало частичного индекса
+    (score DESC, question_id DESC), время чтения не зависит от размера таблиц
+    """
+
+    orderings = {"score": ("score", "question_id")}
+    default_ordering = "-score"
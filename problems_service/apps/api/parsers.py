@@ -0,0 +1,56 @@
+import json
+from typing import Any, Mapping
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+from apps.api.renderers import ORJSONRenderer, orjson
+
+json_loads = orjson.loads if orjson is not None else json.loads
+
+
+class NDJSONParser(BaseParser):
+    """NDJSON (JSON Lines): один объект на строку, результат - список"""
+
+    media_type = "application/x-ndjson"
+
+    def parse(  # type: ignore[override]
+        self,
+        stream: Any,
+        media_type: str | None = None,
+        parser_context: Mapping[str, Any] | None = None,
+    ) -> list[Any]:
+        items = []
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                items.append(json_loads(line))
+            except ValueError as exc:
+                raise ParseError(f"NDJSON parse error on line {line_number} - {exc}")
+        return items
+
+
+class ORJSONParser(JSONParser):
+    """
+    JSONParser на orjson. NaN и Infinity orjson не принимает, как
+    JSONParser со STRICT_JSON. Без orjson и для тела не в UTF-8
+    используется JSONParser.
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(
+        self,
+        stream: Any,
+        media_type: str | None = None,
+        parser_context: Mapping[str, Any] | None = None,
+    ) -> Any:
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or encoding.lower() not in ("utf-8", "utf8"):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
@@ -0,0 +1,93 @@
+"""
+Проверка SQL-запросов запроса: N+1 и бюджет представления.
+
+Представление объявляет бюджет атрибутом query_budget: число запросов
+на любой метод или словарь {"GET": 2, "POST": 3}. QueryGuardMiddleware
+записывает SQL запроса (см. apps.api.metrics) и проверяет:
+
+- запросов не больше бюджета;
+- один и тот же запрос с точностью до параметров (форма) выполняется
+  меньше QUERY_GUARD_REPEAT раз - иначе это N+1. Представления, которые
+  повторяют запрос намеренно (вставка чанками), объявляют
+  allow_repeated_queries = True.
+
+QUERY_GUARD="warn" пишет предупреждение в лог (по умолчанию при DEBUG),
+"raise" - падает с QueryBudgetExceeded (фикстура query_guard в тестах).
+Команды управления транзакцией (SAVEPOINT) не считаются: их число
+зависит от вложенности atomic, а не от представления.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+from django.http import HttpRequest
+
+# Списки параметров IN (%s, %s, ...) разной длины - одна форма
+PLACEHOLDER_LIST_RE = re.compile(r"%s(?:\s*,\s*%s)+")
+TRANSACTION_PREFIXES = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def sql_shape(sql: str) -> str:
+    return PLACEHOLDER_LIST_RE.sub("%s, ...", " ".join(sql.split()))
+
+
+def view_class(request: HttpRequest) -> Any:
+    match = request.resolver_match
+    return getattr(match.func, "view_class", None) if match is not None else None
+
+
+def view_budget(request: HttpRequest) -> int | None:
+    """Бюджет представления для метода запроса; None - не объявлен"""
+    budget: int | dict[str, int] | None = getattr(
+        view_class(request), "query_budget", None
+    )
+    if isinstance(budget, dict):
+        return budget.get(request.method or "")
+    return budget
+
+
+@dataclass
+class QueryReport:
+    view: str
+    method: str
+    statements: list[str]
+    budget: int | None
+    # None - повторы не проверяются
+    repeat_threshold: int | None
+    queries: list[str] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.queries = [
+            sql for sql in self.statements if not sql.startswith(TRANSACTION_PREFIXES)
+        ]
+
+    def repeated(self) -> dict[str, int]:
+        """Формы запросов, повторенные не меньше repeat_threshold раз"""
+        threshold = self.repeat_threshold
+        if threshold is None:
+            return {}
+        shapes = Counter(sql_shape(sql) for sql in self.queries)
+        return {
+            shape: count
+            for shape, count in shapes.items()
+            if count >= threshold
+        }
+
+    def problems(self) -> list[str]:
+        problems = [
+            f"N+1: {count} x {shape}" for shape, count in self.repeated().items()
+        ]
+        if self.budget is not None and len(self.queries) > self.budget:
+            problems.append(
+                f"{len(self.queries)} queries over budget {self.budget}"
+            )
+        return problems
+
+    def describe(self) -> str:
+        return f"{self.method} {self.view}: " + "; ".join(self.problems())
@@ -0,0 +1,88 @@
+from typing import Any, Mapping
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from apps.api.metrics import track_serialize
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - без orjson работает JSONRenderer
+    orjson = None  # type: ignore[assignment]
+
+# Даты и время кодирует JSONEncoder DRF, чтобы формат совпадал
+# со стандартным рендерером (Z вместо +00:00 у UTC)
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME if orjson is not None else 0
+encode_default = JSONEncoder().default
+
+# JSONRenderer экранирует разделители строк и абзацев: без этого JSON
+# нельзя вставить в <script> и выполнить как JavaScript (до ES2019)
+LINE_SEPARATORS = (
+    ("\u2028".encode(), b"\\u2028"),
+    ("\u2029".encode(), b"\\u2029"),
+)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer на orjson. Типы, которых нет в JSON (datetime, Decimal,
+    ленивые строки, QuerySet), кодирует JSONEncoder DRF, U+2028 и U+2029
+    экранируются, как в JSONRenderer. Побайтово вывод отличается только
+    записью float: orjson пишет кратчайшую форму (1e16, 1e-7), json -
+    repr Python (1e+16, 1e-07); значения при разборе те же. Без orjson,
+    с отступами, с ensure_ascii и для данных, которые orjson не принимает
+    (нестроковые ключи, целые больше 64 бит), используется JSONRenderer.
+    """
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: str | None = None,
+        renderer_context: Mapping[str, Any] | None = None,
+    ) -> bytes:
+        with track_serialize():
+            return self.render_json(data, accepted_media_type, renderer_context)
+
+    def render_json(
+        self,
+        data: Any,
+        accepted_media_type: str | None,
+        renderer_context: Mapping[str, Any] | None,
+    ) -> bytes:
+        if data is None:
+            return b""
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type or "", renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            content = orjson.dumps(
+                data, default=encode_default, option=ORJSON_OPTIONS
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        for separator, escaped in LINE_SEPARATORS:
+            if separator in content:
+                content = content.replace(separator, escaped)
+        return content
+
+
+class PrometheusRenderer(BaseRenderer):
+    """Текстовый формат Prometheus; ошибки (403) - текстом detail"""
+
+    media_type = "text/plain"
+    format = "prometheus"
+    charset = "utf-8"
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: str | None = None,
+        renderer_context: Mapping[str, Any] | None = None,
+    ) -> bytes:
+        if isinstance(data, Mapping):
+            data = f"{data.get('detail', data)}\n"
+        return str(data).encode(self.charset)
@@ -0,0 +1,94 @@
+from typing import Any, TypeVar
+
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db.models import F, Func, Model, QuerySet, Value
+from django.db.models.functions import Replace
+
+from apps.answers.models import Answer
+from apps.questions.models import Question
+
+SEARCH_CONFIG = "russian"
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+# Ранжируются только столько самых новых совпадений в каждой таблице:
+# время ответа для частых слов не растет с размером таблицы
+MAX_SEARCH_CANDIDATES = 1000
+# Замены html.escape; & - первым, чтобы не экранировать сущности повторно
+HTML_ESCAPES = (
+    ("&", "&amp;"),
+    ("<", "&lt;"),
+    (">", "&gt;"),
+    ('"', "&quot;"),
+    ("'", "&#x27;"),
+)
+
+SEARCH_TYPES = ("all", "questions", "answers")
+
+ModelT = TypeVar("ModelT", bound=Model)
+
+
+def build_search_query(text: str) -> SearchQuery:
+    """Синтаксис как у поисковиков: "фраза", or, -исключение"""
+    return SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+
+
+def html_escaped(field: str) -> Func | F:
+    """Текст поля, экранированный в SQL: в фрагменте разметка только <b>"""
+    expression: Func | F = F(field)
+    for char, entity in HTML_ESCAPES:
+        expression = Replace(expression, Value(char), Value(entity))
+    return expression
+
+
+def rank_matches(
+    queryset: QuerySet[ModelT],
+    query: SearchQuery,
+    fields: list[str],
+    limit: int = DEFAULT_SEARCH_LIMIT,
+) -> list[dict[str, Any]]:
+    """
+    Лучшие по ts_rank совпадения с фрагментами текста.
+    Совпадения находит GIN-индекс по search_vector; ts_rank считается
+    только для MAX_SEARCH_CANDIDATES самых новых из них (по убыванию id),
+    поэтому для очень частых слов более старые совпадения не попадают
+    в выдачу, даже если их ранг выше. ts_headline PostgreSQL вычисляет
+    после сортировки и LIMIT, только для возвращаемых строк. Текст
+    экранируется до ts_headline, поэтому сохраненная разметка приходит
+    клиенту как текст.
+    """
+    candidates = (
+        queryset.filter(search_vector=query)
+        .order_by("-pk")
+        .values("pk")[:MAX_SEARCH_CANDIDATES]
+    )
+    rows = (
+        queryset.filter(pk__in=candidates)
+        .annotate(
+            rank=SearchRank(F("search_vector"), query),
+            snippet=SearchHeadline(
+                html_escaped("text"), query, config=SEARCH_CONFIG, max_fragments=2
+            ),
+        )
+        .order_by("-rank", "-pk")
+        .values(*fields, "rank", "snippet")[:limit]
+    )
+    return list(rows)
+
+
+def search(
+    text: str, search_type: str = "all", limit: int = DEFAULT_SEARCH_LIMIT
+) -> dict[str, list[dict[str, Any]]]:
+    query = build_search_query(text)
+    result: dict[str, list[dict[str, Any]]] = {}
+    if search_type in ("all", "questions"):
+        result["questions"] = rank_matches(
+            Question.objects.all(), query, ["id", "created_at"], limit
+        )
+    if search_type in ("all", "answers"):
+        result["answers"] = rank_matches(
+            Answer.objects.visible(),
+            query,
+            ["id", "question_id", "user_id", "created_at"],
+            limit,
+        )
+    return result
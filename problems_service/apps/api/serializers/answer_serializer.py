@@ -1,3 +1,5 @@
+from typing import Any
+
 from rest_framework import serializers
 from apps.answers.models import Answer
 
@@ -27,9 +29,36 @@ class AnswerCreateSerialier(serializers.ModelSerializer[Answer]):
         return value.strip()
     
 
+class AnswerBulkItemSerializer(AnswerCreateSerialier):
+    """Элемент массовой загрузки в разные вопросы"""
+    question_id = serializers.IntegerField(min_value=1)
+
+    class Meta(AnswerCreateSerialier.Meta):
+        fields = ['question_id', 'user_id', 'text']
+
+
+class AnswerBulkErrorSerializer(serializers.Serializer[Any]):
+    index = serializers.IntegerField()
+    errors = serializers.DictField()  # type: ignore[assignment]
+
+
+class AnswerBulkResultSerializer(serializers.Serializer[Any]):
+    created = serializers.IntegerField()
+    failed = serializers.IntegerField()
+    ids = serializers.ListField(child=serializers.IntegerField())
+    errors = AnswerBulkErrorSerializer(many=True)  # type: ignore[assignment]
+
+
 class AnswerSerializer(serializers.ModelSerializer[Answer]):
-    question_id = serializers.IntegerField(source="question.id", read_only=True)
+    question_id = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Answer
         fields = ['id', 'question_id', 'user_id', 'text', 'created_at']
+
+
+class UserQuestionAnswersSerializer(serializers.Serializer[Any]):
+    """Ответы пользователя, сгруппированные по вопросу"""
+    question_id = serializers.IntegerField()
+    answers_count = serializers.IntegerField()
+    last_answer_at = serializers.DateTimeField()
@@ -0,0 +1,18 @@
+from typing import Any
+
+from rest_framework import serializers
+
+
+class DatabasePoolStatsSerializer(serializers.Serializer[Any]):
+    pid = serializers.IntegerField(help_text="Процесс воркера, которому принадлежит пул")
+    pool = serializers.BooleanField(help_text="Включен ли пул соединений")
+    conn_max_age = serializers.IntegerField()
+    stats = serializers.DictField(
+        child=serializers.IntegerField(),
+        help_text=(
+            "Счетчики psycopg_pool: requests_num - выдачи соединений, "
+            "requests_queued - ожидания свободного соединения, "
+            "requests_errors - таймауты ожидания, pool_size/pool_available - "
+            "открытые и свободные соединения"
+        ),
+    )
@@ -0,0 +1,19 @@
+from rest_framework import serializers
+
+from apps.jobs.models import Job
+
+
+class JobSerializer(serializers.ModelSerializer[Job]):
+    progress = serializers.JSONField(
+        read_only=True, help_text="Прогресс, который сообщает задача во время работы"
+    )
+    result = serializers.JSONField(read_only=True, help_text="Результат задачи")
+    error = serializers.CharField(read_only=True, help_text="Последняя ошибка")
+
+    class Meta:
+        model = Job
+        fields = [
+            'id', 'task', 'status', 'attempts', 'max_attempts', 'run_at',
+            'created_at', 'finished_at', 'progress', 'result', 'error',
+        ]
+        read_only_fields = fields
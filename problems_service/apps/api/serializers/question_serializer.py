@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from apps.questions.models import Question
+from apps.questions.models import Question, QuestionRank
 from apps.api.serializers.answer_serializer import AnswerSerializer
 
 
@@ -14,13 +14,36 @@ class QuestionCreateSerializer(serializers.ModelSerializer[Question]):
         return value.strip()
     
 
-class QuestionDetailSerializer(serializers.ModelSerializer[Question]):
-    answers = AnswerSerializer(many=True, read_only=True)
+class QuestionListSerializer(serializers.ModelSerializer[Question]):
     answers_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Question
-        fields = ['id', 'text', 'created_at', 'answers', 'answers_count']
+        fields = ['id', 'text', 'created_at', 'answers_count']
 
     def get_answers_count(self, obj: Question) -> int:
-        return obj.answers.count()
\ No newline at end of file
+        # Значение из Question.objects.with_answers_count() без отдельного COUNT
+        answers_count = getattr(obj, 'answers_count', None)
+        if answers_count is None:
+            return obj.answers.count()
+        return int(answers_count)
+
+
+class QuestionDetailSerializer(QuestionListSerializer):
+    answers = AnswerSerializer(many=True, read_only=True)
+
+    class Meta(QuestionListSerializer.Meta):
+        fields = ['id', 'text', 'created_at', 'answers', 'answers_count']
+
+
+class HotQuestionSerializer(serializers.ModelSerializer[QuestionRank]):
+    id = serializers.IntegerField(source='question_id')
+    text = serializers.CharField(source='question.text')
+    created_at = serializers.DateTimeField(source='question.created_at')
+    score = serializers.FloatField(
+        help_text="Рейтинг активности: сравним между вопросами, со временем не меняется"
+    )
+
+    class Meta:
+        model = QuestionRank
+        fields = ['id', 'text', 'created_at', 'answers_count', 'last_answer_at', 'score']
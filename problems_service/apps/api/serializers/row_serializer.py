@@ -0,0 +1,100 @@
+"""
+Быстрый путь чтения: данные ответа API из строк .values() без
+ModelSerializer. Результат совпадает с AnswerSerializer,
+QuestionListSerializer, QuestionDetailSerializer и HotQuestionSerializer,
+включая порядок полей и формат дат, поэтому JSON получается тем же
+байт в байт.
+
+Часовой пояс ответа (get_timezone) определяется один раз на запрос,
+а не для каждого поля, как в DateTimeField.
+"""
+
+from datetime import datetime, timezone as dt_timezone, tzinfo
+from typing import Any
+
+from django.conf import settings
+from django.utils import timezone
+
+Row = dict[str, Any]
+
+ANSWER_FIELDS = ("id", "question_id", "user_id", "text", "created_at")
+QUESTION_FIELDS = ("id", "text", "created_at", "answers_count")
+HOT_QUESTION_FIELDS = (
+    "question_id",
+    "question__text",
+    "question__created_at",
+    "answers_count",
+    "last_answer_at",
+    "score",
+)
+
+
+def get_timezone() -> tzinfo | None:
+    """Часовой пояс, в который DateTimeField переводит значения"""
+    return timezone.get_current_timezone() if settings.USE_TZ else None
+
+
+def datetime_to_representation(value: datetime | None, tz: tzinfo | None) -> str | None:
+    """Как DateTimeField.to_representation с форматом ISO 8601"""
+    if value is None:
+        return None
+    if tz is not None:
+        value = (
+            value.astimezone(tz) if timezone.is_aware(value) else timezone.make_aware(value, tz)
+        )
+    elif timezone.is_aware(value):
+        value = timezone.make_naive(value, dt_timezone.utc)
+    representation = value.isoformat()
+    if representation.endswith("+00:00"):
+        representation = representation[:-6] + "Z"
+    return representation
+
+
+def answer_to_representation(row: Row, tz: tzinfo | None) -> Row:
+    """Строка ANSWER_FIELDS -> данные AnswerSerializer"""
+    return {
+        "id": row["id"],
+        "question_id": row["question_id"],
+        "user_id": row["user_id"],
+        "text": row["text"],
+        "created_at": datetime_to_representation(row["created_at"], tz),
+    }
+
+
+def question_to_representation(
+    row: Row, tz: tzinfo | None, answers: list[Row] | None = None
+) -> Row:
+    """
+    Строка QUESTION_FIELDS -> данные QuestionListSerializer, а вместе
+    с answers (уже преобразованными) - QuestionDetailSerializer
+    """
+    data: Row = {
+        "id": row["id"],
+        "text": row["text"],
+        "created_at": datetime_to_representation(row["created_at"], tz),
+    }
+    if answers is not None:
+        data["answers"] = answers
+    data["answers_count"] = int(row["answers_count"])
+    return data
+
+
+def user_question_answers_to_representation(row: Row, tz: tzinfo | None) -> Row:
+    """Строка группировки ответов пользователя -> UserQuestionAnswersSerializer"""
+    return {
+        "question_id": row["question_id"],
+        "answers_count": row["answers_count"],
+        "last_answer_at": datetime_to_representation(row["last_answer_at"], tz),
+    }
+
+
+def hot_question_to_representation(row: Row, tz: tzinfo | None) -> Row:
+    """Строка HOT_QUESTION_FIELDS (QuestionRank) -> данные HotQuestionSerializer"""
+    return {
+        "id": row["question_id"],
+        "text": row["question__text"],
+        "created_at": datetime_to_representation(row["question__created_at"], tz),
+        "answers_count": row["answers_count"],
+        "last_answer_at": datetime_to_representation(row["last_answer_at"], tz),
+        "score": row["score"],
+    }
@@ -0,0 +1,46 @@
+from typing import Any
+
+from rest_framework import serializers
+
+from apps.api.search import (
+    DEFAULT_SEARCH_LIMIT,
+    MAX_SEARCH_LIMIT,
+    SEARCH_TYPES,
+)
+
+
+class SearchQuerySerializer(serializers.Serializer[Any]):
+    q = serializers.CharField(max_length=200, help_text="Поисковый запрос")
+    type = serializers.ChoiceField(
+        choices=SEARCH_TYPES, default="all", help_text="Где искать"
+    )
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=MAX_SEARCH_LIMIT,
+        default=DEFAULT_SEARCH_LIMIT,
+        help_text="Количество результатов каждого типа",
+    )
+
+    def validate_q(self, value: str) -> str:
+        if not value.strip():
+            raise serializers.ValidationError("Поисковый запрос не может быть пустым")
+        return value.strip()
+
+
+class SearchHitSerializer(serializers.Serializer[Any]):
+    id = serializers.IntegerField()
+    created_at = serializers.DateTimeField()
+    rank = serializers.FloatField()
+    snippet = serializers.CharField(
+        help_text="Фрагмент текста, экранированного как HTML; совпадения выделены <b>...</b>"
+    )
+
+
+class SearchAnswerHitSerializer(SearchHitSerializer):
+    question_id = serializers.IntegerField()
+    user_id = serializers.CharField()
+
+
+class SearchResultSerializer(serializers.Serializer[Any]):
+    questions = SearchHitSerializer(many=True, required=False)
+    answers = SearchAnswerHitSerializer(many=True, required=False)
@@ -0,0 +1,109 @@
+import json
+from inspect import iscoroutinefunction
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import resolve, reverse
+from rest_framework import status
+
+from apps.questions.models import Question
+from apps.answers.models import Answer
+
+
+@pytest.mark.django_db
+class TestAsyncViews:
+    """Тесты async-обработчиков вопросов и ответов через ASGI-обработчик"""
+
+    @pytest.fixture
+    def client(self):
+        return AsyncClient()
+
+    @pytest.fixture
+    def sample_question(self):
+        question = Question.objects.create(text="Асинхронный вопрос?")
+        Answer.objects.create(question=question, user_id="user_1", text="Ответ")
+        return question
+
+    @pytest.mark.parametrize('name, kwargs', [
+        ('api:questions:question-list-create', {}),
+        ('api:questions:question-detail', {'pk': 1}),
+        ('api:answers:answer-create', {'question_id': 1}),
+        ('api:answers:answer-detail', {'pk': 1}),
+        ('api:answers:user-answer-list', {'user_id': 'user_1'}),
+    ])
+    def test_views_are_async(self, name, kwargs):
+        """Тест того, что Django вызывает представления как корутины"""
+        view = resolve(reverse(name, kwargs=kwargs)).func
+        assert iscoroutinefunction(view)
+
+    def test_question_lifecycle(self, client, sample_question):
+        """Тест списка, создания, чтения и удаления вопроса"""
+        list_url = reverse('api:questions:question-list-create')
+
+        response = async_to_sync(client.get)(list_url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['count'] == 1
+
+        response = async_to_sync(client.post)(
+            list_url,
+            json.dumps({'text': 'Новый вопрос?'}),
+            content_type='application/json',
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        question_id = response.json()['id']
+        assert response.json()['answers'] == []
+
+        detail_url = reverse('api:questions:question-detail', kwargs={'pk': question_id})
+        response = async_to_sync(client.get)(detail_url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['text'] == 'Новый вопрос?'
+
+        response = async_to_sync(client.delete)(detail_url)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert not Question.objects.filter(id=question_id).exists()
+
+        response = async_to_sync(client.get)(detail_url)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_answer_lifecycle(self, client, sample_question):
+        """Тест списка, создания, чтения и удаления ответа"""
+        list_url = reverse(
+            'api:answers:answer-create', kwargs={'question_id': sample_question.id}
+        )
+        response = async_to_sync(client.post)(
+            list_url,
+            json.dumps({'user_id': 'user_2', 'text': 'Второй ответ'}),
+            content_type='application/json',
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        answer_id = response.json()['id']
+
+        response = async_to_sync(client.get)(list_url)
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['id'] for item in response.json()['results']][0] == answer_id
+
+        detail_url = reverse('api:answers:answer-detail', kwargs={'pk': answer_id})
+        response = async_to_sync(client.delete)(detail_url)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert sample_question.answers.count() == 1
+
+    def test_answers_of_missing_question(self, client):
+        """Тест 404 для ответов несуществующего вопроса"""
+        url = reverse('api:answers:answer-create', kwargs={'question_id': 999999})
+
+        assert async_to_sync(client.get)(url).status_code == status.HTTP_404_NOT_FOUND
+        response = async_to_sync(client.post)(
+            url,
+            json.dumps({'user_id': 'user_1', 'text': 'Ответ'}),
+            content_type='application/json',
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_user_answers(self, client, sample_question):
+        """Тест ответов пользователя"""
+        url = reverse('api:answers:user-answer-list', kwargs={'user_id': 'user_1'})
+
+        response = async_to_sync(client.get)(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()['results']) == 1
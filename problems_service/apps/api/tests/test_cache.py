@@ -0,0 +1,181 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from apps.questions.models import Question
+from apps.answers.models import Answer
+from apps.api import cache as api_cache
+from apps.questions.cache import QUESTIONS_VERSION_KEY, get_api_cache, question_version_key
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+    """Тесты кэша ответов списка и деталей вопросов"""
+
+    @pytest.fixture
+    def api_client(self):
+        return APIClient()
+
+    @pytest.fixture
+    def sample_question(self):
+        question = Question.objects.create(text="Кэшируемый вопрос?")
+        Answer.objects.create(question=question, user_id="user_1", text="Ответ")
+        return question
+
+    def detail_url(self, question):
+        return reverse('api:questions:question-detail', kwargs={'pk': question.id})
+
+    def test_detail_served_from_cache(self, api_client, sample_question, django_assert_num_queries):
+        """Тест повторного запроса деталей без обращения к базе"""
+        first = api_client.get(self.detail_url(sample_question))
+        assert first.status_code == status.HTTP_200_OK
+
+        with django_assert_num_queries(0):
+            second = api_client.get(self.detail_url(sample_question))
+        assert second.status_code == status.HTTP_200_OK
+        assert second.content == first.content
+        assert second['ETag'] == first['ETag']
+
+    def test_list_served_from_cache(self, api_client, sample_question, django_assert_num_queries):
+        """Тест повторного запроса страницы списка без обращения к базе"""
+        url = reverse('api:questions:question-list-create')
+        first = api_client.get(url)
+
+        with django_assert_num_queries(0):
+            second = api_client.get(url)
+        assert second.content == first.content
+
+        with django_assert_num_queries(3):
+            api_client.get(url, {'page': 1})
+
+    def test_not_modified_by_etag(self, api_client, sample_question, django_assert_num_queries):
+        """Тест ответа 304 по If-None-Match"""
+        etag = api_client.get(self.detail_url(sample_question))['ETag']
+
+        with django_assert_num_queries(0):
+            response = api_client.get(
+                self.detail_url(sample_question), HTTP_IF_NONE_MATCH=etag
+            )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def age_versions(self, question, seconds=5):
+        get_api_cache().set_many(
+            {
+                key: time.time_ns() - seconds * 10**9
+                for key in (QUESTIONS_VERSION_KEY, question_version_key(question.id))
+            },
+            timeout=None,
+        )
+
+    def test_not_modified_by_last_modified(self, api_client, sample_question):
+        """Тест ответа 304 по If-Modified-Since"""
+        self.age_versions(sample_question)
+        last_modified = api_client.get(self.detail_url(sample_question))['Last-Modified']
+
+        response = api_client.get(
+            self.detail_url(sample_question), HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def freeze_at_version(self, monkeypatch, question):
+        """Часы кэша ответов - в секунде последнего изменения вопроса"""
+        version = get_api_cache().get(question_version_key(question.id))
+        monkeypatch.setattr(api_cache, 'time', SimpleNamespace(time=lambda: version / 10**9))
+
+    def test_no_last_modified_within_version_second(self, api_client, sample_question, monkeypatch):
+        """Тест: в секунду изменения Last-Modified не отдается и не проверяется"""
+        self.freeze_at_version(monkeypatch, sample_question)
+        response = api_client.get(self.detail_url(sample_question))
+        assert 'Last-Modified' not in response
+        assert 'ETag' in response
+
+        api_client.post(
+            reverse('api:answers:answer-create', kwargs={'question_id': sample_question.id}),
+            {'user_id': 'user_2', 'text': 'Ответ в ту же секунду'},
+            format='json',
+        )
+        self.freeze_at_version(monkeypatch, sample_question)
+        response = api_client.get(
+            self.detail_url(sample_question), HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60)
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_answer_create_invalidates(self, api_client, sample_question):
+        """Тест сброса кэша деталей и списка при добавлении ответа"""
+        detail = api_client.get(self.detail_url(sample_question))
+        api_client.get(reverse('api:questions:question-list-create'))
+
+        api_client.post(
+            reverse('api:answers:answer-create', kwargs={'question_id': sample_question.id}),
+            {"user_id": "user_2", "text": "Новый ответ"},
+            format='json',
+        )
+
+        response = api_client.get(
+            self.detail_url(sample_question), HTTP_IF_NONE_MATCH=detail['ETag']
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['answers_count'] == 2
+        listed = api_client.get(reverse('api:questions:question-list-create'))
+        assert listed.data['results'][0]['answers_count'] == 2
+
+    def test_answer_delete_invalidates(self, api_client, sample_question):
+        """Тест сброса кэша при удалении ответа"""
+        api_client.get(self.detail_url(sample_question))
+
+        sample_question.answers.first().delete()
+
+        response = api_client.get(self.detail_url(sample_question))
+        assert response.data['answers_count'] == 0
+
+    def test_question_delete_invalidates(self, api_client, sample_question):
+        """Тест сброса кэша при удалении вопроса"""
+        api_client.get(self.detail_url(sample_question))
+        api_client.get(reverse('api:questions:question-list-create'))
+
+        api_client.delete(self.detail_url(sample_question))
+
+        response = api_client.get(self.detail_url(sample_question))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        listed = api_client.get(reverse('api:questions:question-list-create'))
+        assert listed.data['count'] == 0
+
+    def test_missing_question_version_expires(self, api_client, settings):
+        """Тест: версия запрошенного несуществующего вопроса не хранится вечно"""
+        response = api_client.get(reverse('api:questions:question-detail', kwargs={'pk': 999999}))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        cache = get_api_cache()
+        expires = cache._expire_info[cache.make_key(question_version_key(999999))]
+        assert expires <= time.time() + settings.API_CACHE_VERSION_TIMEOUT
+
+    def admin_delete(self, admin_client, url, objects):
+        return admin_client.post(url, {
+            'action': 'delete_selected',
+            '_selected_action': [obj.pk for obj in objects],
+            'post': 'yes',
+        })
+
+    def test_admin_answers_delete_invalidates(self, api_client, admin_client, sample_question):
+        """Тест сброса кэша при удалении выбранных ответов в админке"""
+        api_client.get(self.detail_url(sample_question))
+
+        self.admin_delete(admin_client, '/admin/answers/answer/', sample_question.answers.all())
+
+        assert api_client.get(self.detail_url(sample_question)).data['answers_count'] == 0
+
+    def test_admin_questions_delete_invalidates(self, api_client, admin_client, sample_question):
+        """Тест сброса кэша при удалении выбранных вопросов в админке"""
+        api_client.get(self.detail_url(sample_question))
+        api_client.get(reverse('api:questions:question-list-create'))
+
+        self.admin_delete(admin_client, '/admin/questions/question/', [sample_question])
+
+        response = api_client.get(self.detail_url(sample_question))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert api_client.get(reverse('api:questions:question-list-create')).data['count'] == 0
@@ -0,0 +1,107 @@
+import csv
+import io
+import json
+import pytest
+from asgiref.sync import async_to_sync
+from datetime import timedelta
+from django.core.management import call_command
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from apps.questions.models import Question
+from apps.answers.models import Answer
+
+
+@pytest.mark.django_db
+class TestExport:
+    """Тесты потоковой выгрузки"""
+
+    @pytest.fixture
+    def api_client(self, admin_user):
+        client = APIClient()
+        client.force_authenticate(admin_user)
+        return client
+
+    @pytest.fixture
+    def questions(self):
+        questions = [Question.objects.create(text=f"Вопрос {i}?") for i in range(3)]
+        Answer.objects.create(question=questions[0], user_id="user_1", text="Ответ, с запятой")
+        return questions
+
+    def read(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_export_ndjson(self, api_client, questions):
+        """Тест выгрузки вопросов в NDJSON"""
+        response = api_client.get(reverse('api:export:export', kwargs={'table': 'questions'}))
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'application/x-ndjson'
+
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        assert [row['id'] for row in rows] == [question.id for question in questions]
+        assert rows[0]['text'] == "Вопрос 0?"
+
+    def test_export_csv(self, api_client, questions):
+        """Тест выгрузки ответов в CSV"""
+        response = api_client.get(
+            reverse('api:export:export', kwargs={'table': 'answers'}), {'output': 'csv'}
+        )
+        assert response['Content-Type'] == 'text/csv'
+
+        rows = list(csv.DictReader(io.StringIO(self.read(response))))
+        assert len(rows) == 1
+        assert rows[0]['question_id'] == str(questions[0].id)
+        assert rows[0]['text'] == "Ответ, с запятой"
+
+    def test_export_since(self, api_client, questions):
+        """Тест инкрементальной выгрузки"""
+        Question.objects.filter(id=questions[0].id).update(
+            created_at=questions[0].created_at - timedelta(days=1)
+        )
+        since = (questions[0].created_at - timedelta(hours=1)).isoformat()
+
+        response = api_client.get(
+            reverse('api:export:export', kwargs={'table': 'questions'}), {'since': since}
+        )
+        ids = [json.loads(line)['id'] for line in self.read(response).splitlines()]
+        assert ids == [question.id for question in questions[1:]]
+
+    def test_export_requires_admin(self, questions):
+        """Тест: выгрузка недоступна анонимам"""
+        url = reverse('api:export:export', kwargs={'table': 'answers'})
+        assert APIClient().get(url).status_code == status.HTTP_403_FORBIDDEN
+
+    def test_export_asgi(self, admin_user, questions):
+        """Тест асинхронной отдачи выгрузки под ASGI (без чтения в память)"""
+        client = AsyncClient()
+        client.force_login(admin_user)
+
+        async def export():
+            response = await client.get(reverse('api:export:export', kwargs={'table': 'questions'}))
+            return response, b"".join([chunk async for chunk in response.streaming_content])
+
+        response, body = async_to_sync(export)()
+
+        assert response.is_async
+        ids = [json.loads(line)['id'] for line in body.decode().splitlines()]
+        assert ids == [question.id for question in questions]
+
+    def test_export_invalid_params(self, api_client):
+        """Тест некорректных параметров выгрузки"""
+        url = reverse('api:export:export', kwargs={'table': 'questions'})
+        assert api_client.get(url, {'since': 'вчера'}).status_code == status.HTTP_400_BAD_REQUEST
+        assert api_client.get(url, {'output': 'xml'}).status_code == status.HTTP_400_BAD_REQUEST
+        response = api_client.get(reverse('api:export:export', kwargs={'table': 'users'}))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_export_command(self, questions, tmp_path):
+        """Тест команды export_data"""
+        output = io.StringIO()
+        call_command('export_data', 'questions', stdout=output, stderr=io.StringIO())
+        assert len(output.getvalue().splitlines()) == 3
+
+        path = tmp_path / 'answers.csv'
+        call_command('export_data', 'answers', '--format', 'csv', '-o', str(path), stderr=io.StringIO())
+        assert len(list(csv.DictReader(path.open(encoding='utf-8')))) == 1
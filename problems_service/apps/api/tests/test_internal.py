@@ -0,0 +1,44 @@
+import pytest
+from django.db import connections
+from django.urls import reverse
+from psycopg_pool import ConnectionPool
+from rest_framework.test import APIClient
+from rest_framework import status
+
+
+@pytest.mark.django_db
+class TestDatabasePoolStats:
+    """Тесты статистики пула соединений"""
+
+    @pytest.fixture
+    def url(self):
+        return reverse('api:internal:db-pool')
+
+    def test_requires_admin(self, url):
+        response = APIClient().get(url)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_without_pool(self, admin_client, url, monkeypatch):
+        """Без пула - постоянные соединения, счетчиков нет"""
+        monkeypatch.setattr(type(connections['default']), 'pool', None)
+        response = admin_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['pool'] is False
+        assert response.json()['stats'] == {}
+
+    def test_with_pool(self, admin_client, url, monkeypatch):
+        """Счетчики пула psycopg"""
+        connection = connections['default']
+        with ConnectionPool(
+            kwargs=connection.get_connection_params(), min_size=1, max_size=2
+        ) as pool:
+            monkeypatch.setattr(type(connection), 'pool', pool)
+            with pool.connection():
+                pass
+            response = admin_client.get(url)
+            monkeypatch.undo()
+
+        data = response.json()
+        assert data['pool'] is True
+        assert data['stats']['pool_max'] == 2
+        assert data['stats']['requests_num'] == 1
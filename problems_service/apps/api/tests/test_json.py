@@ -0,0 +1,112 @@
+import io
+import uuid
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+
+import pytest
+from django.utils.functional import lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.questions.models import Question
+from apps.answers.models import Answer
+from apps.api.parsers import ORJSONParser
+from apps.api.renderers import ORJSONRenderer
+from apps.api.serializers import question_serializer as q_ser
+
+
+class TestORJSONRenderer:
+    """Тесты совпадения вывода ORJSONRenderer и JSONRenderer"""
+
+    @pytest.mark.parametrize('data', [
+        {'created_at': datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)},
+        {'naive': datetime(2024, 5, 1, 12, 30), 'day': date(2024, 5, 1), 'at': time(8, 15)},
+        {'price': Decimal('12.50'), 'id': uuid.UUID(int=1)},
+        {'text': 'Вопрос про "кавычки" и \\ слэш', 'items': [1, 2.5, None, True]},
+        {'lazy': lazy(lambda: 'ленивая строка', str)()},
+        {1: 'нестроковый ключ'},
+        {'big': 2 ** 70},
+        {'text': 'строка\u2028абзац\u2029конец', '\u2028': [1.5]},
+    ])
+    def test_same_output_as_json_renderer(self, data):
+        """Тест побайтового совпадения с JSONRenderer"""
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_float_format(self):
+        """Тест единственного отличия: запись float короче, значения те же"""
+        data = {'values': [1e16, 1e-07, 0.1, 2.5]}
+
+        content = ORJSONRenderer().render(data)
+
+        assert content == b'{"values":[1e16,1e-7,0.1,2.5]}'
+        assert JSONParser().parse(io.BytesIO(content)) == JSONParser().parse(
+            io.BytesIO(JSONRenderer().render(data))
+        )
+
+    def test_none(self):
+        """Тест пустого тела для None"""
+        assert ORJSONRenderer().render(None) == b''
+
+    def test_indent_uses_json_renderer(self):
+        """Тест отступов из заголовка Accept"""
+        data = {'id': 1}
+        media_type = 'application/json; indent=4'
+
+        assert ORJSONRenderer().render(data, media_type) == JSONRenderer().render(data, media_type)
+
+    def test_unserializable(self):
+        """Тест ошибки для неподдерживаемого типа"""
+        with pytest.raises(TypeError):
+            ORJSONRenderer().render({'value': object()})
+
+    def test_without_orjson(self, monkeypatch):
+        """Тест работы без установленного orjson"""
+        monkeypatch.setattr('apps.api.renderers.orjson', None)
+        data = {'price': Decimal('1.5'), 'text': 'ответ'}
+
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    @pytest.mark.django_db
+    def test_question_detail_list(self):
+        """Тест списка вопросов с ответами"""
+        question = Question.objects.create(text='Вопрос с ответами?')
+        Answer.objects.create(question=question, user_id='user_1', text='Первый')
+        Answer.objects.create(question=question, user_id='user_2', text='Второй')
+        data = q_ser.QuestionDetailSerializer(
+            Question.objects.prefetch_related('answers'), many=True
+        ).data
+
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+class TestORJSONParser:
+    """Тесты разбора JSON через orjson"""
+
+    def parse(self, body, **context):
+        return ORJSONParser().parse(io.BytesIO(body), 'application/json', context)
+
+    def test_parse(self):
+        """Тест разбора тела запроса"""
+        body = '{"text": "Вопрос?", "ids": [1, 2], "score": 1.5}'.encode()
+
+        assert self.parse(body) == {'text': 'Вопрос?', 'ids': [1, 2], 'score': 1.5}
+
+    @pytest.mark.parametrize('body', [b'{"text": ', b'{"value": NaN}', b'\xff'])
+    def test_invalid(self, body):
+        """Тест ошибки разбора некорректного JSON"""
+        with pytest.raises(ParseError):
+            self.parse(body)
+
+    def test_other_encoding_uses_json_parser(self):
+        """Тест тела не в UTF-8"""
+        body = '{"text": "ответ"}'.encode('cp1251')
+
+        assert self.parse(body, encoding='cp1251') == {'text': 'ответ'}
+
+    def test_without_orjson(self, monkeypatch):
+        """Тест работы без установленного orjson"""
+        monkeypatch.setattr('apps.api.parsers.orjson', None)
+        body = b'{"text": "answer"}'
+
+        assert self.parse(body) == JSONParser().parse(io.BytesIO(body))
@@ -0,0 +1,111 @@
+import json
+import logging
+import sys
+
+import pytest
+from django.conf import settings
+
+from apps.api.log import JsonFormatter, SamplingFilter, configure_logging
+
+
+def make_record(msg, *args, level=logging.INFO, **extra):
+    record = logging.LogRecord('apps.test', level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestJsonFormatter:
+    """Тесты JSON-формата записей"""
+
+    def test_fields_and_extra(self):
+        """Тест сообщения с подставленными аргументами и полей из extra"""
+        record = make_record('Retrieved question %s', 7, question_id=7)
+
+        payload = json.loads(JsonFormatter().format(record))
+
+        assert payload['level'] == 'INFO'
+        assert payload['logger'] == 'apps.test'
+        assert payload['message'] == 'Retrieved question 7'
+        assert payload['question_id'] == 7
+        assert 'args' not in payload and 'msg' not in payload
+
+    def test_exception_and_non_ascii(self):
+        """Тест трассировки исключения и кириллицы без экранирования"""
+        try:
+            raise ValueError('ошибка')
+        except ValueError:
+            record = make_record('Не удалось', level=logging.ERROR)
+            record.exc_info = sys.exc_info()
+
+        line = JsonFormatter().format(record)
+
+        assert 'Не удалось' in line
+        assert 'ValueError: ошибка' in json.loads(line)['exc_info']
+
+
+class TestSamplingFilter:
+    """Тесты выборки частых сообщений"""
+
+    def test_drops_matching_records(self):
+        """Тест отбрасывания частых сообщений при нулевой доле"""
+        sampling = SamplingFilter(rate=0.0, prefixes=['Retrieved'])
+
+        assert not sampling.filter(make_record('Retrieved answer %s', 1))
+        assert sampling.filter(make_record('Created answer %s', 1))
+        assert sampling.filter(make_record('Retrieved answer %s', 1, level=logging.WARNING))
+
+    def test_rate(self, monkeypatch):
+        """Тест пропуска доли записей"""
+        sampling = SamplingFilter(rate=0.25, level='INFO')
+        values = iter([0.1, 0.5, 0.2, 0.9])
+        monkeypatch.setattr('apps.api.log.random.random', lambda: next(values))
+
+        passed = [sampling.filter(make_record('Retrieved list of questions')) for _ in range(4)]
+
+        assert passed == [True, False, True, False]
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 12), reason='QueueHandler в dictConfig требует Python 3.12+'
+)
+class TestQueueLogging:
+    """Тесты записи логов через очередь и фоновый поток"""
+
+    @pytest.fixture
+    def restore_logging(self):
+        yield
+        configure_logging(settings.LOGGING)
+
+    def test_listener_writes_records(self, restore_logging):
+        """Тест записи в обработчик из потока QueueListener"""
+        records = []
+
+        class ListHandler(logging.Handler):
+            def emit(self, record):
+                records.append(record)
+
+        configure_logging({
+            'version': 1,
+            'disable_existing_loggers': False,
+            'filters': {
+                'sampling': {'()': SamplingFilter, 'rate': 0.0},
+            },
+            'handlers': {
+                'memory': {'()': ListHandler},
+                'queue': {
+                    'class': 'logging.handlers.QueueHandler',
+                    'handlers': ['memory'],
+                    'filters': ['sampling'],
+                },
+            },
+            'loggers': {
+                'apps.test': {'handlers': ['queue'], 'level': 'INFO', 'propagate': False},
+            },
+        })
+        queue_handler = logging.getLogger('apps.test').handlers[0]
+
+        logging.getLogger('apps.test').info('Retrieved answer %s', 1)
+        logging.getLogger('apps.test').info('Created answer %s', 2)
+        queue_handler.listener.stop()
+
+        assert [record.getMessage() for record in records] == ['Created answer 2']
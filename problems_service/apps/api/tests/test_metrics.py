@@ -0,0 +1,167 @@
+import json
+import os
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.answers.models import Answer
+from apps.api.metrics import METRICS, Histogram, RequestMetrics, RequestStats, mark_process_dead
+from apps.questions.models import Question
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    METRICS.reset()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def question():
+    question = Question.objects.create(text="Вопрос про метрики?")
+    Answer.objects.create(question=question, user_id='user_1', text='Ответ')
+    return question
+
+
+def test_histogram_buckets():
+    """Тест накопительных корзин и формата Prometheus"""
+    histogram = Histogram('test_seconds', 'Тест', (0.1, 1.0), labels=('view',))
+    for value in (0.05, 0.1, 0.5, 5):
+        histogram.observe(('v',), value)
+
+    assert list(histogram.expose())[2:] == [
+        'test_seconds_bucket{view="v",le="0.1"} 2',
+        'test_seconds_bucket{view="v",le="1.0"} 3',
+        'test_seconds_bucket{view="v",le="+Inf"} 4',
+        'test_seconds_sum{view="v"} 5.65',
+        'test_seconds_count{view="v"} 4',
+    ]
+
+
+@pytest.mark.django_db
+class TestPerformanceMiddleware:
+    """Тесты метрик запросов"""
+
+    def db_queries(self, view, method='GET'):
+        counts, total = next(
+            value for labels, value in METRICS.db_queries.series.items()
+            if labels == (view, method)
+        )
+        return sum(counts), total[0]
+
+    def test_server_timing(self, api_client, question):
+        """Тест заголовка Server-Timing"""
+        response = api_client.get(reverse('api:questions:question-detail', kwargs={'pk': question.id}))
+
+        timing = response['Server-Timing']
+        assert timing.startswith('db;dur=')
+        assert 'serialize;dur=' in timing and 'total;dur=' in timing
+
+    def test_server_timing_disabled(self, api_client, question, settings):
+        settings.SERVER_TIMING = False
+        response = api_client.get(reverse('api:questions:question-list-create'))
+        assert 'Server-Timing' not in response
+
+    def test_queries_by_view(self, api_client, question):
+        """Тест учета SQL-запросов по имени маршрута"""
+        api_client.get(reverse('api:answers:answer-detail', kwargs={'pk': question.answers.get().id}))
+        api_client.get(reverse('api:answers:answer-create', kwargs={'question_id': question.id}))
+
+        assert self.db_queries('api:answers:answer-detail') == (1, 1)
+        requests, queries = self.db_queries('api:answers:answer-create')
+        assert requests == 1 and queries >= 2
+
+    def test_asgi(self, question):
+        """Тест учета запросов async-views под ASGI (запросы в потоках sync_to_async)"""
+        url = reverse('api:answers:answer-detail', kwargs={'pk': question.answers.get().id})
+
+        response = async_to_sync(AsyncClient().get)(url)
+
+        assert 'db;dur=' in response['Server-Timing']
+        assert self.db_queries('api:answers:answer-detail') == (1, 1)
+
+    def test_queries_outside_requests_not_counted(self, api_client, question):
+        """Тест: запросы вне HTTP-запросов не попадают в метрики"""
+        Question.objects.count()
+
+        assert METRICS.db_queries.series == {}
+
+    def test_unresolved(self, api_client):
+        api_client.get('/missing/')
+
+        assert any(labels[0] == 'unresolved' for labels in METRICS.duration.series)
+
+
+@pytest.mark.django_db
+class TestMetricsView:
+    """Тесты эндпоинта метрик"""
+
+    @pytest.fixture
+    def url(self):
+        return reverse('api:internal:metrics')
+
+    def test_requires_auth(self, api_client, url):
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_token(self, api_client, url, question, settings):
+        """Тест сбора метрик по токену в формате Prometheus"""
+        settings.METRICS_TOKEN = 'secret'
+        api_client.get(reverse('api:questions:question-detail', kwargs={'pk': question.id}))
+
+        denied = api_client.get(url, HTTP_AUTHORIZATION='Bearer wrong')
+        response = api_client.get(url, HTTP_AUTHORIZATION='Bearer secret')
+
+        assert denied.status_code == status.HTTP_403_FORBIDDEN
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+        body = response.content.decode()
+        assert '# TYPE http_request_duration_seconds histogram' in body
+        assert 'view="api:questions:question-detail",method="GET",status="200"} 1' in body
+        assert 'http_response_size_bytes_count{' in body
+
+    def test_admin(self, admin_client, url):
+        assert admin_client.get(url).status_code == status.HTTP_200_OK
+
+    def test_aggregates_processes(self, api_client, url, question, settings, tmp_path):
+        """Тест суммирования рядов всех воркеров из METRICS_DIR"""
+        settings.METRICS_TOKEN = 'secret'
+        settings.METRICS_DIR = str(tmp_path)
+        view = 'api:questions:question-detail'
+        other = RequestMetrics()
+        other.observe(view, 'GET', 200, RequestStats(queries=1), 0.2, 10)
+        (tmp_path / '1.json').write_text(json.dumps(other.dump()))
+        (tmp_path / '2.json').write_text('{')
+        api_client.get(reverse(view, kwargs={'pk': question.id}))
+
+        body = api_client.get(url, HTTP_AUTHORIZATION='Bearer secret').content.decode()
+
+        assert f'view="{view}",method="GET",status="200"}} 2' in body
+        assert f'http_request_db_queries_count{{view="{view}",method="GET"}} 2' in body
+        assert len(list(tmp_path.glob('*.json'))) == 3
+
+    def test_worker_exit(self, api_client, url, question, settings, tmp_path):
+        """Тест слияния рядов завершившегося воркера: файл удаляется, суммы не убывают"""
+        settings.METRICS_TOKEN = 'secret'
+        settings.METRICS_DIR = str(tmp_path)
+        view = 'api:questions:question-detail'
+        worker = RequestMetrics()
+        worker.observe(view, 'GET', 200, RequestStats(queries=1), 0.2, 10)
+        for _ in range(2):
+            # Второй воркер получает pid первого
+            (tmp_path / '1.json').write_text(json.dumps(worker.dump()))
+            mark_process_dead(1, str(tmp_path))
+
+        body = api_client.get(url, HTTP_AUTHORIZATION='Bearer secret').content.decode()
+
+        assert f'view="{view}",method="GET",status="200"}} 2' in body
+        assert sorted(path.name for path in tmp_path.glob('*.json')) == sorted(
+            ['dead.json', f'{os.getpid()}.json']
+        )
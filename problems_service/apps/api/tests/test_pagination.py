@@ -0,0 +1,98 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from apps.api.pagination import KeysetPagination
+from apps.questions.models import Question
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    """Тесты keyset-пагинации списка вопросов"""
+
+    @pytest.fixture
+    def api_client(self):
+        return APIClient()
+
+    @pytest.fixture
+    def questions(self, monkeypatch):
+        monkeypatch.setattr(KeysetPagination, "page_size", 2)
+        return [Question.objects.create(text=f"Вопрос {i}?") for i in range(5)]
+
+    def collect(self, api_client, url):
+        """Проходит по всем страницам по ссылкам next"""
+        pages = []
+        while url:
+            response = api_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            pages.append(response.data)
+            url = response.data['next']
+        return pages
+
+    def test_cursor_pages_by_id(self, api_client, questions):
+        """Тест обхода страниц по id без подсчета количества"""
+        url = reverse('api:questions:question-list-create') + '?pagination=cursor'
+        pages = self.collect(api_client, url)
+
+        assert [len(page['results']) for page in pages] == [2, 2, 1]
+        ids = [item['id'] for page in pages for item in page['results']]
+        assert ids == [question.id for question in questions]
+        assert all('count' not in page for page in pages)
+        assert pages[0]['previous'] is None
+
+    def test_cursor_pages_by_created_at_desc(self, api_client, questions):
+        """Тест сортировки по (created_at, id) в обратном порядке"""
+        url = (
+            reverse('api:questions:question-list-create')
+            + '?pagination=cursor&ordering=-created_at'
+        )
+        pages = self.collect(api_client, url)
+
+        ids = [item['id'] for page in pages for item in page['results']]
+        expected = sorted(questions, key=lambda q: (q.created_at, q.id), reverse=True)
+        assert ids == [question.id for question in expected]
+
+    def test_previous_link(self, api_client, questions):
+        """Тест возврата на предыдущую страницу"""
+        url = reverse('api:questions:question-list-create') + '?pagination=cursor'
+        first = api_client.get(url).data
+        second = api_client.get(first['next']).data
+
+        previous = api_client.get(second['previous']).data
+        assert previous['results'] == first['results']
+        assert previous['previous'] is None
+
+    def test_invalid_cursor(self, api_client, questions):
+        """Тест некорректного курсора"""
+        url = (
+            reverse('api:questions:question-list-create')
+            + '?pagination=cursor&cursor=invalid'
+        )
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_cursor_with_other_ordering_is_rejected(self, api_client, questions):
+        """Тест курсора, выданного для другой сортировки"""
+        url = reverse('api:questions:question-list-create') + '?pagination=cursor'
+        next_url = api_client.get(url).data['next']
+
+        response = api_client.get(next_url + '&ordering=created_at')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_count_modes(self, api_client, questions):
+        """Тест точного и приблизительного количества"""
+        url = reverse('api:questions:question-list-create') + '?pagination=cursor'
+
+        exact = api_client.get(url + '&count=exact').data
+        assert exact['count'] == 5
+
+        approximate = api_client.get(url + '&count=approximate').data
+        assert isinstance(approximate['count'], int)
+        assert approximate['count'] >= 0
+
+    def test_page_number_pagination_by_default(self, api_client, questions):
+        """Тест что без параметра остается постраничная пагинация"""
+        response = api_client.get(reverse('api:questions:question-list-create'))
+        assert response.data['count'] == 5
+        assert len(response.data['results']) == 5
@@ -0,0 +1,141 @@
+import pytest
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from rest_framework.test import APIClient
+
+from apps.answers.models import Answer
+from apps.api.queryguard import QueryBudgetExceeded, QueryReport, sql_shape
+from apps.jobs.queue import enqueue
+from apps.api.views.questions import QuestionDetailView
+from apps.questions.models import Question
+
+
+def api_patterns(patterns=None, namespace=''):
+    """(имя маршрута, класс представления) для всех маршрутов apps.api.urls"""
+    for pattern in patterns if patterns is not None else get_resolver().url_patterns:
+        if isinstance(pattern, URLResolver):
+            child = f'{namespace}:{pattern.namespace}' if namespace else pattern.namespace or ''
+            yield from api_patterns(pattern.url_patterns, child)
+        elif isinstance(pattern, URLPattern) and namespace.startswith('api'):
+            yield f'{namespace}:{pattern.name}', pattern.callback.view_class
+
+
+@pytest.fixture
+def data():
+    """Несколько вопросов с ответами разных пользователей: N+1 дал бы повторы"""
+    questions = [Question.objects.create(text=f"Вопрос про бюджет {i}?") for i in range(5)]
+    answers = [
+        Answer.objects.create(question=question, user_id=f'user_{j}', text=f'Ответ про бюджет {j}')
+        for question in questions
+        for j in range(5)
+    ]
+    job = enqueue('questions.rebuild_hot')
+    return {'question': questions[0], 'answer': answers[0], 'job': job}
+
+
+ENDPOINTS = [
+    ('get', 'api:questions:question-list-create', {}, None),
+    ('get', 'api:questions:question-list-create', {}, {'ordering': '-created_at'}),
+    ('post', 'api:questions:question-list-create', {}, {'text': 'Новый вопрос?'}),
+    ('get', 'api:questions:question-hot', {}, None),
+    ('get', 'api:questions:question-detail', {'pk': 'question'}, None),
+    ('delete', 'api:questions:question-detail', {'pk': 'question'}, None),
+    ('get', 'api:answers:answer-create', {'question_id': 'question'}, None),
+    ('post', 'api:answers:answer-create', {'question_id': 'question'}, {'user_id': 'user_9', 'text': 'Ответ'}),
+    ('post', 'api:answers:question-answer-bulk-create', {'question_id': 'question'}, [{'user_id': 'user_9', 'text': 'Ответ'}] * 3),
+    ('post', 'api:answers:answer-bulk-create', {}, [{'question_id': 'question', 'user_id': 'user_9', 'text': 'Ответ'}] * 3),
+    ('get', 'api:answers:answer-detail', {'pk': 'answer'}, None),
+    ('delete', 'api:answers:answer-detail', {'pk': 'answer'}, None),
+    ('get', 'api:answers:user-answer-list', {'user_id': 'user_1'}, None),
+    ('get', 'api:answers:user-answer-list', {'user_id': 'user_1'}, {'group_by': 'question', 'count': 'exact'}),
+    ('get', 'api:export:export', {'table': 'answers'}, None),
+    ('get', 'api:search:search', {}, {'q': 'бюджет'}),
+    ('get', 'api:jobs:job-detail', {'pk': 'job'}, None),
+    ('get', 'api:internal:db-pool', {}, None),
+    ('get', 'api:internal:metrics', {}, None),
+]
+
+
+@pytest.mark.django_db
+class TestQueryBudget:
+    """Все эндпоинты API укладываются в объявленный бюджет запросов без N+1"""
+
+    def test_every_endpoint_declares_budget(self):
+        names = set()
+        for name, view_class in api_patterns():
+            names.add(name)
+            assert hasattr(view_class, 'query_budget'), name
+        assert names == {name for _, name, _, _ in ENDPOINTS}
+
+    @pytest.mark.parametrize('method, name, kwargs, payload', ENDPOINTS)
+    def test_endpoint(self, request, data, method, name, kwargs, payload):
+        client = request.getfixturevalue('admin_client') if name.startswith(('api:internal', 'api:export')) else APIClient()
+        url = reverse(name, kwargs={key: getattr(data.get(value), 'pk', value) for key, value in kwargs.items()})
+        if isinstance(payload, list):
+            payload = [
+                {**item, 'question_id': data['question'].pk} if 'question_id' in item else item
+                for item in payload
+            ]
+
+        if method == 'get':
+            response = client.get(url, payload or {})
+        else:
+            response = getattr(client, method)(url, payload, content_type='application/json')
+
+        assert response.status_code < 300, response.content
+
+    @pytest.mark.parametrize('url', ['/admin/answers/answer/', '/admin/questions/question/'])
+    def test_admin_changelist(self, admin_client, data, url):
+        """Тест: списки админки без запроса на строку (question_preview)"""
+        assert admin_client.get(url).status_code == 200
+
+
+class TestQueryReport:
+    """Тесты поиска N+1 и превышения бюджета"""
+
+    def test_shape(self):
+        """Тест: списки параметров IN разной длины - одна форма"""
+        assert sql_shape('SELECT * FROM t WHERE id IN (%s, %s,\n %s)') == sql_shape(
+            'SELECT * FROM t WHERE id IN (%s, %s)'
+        )
+
+    def test_problems(self):
+        statements = ['SAVEPOINT "s1"', 'SELECT 1'] + ['SELECT * FROM t WHERE id = %s'] * 3
+        report = QueryReport('view', 'GET', statements, budget=3, repeat_threshold=3)
+
+        assert report.problems() == [
+            'N+1: 3 x SELECT * FROM t WHERE id = %s',
+            '4 queries over budget 3',
+        ]
+        assert QueryReport('view', 'GET', statements, budget=None, repeat_threshold=None).problems() == []
+
+
+@pytest.mark.django_db
+class TestQueryGuard:
+    """Тесты QueryGuardMiddleware"""
+
+    @pytest.fixture
+    def url(self, data):
+        return reverse('api:questions:question-detail', kwargs={'pk': data['question'].pk})
+
+    def test_raise(self, url, monkeypatch):
+        """Тест: превышение бюджета роняет тест"""
+        monkeypatch.setattr(QuestionDetailView, 'query_budget', 1)
+
+        with pytest.raises(QueryBudgetExceeded, match='2 queries over budget 1'):
+            APIClient().get(url)
+
+    def test_warn(self, url, monkeypatch, settings, caplog):
+        """Тест предупреждения в режиме разработки"""
+        settings.QUERY_GUARD = 'warn'
+        monkeypatch.setattr(QuestionDetailView, 'query_budget', 1)
+
+        response = APIClient().get(url)
+
+        assert response.status_code == 200
+        assert 'GET api:questions:question-detail: 2 queries over budget 1' in caplog.text
+
+    def test_disabled(self, url, monkeypatch, settings):
+        settings.QUERY_GUARD = ''
+        monkeypatch.setattr(QuestionDetailView, 'query_budget', 0)
+
+        assert APIClient().get(url).status_code == 200
@@ -0,0 +1,123 @@
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from apps.api import search as search_module
+from apps.api.search import build_search_query
+from apps.questions.models import Question
+from apps.answers.models import Answer
+
+
+@pytest.mark.django_db
+class TestSearch:
+    """Тесты полнотекстового поиска"""
+
+    @pytest.fixture
+    def api_client(self):
+        return APIClient()
+
+    @pytest.fixture
+    def questions(self):
+        indexes = Question.objects.create(text="Как работают индексы в базах данных?")
+        python = Question.objects.create(text="Как установить Python?")
+        Answer.objects.create(
+            question=indexes, user_id="user_1", text="Индекс ускоряет поиск, индексами нужно пользоваться"
+        )
+        Answer.objects.create(question=indexes, user_id="user_2", text="Индекс занимает место")
+        Answer.objects.create(question=python, user_id="user_1", text="Скачайте установщик")
+        return indexes, python
+
+    def search(self, api_client, **params):
+        return api_client.get(reverse('api:search:search'), params)
+
+    def test_morphology(self, api_client, questions):
+        """Тест поиска по другой форме слова"""
+        response = self.search(api_client, q='индексом')
+        assert response.status_code == status.HTTP_200_OK
+        assert [hit['id'] for hit in response.data['questions']] == [questions[0].id]
+        assert len(response.data['answers']) == 2
+
+    def test_ranking_and_snippet(self, api_client, questions):
+        """Тест порядка по релевантности и выделения совпадений"""
+        response = self.search(api_client, q='индекс', type='answers')
+        hits = response.data['answers']
+        assert 'questions' not in response.data
+        assert hits[0]['user_id'] == "user_1"
+        assert hits[0]['rank'] > hits[1]['rank']
+        assert '<b>Индекс</b>' in hits[0]['snippet']
+        assert hits[0]['question_id'] == questions[0].id
+
+    def test_snippet_is_escaped(self, api_client, questions):
+        """Тест экранирования разметки из текста ответа во фрагменте"""
+        api_client.post(
+            reverse('api:answers:answer-create', kwargs={'question_id': questions[1].id}),
+            {'user_id': 'user_3', 'text': 'Установщик <script>alert("x")</script> <img src=x onerror=alert(1)>'},
+            format='json',
+        )
+
+        response = self.search(api_client, q='установщик', type='answers')
+
+        snippets = [hit['snippet'] for hit in response.data['answers']]
+        assert len(snippets) == 2
+        escaped = next(snippet for snippet in snippets if 'script' in snippet)
+        assert '<script>' not in escaped and '<img' not in escaped
+        assert '&lt;script&gt;' in escaped
+        assert '&lt;img' in escaped
+        assert '<b>Установщик</b>' in escaped
+
+    def test_ranking_within_candidates(self, api_client, questions, monkeypatch):
+        """Тест ранжирования среди MAX_SEARCH_CANDIDATES самых новых совпадений"""
+        question = questions[1]
+        # Лучший ответ создан первым: при равном ранге он проиграл бы по id
+        best = Answer.objects.create(question=question, user_id='best', text='Кэш кэш кэш')
+        fillers = Answer.objects.bulk_create(
+            Answer(question=question, user_id='filler', text=f'Кэш номер {i} и много других слов ответа')
+            for i in range(30)
+        )
+
+        response = self.search(api_client, q='кэш', type='answers', limit=1)
+        assert [hit['id'] for hit in response.data['answers']] == [best.id]
+
+        monkeypatch.setattr(search_module, 'MAX_SEARCH_CANDIDATES', 10)
+        response = self.search(api_client, q='кэш', type='answers', limit=20)
+        assert {hit['id'] for hit in response.data['answers']} == {
+            answer.id for answer in fillers[-10:]
+        }
+
+    def test_websearch_syntax(self, api_client, questions):
+        """Тест исключения слова"""
+        response = self.search(api_client, q='индекс -место', type='answers')
+        assert [hit['user_id'] for hit in response.data['answers']] == ["user_1"]
+
+    def test_limit(self, api_client, questions):
+        response = self.search(api_client, q='индекс', type='answers', limit=1)
+        assert len(response.data['answers']) == 1
+
+    def test_no_matches(self, api_client, questions):
+        response = self.search(api_client, q='кошка')
+        assert response.data == {'questions': [], 'answers': []}
+
+    @pytest.mark.parametrize('params', [{}, {'q': '  '}, {'q': 'индекс', 'type': 'users'}, {'q': 'индекс', 'limit': 0}])
+    def test_invalid_params(self, api_client, params):
+        response = api_client.get(reverse('api:search:search'), params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_queries(self, api_client, questions, django_assert_num_queries):
+        """Один запрос на каждый тип результатов"""
+        with django_assert_num_queries(2):
+            self.search(api_client, q='индекс')
+
+    def test_search_vector_is_deferred(self, questions, django_assert_num_queries):
+        """Обычные запросы не читают tsvector"""
+        with django_assert_num_queries(1) as captured:
+            list(Answer.objects.all())
+        assert 'search_vector' not in captured.captured_queries[0]['sql']
+
+    def test_uses_gin_index(self, questions):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        query = build_search_query('индекс')
+        assert 'answers_search_idx' in Answer.objects.filter(search_vector=query).explain()
+        assert 'questions_search_idx' in Question.objects.filter(search_vector=query).order_by().explain()
@@ -1,10 +1,38 @@
 import pytest
 import uuid
+from datetime import datetime, timezone as dt_timezone
+from zoneinfo import ZoneInfo
+from django.db.models import Count, Max, Prefetch
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
 
-from apps.api.serializers.answer_serializer import AnswerCreateSerialier, AnswerSerializer
-from apps.api.serializers.question_serializer import QuestionCreateSerializer, QuestionListSerializer, QuestionDetailSerializer
-from apps.questions.models import Question
+from apps.api.serializers.answer_serializer import (
+    AnswerCreateSerialier,
+    AnswerSerializer,
+    UserQuestionAnswersSerializer,
+)
+from apps.api.serializers.question_serializer import (
+    HotQuestionSerializer,
+    QuestionCreateSerializer,
+    QuestionDetailSerializer,
+    QuestionListSerializer,
+)
+from apps.api.serializers.row_serializer import (
+    ANSWER_FIELDS,
+    HOT_QUESTION_FIELDS,
+    QUESTION_FIELDS,
+    answer_to_representation,
+    datetime_to_representation,
+    get_timezone,
+    hot_question_to_representation,
+    question_to_representation,
+    user_question_answers_to_representation,
+)
+from apps.questions.models import Question, QuestionRank
 from apps.answers.models import Answer
 
 
@@ -161,4 +189,118 @@ class TestQuestionSerializers:
         assert 'answers' in data
         assert len(data['answers']) == 1
         assert data['answers'][0]['id'] == answer.id
-        assert data['answers_count'] == 1
\ No newline at end of file
+        assert data['answers_count'] == 1
+
+@pytest.mark.django_db
+class TestRowSerializers:
+    """Тесты быстрого пути: JSON из строк .values() совпадает с сериализаторами"""
+
+    @pytest.fixture
+    def question(self):
+        question = Question.objects.create(text="Вопрос для быстрого пути?")
+        Answer.objects.create(question=question, user_id="user_1", text="Первый ответ")
+        Answer.objects.create(question=question, user_id="user_2", text="Второй ответ")
+        # Время без микросекунд форматируется без дробной части
+        Answer.objects.filter(user_id="user_2").update(
+            created_at=datetime(2024, 1, 2, 3, 4, 5, tzinfo=dt_timezone.utc)
+        )
+        return question
+
+    def render(self, data):
+        return JSONRenderer().render(data)
+
+    def answer_rows(self, question):
+        return [
+            answer_to_representation(row, get_timezone())
+            for row in Answer.objects.filter(question=question).order_by('id').values(*ANSWER_FIELDS)
+        ]
+
+    def test_answer(self, question):
+        """Тест ответа"""
+        answers = Answer.objects.filter(question=question).order_by('id')
+
+        assert self.render(self.answer_rows(question)) == self.render(
+            AnswerSerializer(answers, many=True).data
+        )
+
+    def test_question_list(self, question):
+        """Тест вопроса без ответов (QuestionListSerializer)"""
+        row = Question.objects.with_answers_count().values(*QUESTION_FIELDS).get(id=question.id)
+        instance = Question.objects.with_answers_count().get(id=question.id)
+
+        assert self.render(question_to_representation(row, get_timezone())) == self.render(
+            QuestionListSerializer(instance).data
+        )
+
+    def test_question_detail(self, question):
+        """Тест вопроса с ответами (QuestionDetailSerializer)"""
+        row = Question.objects.with_answers_count().values(*QUESTION_FIELDS).get(id=question.id)
+        instance = (
+            Question.objects.with_answers_count()
+            .prefetch_related(Prefetch('answers', queryset=Answer.objects.order_by('id')))
+            .get(id=question.id)
+        )
+
+        assert self.render(
+            question_to_representation(row, get_timezone(), self.answer_rows(question))
+        ) == self.render(QuestionDetailSerializer(instance).data)
+
+    def test_hot_question(self, question):
+        """Тест горячего вопроса (HotQuestionSerializer)"""
+        row = QuestionRank.objects.values(*HOT_QUESTION_FIELDS).get(question=question)
+        instance = QuestionRank.objects.select_related('question').get(question=question)
+
+        assert self.render(hot_question_to_representation(row, get_timezone())) == self.render(
+            HotQuestionSerializer(instance).data
+        )
+
+    def test_current_timezone(self, question):
+        """Тест перевода времени в текущий часовой пояс"""
+        with timezone.override(ZoneInfo('Europe/Moscow')):
+            rows = self.answer_rows(question)
+            data = AnswerSerializer(
+                Answer.objects.filter(question=question).order_by('id'), many=True
+            ).data
+
+        assert rows[1]['created_at'] == '2024-01-02T06:04:05+03:00'
+        assert self.render(rows) == self.render(data)
+
+    def test_user_question_answers(self, question):
+        """Тест группировки ответов пользователя по вопросам"""
+        row = (
+            Answer.objects.filter(user_id='user_1')
+            .values('question_id')
+            .annotate(answers_count=Count('id'), last_answer_at=Max('created_at'))
+            .get()
+        )
+
+        assert self.render(user_question_answers_to_representation(row, get_timezone())) == self.render(
+            UserQuestionAnswersSerializer(row).data
+        )
+
+    def test_question_detail_endpoint(self, question):
+        """Тест ответа эндпоинта вопроса против QuestionDetailSerializer"""
+        response = APIClient().get(
+            reverse('api:questions:question-detail', kwargs={'pk': question.id})
+        )
+        instance = (
+            Question.objects.with_answers_count()
+            .prefetch_related('answers')
+            .get(id=question.id)
+        )
+
+        assert response.content == self.render(QuestionDetailSerializer(instance).data)
+
+    @pytest.mark.parametrize('use_tz', [True, False])
+    @pytest.mark.parametrize('value', [
+        datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=dt_timezone.utc),
+        datetime(2024, 1, 2, 3, 4, 5, tzinfo=ZoneInfo('Asia/Tokyo')),
+        datetime(2024, 1, 2, 3, 4, 5),
+    ])
+    def test_datetime_formats(self, settings, use_tz, value):
+        """Тест формата дат против DateTimeField"""
+        settings.USE_TZ = use_tz
+
+        assert datetime_to_representation(value, get_timezone()) == (
+            serializers.DateTimeField().to_representation(value)
+        )
@@ -0,0 +1,127 @@
+import pytest
+from django.core.cache import caches
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.api.throttling import Bucket, parse_rate, take_token
+from apps.questions.models import Question
+
+
+@pytest.fixture
+def rates(settings):
+    def set_rates(**rates):
+        settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates}
+
+    return set_rates
+
+
+class TestTokenBucket:
+    """Тесты алгоритма token bucket"""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr('apps.api.throttling.time.monotonic', lambda: now[0])
+        return now
+
+    def test_parse_rate(self):
+        """Тест разбора лимита"""
+        assert parse_rate('30/min') == Bucket(30, 0.5)
+        assert parse_rate('10/s') == Bucket(10, 10)
+
+    def test_burst_and_refill(self, clock):
+        """Тест всплеска до емкости и пополнения со временем"""
+        cache = caches['api']
+        bucket = parse_rate('3/min')
+
+        assert [take_token(cache, 'bucket', bucket) for _ in range(3)] == [0, 0, 0]
+        assert take_token(cache, 'bucket', bucket) == pytest.approx(20)
+
+        clock[0] += 15
+        assert take_token(cache, 'bucket', bucket) == pytest.approx(5)
+
+        clock[0] += 5
+        assert take_token(cache, 'bucket', bucket) == 0
+
+    def test_full_bucket_after_idle(self, clock):
+        """Тест: после простоя жетонов не больше емкости"""
+        cache = caches['api']
+        bucket = parse_rate('2/min')
+        take_token(cache, 'idle', bucket)
+
+        clock[0] += 3600
+        assert [take_token(cache, 'idle', bucket) for _ in range(3)][-1] > 0
+
+
+@pytest.mark.django_db
+class TestWriteThrottling:
+    """Тесты ограничения создания вопросов и ответов"""
+
+    @pytest.fixture
+    def api_client(self):
+        return APIClient()
+
+    @pytest.fixture
+    def question(self):
+        return Question.objects.create(text="Вопрос для ограничения?")
+
+    def post_answer(self, api_client, question, user_id, **extra):
+        return api_client.post(
+            reverse('api:answers:answer-create', kwargs={'question_id': question.id}),
+            {'user_id': user_id, 'text': 'Ответ'},
+            format='json',
+            **extra,
+        )
+
+    def test_per_user(self, api_client, question, rates):
+        """Тест лимита на user_id с заголовком Retry-After"""
+        rates(answers_user='2/min', answers_ip='100/min')
+
+        codes = [self.post_answer(api_client, question, 'user_1').status_code for _ in range(2)]
+        throttled = self.post_answer(api_client, question, 'user_1')
+        other_user = self.post_answer(api_client, question, 'user_2')
+
+        assert codes == [status.HTTP_201_CREATED] * 2
+        assert throttled.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert throttled['Retry-After'] == '30'
+        assert other_user.status_code == status.HTTP_201_CREATED
+
+    def test_per_ip(self, api_client, question, rates):
+        """Тест лимита на IP клиента для разных user_id"""
+        rates(answers_ip='2/min', answers_user='100/min')
+
+        self.post_answer(api_client, question, 'user_1')
+        self.post_answer(api_client, question, 'user_2')
+        throttled = self.post_answer(api_client, question, 'user_3')
+        other_ip = self.post_answer(api_client, question, 'user_4', REMOTE_ADDR='10.0.0.2')
+
+        assert throttled.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert other_ip.status_code == status.HTTP_201_CREATED
+
+    def test_question_create(self, api_client, rates):
+        """Тест лимита создания вопросов"""
+        rates(questions_ip='1/h')
+        url = reverse('api:questions:question-list-create')
+
+        api_client.post(url, {'text': 'Первый?'}, format='json')
+        throttled = api_client.post(url, {'text': 'Второй?'}, format='json')
+
+        assert throttled.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert throttled['Retry-After'] == '3600'
+
+    def test_reads_not_throttled(self, api_client, rates):
+        """Тест: чтение не тратит жетоны"""
+        rates(questions_ip='1/h')
+        url = reverse('api:questions:question-list-create')
+
+        assert all(api_client.get(url).status_code == status.HTTP_200_OK for _ in range(3))
+        assert api_client.post(url, {'text': 'Вопрос?'}, format='json').status_code == 201
+
+    def test_disabled(self, api_client, question, rates):
+        """Тест отключенного ограничения"""
+        rates()
+
+        codes = {self.post_answer(api_client, question, 'user_1').status_code for _ in range(5)}
+
+        assert codes == {status.HTTP_201_CREATED}
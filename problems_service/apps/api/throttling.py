@@ -0,0 +1,178 @@
+"""
+Ограничение частоты записи (token bucket).
+
+У каждого клиента (IP или user_id) есть ведро на N жетонов, которое
+пополняется со скоростью N за период ("30/min": 30 жетонов, один
+в 2 секунды). Запрос тратит жетон; если ведро пусто, ответ 429 содержит
+Retry-After - время до появления жетона. В отличие от окна DRF
+(SimpleRateThrottle) пауза не растягивается до конца окна, а всплеск
+ограничен емкостью ведра.
+
+Состояние ведер хранится в кэше THROTTLE_CACHE_ALIAS (кэш ответов API,
+Redis при заданном API_CACHE_URL). С Redis проверка
+и списание - один Lua-скрипт со временем сервера Redis, поэтому лимиты
+общие для всех воркеров и не зависят от расхождения их часов. Кэш
+в памяти процесса защищается блокировкой и годится для разработки:
+у каждого процесса свои ведра.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, cast
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.core.cache.backends.redis import RedisCache
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+from rest_framework.views import APIView
+
+# KEYS[1] - ведро; ARGV - емкость, жетонов в секунду, время жизни ключа.
+# Дробные числа возвращаются строками: Lua-числа в ответе Redis усекаются
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return {allowed, tostring(wait)}
+"""
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+_local_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Bucket:
+    capacity: int
+    # Жетонов в секунду
+    rate: float
+
+    @property
+    def ttl(self) -> int:
+        """Через это время ведро снова полное, и ключ можно забыть"""
+        return math.ceil(self.capacity / self.rate) + 1
+
+
+def parse_rate(rate: str) -> Bucket:
+    """"30/min" -> ведро на 30 жетонов, пополняемое 30 жетонами в минуту"""
+    num, period = rate.split("/")
+    capacity = int(num)
+    return Bucket(capacity, capacity / PERIODS[period[0]])
+
+
+def take_token(cache: BaseCache, key: str, bucket: Bucket) -> float:
+    """Списать жетон; 0 - запрос разрешен, иначе секунды до нового жетона"""
+    if isinstance(cache, RedisCache):
+        cache_key = cache.make_and_validate_key(key)
+        client = cache._cache.get_client(cache_key, write=True)
+        allowed, wait = client.eval(
+            TOKEN_BUCKET_SCRIPT, 1, cache_key, bucket.capacity, bucket.rate, bucket.ttl
+        )
+        return 0.0 if int(allowed) else float(wait)
+
+    with _local_lock:
+        now = time.monotonic()
+        state: tuple[float, float] = cache.get(key, (float(bucket.capacity), now))
+        tokens, ts = state
+        tokens = min(bucket.capacity, tokens + max(0.0, now - ts) * bucket.rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / bucket.rate
+        cache.set(key, (tokens, now), timeout=bucket.ttl)
+    return wait
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Базовый класс: scope - ключ DEFAULT_THROTTLE_RATES, get_ident -
+    идентификатор клиента (None - не ограничивать). Ограничиваются только
+    запросы, меняющие данные.
+    """
+
+    scope: str
+    cache_prefix = "throttle"
+
+    def __init__(self) -> None:
+        self.wait_seconds: float | None = None
+
+    def get_bucket(self) -> Bucket | None:
+        rate = cast("str | None", api_settings.DEFAULT_THROTTLE_RATES.get(self.scope))
+        return parse_rate(rate) if rate else None
+
+    def get_client_ident(self, request: Request, view: APIView) -> str | None:
+        raise NotImplementedError
+
+    def allow_request(self, request: Request, view: APIView) -> bool:
+        if request.method in ("GET", "HEAD", "OPTIONS"):
+            return True
+        bucket = self.get_bucket()
+        ident = self.get_client_ident(request, view)
+        if bucket is None or ident is None:
+            return True
+
+        key = f"{self.cache_prefix}:{self.scope}:{ident}"
+        wait = take_token(caches[settings.THROTTLE_CACHE_ALIAS], key, bucket)
+        if wait:
+            self.wait_seconds = wait
+            return False
+        return True
+
+    def wait(self) -> float | None:
+        return self.wait_seconds
+
+
+class ClientIPThrottle(TokenBucketThrottle):
+    """
+    По IP клиента: REMOTE_ADDR или X-Forwarded-For с учетом
+    NUM_PROXIES (за nginx - 1)
+    """
+
+    def get_client_ident(self, request: Request, view: APIView) -> str | None:
+        return self.get_ident(request)
+
+
+class QuestionCreateIPThrottle(ClientIPThrottle):
+    scope = "questions_ip"
+
+
+class AnswerCreateIPThrottle(ClientIPThrottle):
+    scope = "answers_ip"
+
+
+class AnswerBulkIPThrottle(ClientIPThrottle):
+    scope = "answers_bulk_ip"
+
+
+class AnswerCreateUserThrottle(TokenBucketThrottle):
+    """По user_id из тела запроса (пользователи не аутентифицируются)"""
+
+    scope = "answers_user"
+
+    def get_client_ident(self, request: Request, view: APIView) -> str | None:
+        data: Any = request.data
+        user_id = data.get("user_id") if hasattr(data, "get") else None
+        if not isinstance(user_id, str) or not user_id:
+            return None
+        # Ключ кэша не должен зависеть от произвольной длины и символов
+        return hashlib.md5(user_id.encode(), usedforsecurity=False).hexdigest()
@@ -6,4 +6,8 @@ api_prefix = "apps.api.urls"
 urlpatterns = [
     path("", include(f"{api_prefix}.answers")),
     path("", include(f"{api_prefix}.questions")),
+    path("", include(f"{api_prefix}.export")),
+    path("", include(f"{api_prefix}.search")),
+    path("", include(f"{api_prefix}.jobs")),
+    path("", include(f"{api_prefix}.internal")),
 ]
@@ -5,6 +5,9 @@ from apps.api.views import answers as a_views
 app_name = "answers"
 
 urlpatterns = [
-    path('questions/<int:question_id>/answers/', a_views.AnswerCreateView.as_view(), name='answer-create'),
+    path('questions/<int:question_id>/answers/', a_views.AnswerListCreateView.as_view(), name='answer-create'),
+    path('questions/<int:question_id>/answers/bulk/', a_views.AnswerBulkCreateView.as_view(), name='question-answer-bulk-create'),
+    path('answers/bulk/', a_views.AnswerBulkCreateView.as_view(), name='answer-bulk-create'),
     path('answers/<int:pk>/', a_views.AnswerDetailView.as_view(), name='answer-detail'),
+    path('users/<str:user_id>/answers/', a_views.UserAnswerListView.as_view(), name='user-answer-list'),
 ]
\ No newline at end of file
@@ -0,0 +1,9 @@
+from django.urls import path
+from apps.api.views import export as e_views
+
+
+app_name = "export"
+
+urlpatterns = [
+    path('export/<str:table>/', e_views.ExportView.as_view(), name='export'),
+]
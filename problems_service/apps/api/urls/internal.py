@@ -0,0 +1,10 @@
+from django.urls import path
+from apps.api.views import internal as i_views
+
+
+app_name = "internal"
+
+urlpatterns = [
+    path('internal/db-pool/', i_views.DatabasePoolStatsView.as_view(), name='db-pool'),
+    path('internal/metrics/', i_views.MetricsView.as_view(), name='metrics'),
+]
@@ -0,0 +1,9 @@
+from django.urls import path
+from apps.api.views import jobs as j_views
+
+
+app_name = "jobs"
+
+urlpatterns = [
+    path('jobs/<int:pk>/', j_views.JobDetailView.as_view(), name='job-detail'),
+]
@@ -6,5 +6,6 @@ app_name = "questions"
 
 urlpatterns = [
     path('questions/', q_views.QuestionListCreateView.as_view(), name='question-list-create'),
+    path('questions/hot/', q_views.HotQuestionListView.as_view(), name='question-hot'),
     path('questions/<int:pk>/', q_views.QuestionDetailView.as_view(), name='question-detail'),
 ]
\ No newline at end of file
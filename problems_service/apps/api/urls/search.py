@@ -0,0 +1,9 @@
+from django.urls import path
+from apps.api.views import search as s_views
+
+
+app_name = "search"
+
+urlpatterns = [
+    path('search/', s_views.SearchView.as_view(), name='search'),
+]
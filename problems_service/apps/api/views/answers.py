@@ -1,45 +1,128 @@
-from typing import Any
+import contextlib
+from asgiref.sync import sync_to_async
+from typing import Any, Type
+from django.db.models import Count, Max, QuerySet
 from rest_framework import generics, status
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
 from rest_framework.response import Response
 from rest_framework.request import Request
-from django.shortcuts import get_object_or_404
-from django.db import transaction
-from drf_spectacular.utils import extend_schema, extend_schema_view
+from django.http.response import HttpResponseBase
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
 import logging
 
 from apps.questions.models import Question
 from apps.answers.models import Answer
+from apps.answers.bulk import DEFAULT_CHUNK_SIZE, ingest_items, summarize
+from apps.api.generics import AsyncGenericAPIView
+from apps.api.views.jobs import job_accepted_response
+from apps.jobs.queue import enqueue
+from apps.api.pagination import (
+    LatestFirstKeysetPagination,
+    QuestionGroupPagination,
+    UserAnswersPagination,
+)
+from apps.api.parsers import NDJSONParser, ORJSONParser
 from apps.api.serializers import answer_serializer as a_ser
+from apps.api.serializers.job_serializer import JobSerializer
+from apps.api.serializers.row_serializer import (
+    ANSWER_FIELDS,
+    Row,
+    answer_to_representation,
+    get_timezone,
+    user_question_answers_to_representation,
+)
+from apps.api.throttling import (
+    AnswerBulkIPThrottle,
+    AnswerCreateIPThrottle,
+    AnswerCreateUserThrottle,
+)
 
 logger = logging.getLogger(__name__)
 
 @extend_schema_view(
+    get=extend_schema(
+        summary='Получить ответы на вопрос',
+        description=(
+            'Возвращает ответы на вопрос постранично (keyset-пагинация), '
+            'по умолчанию новые первыми'
+        ),
+        tags=['Answers'],
+        parameters=[
+            OpenApiParameter('cursor', str, description='Курсор страницы'),
+            OpenApiParameter(
+                'ordering',
+                str,
+                enum=['id', '-id', 'created_at', '-created_at'],
+                description='Порядок сортировки',
+            ),
+        ],
+    ),
     post=extend_schema(
         summary='Добавить ответ к вопросу',
         description='Создает новый ответ для указанного вопроса',
         tags=['Answers'],
-    )
+    ),
 )
-class AnswerCreateView(generics.CreateAPIView[Answer]):
-    queryset = Answer.objects.all()
-    serializer_class = a_ser.AnswerCreateSerialier
+class AnswerListCreateView(
+    AsyncGenericAPIView[Answer], generics.ListCreateAPIView[Answer]
+):
+    pagination_class = LatestFirstKeysetPagination
+    throttle_classes = [AnswerCreateIPThrottle, AnswerCreateUserThrottle]
+    query_budget = {'GET': 2, 'POST': 2}
+
+    def get_serializer_class(
+        self,
+    ) -> Type[a_ser.AnswerCreateSerialier | a_ser.AnswerSerializer]:
+        if self.request.method == 'POST':
+            return a_ser.AnswerCreateSerialier
+        return a_ser.AnswerSerializer
+
+    def get_queryset(self) -> QuerySet[Answer, Any]:
+        # Быстрый путь чтения: строки вместо моделей, см. aserialize
+        rows: QuerySet[Answer, Row] = Answer.objects.filter(
+            question_id=self.kwargs['question_id']
+        ).values(*ANSWER_FIELDS)
+        return rows
+
+    async def aserialize(self, rows: list[Row]) -> list[Row]:
+        tz = get_timezone()
+        return [answer_to_representation(row, tz) for row in rows]
+
+    async def get(  # type: ignore[override]
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> Response:
+        """GET /questions/{id}/answers/ - ответы на вопрос постранично"""
+        question_id = kwargs['question_id']
+        if not await Question.objects.filter(id=question_id).aexists():
+            raise NotFound('Вопрос не найден')
+
+        response = await self.alist()
+        logger.info("Retrieved answers page for question %s", question_id)
+        return response
+
+    async def post(  # type: ignore[override]
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> Response:
+        question_id = kwargs['question_id']
 
-    def create(self, request: Request, *args: Any, **kwargs: Any) -> Response:
-        question_id = kwargs.get('question_id')
-        
-        question = get_object_or_404(Question, id=question_id)
-        
         serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        
-        with transaction.atomic():
-            answer = Answer.objects.create(
-                question=question,
-                user_id=serializer.validated_data['user_id'],
-                text=serializer.validated_data['text']
-            )
-        
-        logger.info(f"Answer {answer.id} created for question {question_id}")
+        try:
+            serializer.is_valid(raise_exception=True)
+        except ValidationError:
+            # Как и раньше, 404 важнее ошибок тела запроса
+            if not await Question.objects.filter(id=question_id).aexists():
+                raise NotFound('Вопрос не найден')
+            raise
+
+        # Один INSERT ... SELECT вместо чтения вопроса и вставки
+        answer = await sync_to_async(Answer.objects.create_for_question)(
+            question_id,
+            user_id=serializer.validated_data['user_id'],
+            text=serializer.validated_data['text'],
+        )
+        if answer is None:
+            raise NotFound('Вопрос не найден')
         return Response(
             a_ser.AnswerSerializer(answer).data,
             status=status.HTTP_201_CREATED
@@ -57,18 +140,243 @@ class AnswerCreateView(generics.CreateAPIView[Answer]):
         tags=['Answers'],
     )
 )
-class AnswerDetailView(generics.RetrieveDestroyAPIView[Answer]):
-    queryset = Answer.objects.select_related('question')
+class AnswerDetailView(
+    AsyncGenericAPIView[Answer], generics.RetrieveDestroyAPIView[Answer]
+):
+    queryset = Answer.objects.visible()
     serializer_class = a_ser.AnswerSerializer
+    query_budget = {'GET': 1, 'DELETE': 3}
+
+    async def get(  # type: ignore[override]
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> Response:
+        row = await self.aget_row(*ANSWER_FIELDS)
+        logger.info("Retrieved answer %s", row["id"])
+        return Response(answer_to_representation(row, get_timezone()))
+
+    async def delete(  # type: ignore[override]
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> Response:
+        answer = await self.aget_object()
+        # Удаление логирует Answer.delete
+        await answer.adelete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary='Получить ответы пользователя',
+        description=(
+            'Возвращает ответы пользователя постранично (keyset-пагинация), '
+            'новые первыми. С group_by=question возвращает вопросы, на которые '
+            'отвечал пользователь, с количеством и временем последнего ответа '
+            '(UserQuestionAnswers) в порядке question_id.'
+        ),
+        tags=['Answers'],
+        parameters=[
+            OpenApiParameter('cursor', str, description='Курсор страницы'),
+            OpenApiParameter(
+                'ordering',
+                str,
+                enum=['created_at', '-created_at'],
+                description='Порядок сортировки ответов',
+            ),
+            OpenApiParameter(
+                'group_by',
+                str,
+                enum=['question'],
+                description='Сгруппировать ответы по вопросам',
+            ),
+            OpenApiParameter(
+                'count',
+                str,
+                enum=['approximate', 'exact'],
+                description='Добавить в ответ общее количество',
+            ),
+        ],
+    ),
+)
+class UserAnswerListView(
+    AsyncGenericAPIView[Answer], generics.ListAPIView[Answer]
+):
+    serializer_class = a_ser.AnswerSerializer
+    group_by_query_param = 'group_by'
+    query_budget = 2
+
+    def get_group_by(self) -> str | None:
+        group_by = self.request.query_params.get(self.group_by_query_param)
+        if group_by not in (None, 'question'):
+            raise ValidationError({self.group_by_query_param: 'Допустимое значение: question'})
+        return group_by
 
-    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
-        answer = self.get_object()
-        logger.info(f"Retrieved answer {answer.id}")
-        return super().retrieve(request, *args, **kwargs)
-
-    def destroy(self, request: Request, *args: Any, **kwargs: Any) -> Response:
-        answer = self.get_object()
-        answer_id = answer.id
-        self.perform_destroy(answer)
-        logger.info(f"Answer {answer_id} deleted successfully")
-        return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+    @property
+    def paginator(self) -> BasePagination | None:
+        if not hasattr(self, '_paginator'):
+            if self.get_group_by() == 'question':
+                self._paginator: BasePagination | None = QuestionGroupPagination()
+            else:
+                self._paginator = UserAnswersPagination()
+        return self._paginator
+
+    def get_serializer_class(
+        self,
+    ) -> Type[a_ser.AnswerSerializer | a_ser.UserQuestionAnswersSerializer]:
+        if self.get_group_by() == 'question':
+            return a_ser.UserQuestionAnswersSerializer
+        return a_ser.AnswerSerializer
+
+    def get_queryset(self) -> QuerySet[Answer, Any]:
+        # Все запросы ограничены диапазоном индекса (user_id, created_at, id)
+        queryset = Answer.objects.visible().filter(user_id=self.kwargs['user_id'])
+        if self.get_group_by() == 'question':
+            return queryset.values('question_id').annotate(
+                answers_count=Count('id'), last_answer_at=Max('created_at')
+            )
+        rows: QuerySet[Answer, Row] = queryset.values(*ANSWER_FIELDS)
+        return rows
+
+    async def aserialize(self, rows: list[Row]) -> list[Row]:
+        tz = get_timezone()
+        if self.get_group_by() == 'question':
+            return [user_question_answers_to_representation(row, tz) for row in rows]
+        return [answer_to_representation(row, tz) for row in rows]
+
+    async def get(  # type: ignore[override]
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> Response:
+        """GET /users/{user_id}/answers/ - ответы пользователя постранично"""
+        response = await self.alist()
+        logger.info("Retrieved answers page for user %s", kwargs['user_id'])
+        return response
+
+
+bulk_parameters = [
+    OpenApiParameter(
+        'chunk_size',
+        int,
+        description=(
+            f'Размер чанка, коммитящегося отдельно (по умолчанию {DEFAULT_CHUNK_SIZE})'
+        ),
+    ),
+    OpenApiParameter(
+        'method',
+        str,
+        enum=['insert', 'copy'],
+        description='insert - bulk_create, copy - COPY FROM STDIN с id, зарезервированными заранее; id возвращаются в обоих случаях',
+    ),
+    OpenApiParameter(
+        'async',
+        bool,
+        description=(
+            'Проверить элементы и поставить вставку в очередь фоновых задач: '
+            'ответ 202 со ссылкой на статус задачи, итог загрузки - в ее result'
+        ),
+    ),
+]
+
+
+@extend_schema_view(
+    post=extend_schema(
+        summary='Массово добавить ответы',
+        description=(
+            'Принимает JSON-массив или NDJSON (application/x-ndjson). '
+            'Без вопроса в URL каждый элемент должен содержать question_id. '
+            'Невалидные элементы пропускаются и возвращаются в errors с индексом.'
+        ),
+        tags=['Answers'],
+        parameters=bulk_parameters,
+        request=a_ser.AnswerBulkItemSerializer(many=True),
+        responses={
+            201: a_ser.AnswerBulkResultSerializer,
+            207: a_ser.AnswerBulkResultSerializer,
+            202: JobSerializer,
+            400: a_ser.AnswerBulkResultSerializer,
+        },
+    ),
+)
+class AnswerBulkCreateView(generics.GenericAPIView[Answer]):
+    queryset = Answer.objects.all()
+    serializer_class = a_ser.AnswerBulkItemSerializer
+    parser_classes = [ORJSONParser, NDJSONParser]
+    throttle_classes = [AnswerBulkIPThrottle]
+    # Вставка и пересчет рейтинга - по запросу на чанк
+    query_budget = None
+    allow_repeated_queries = True
+    max_items = 10000
+    max_chunk_size = 10000
+
+    def get_chunk_size(self) -> int:
+        with contextlib.suppress(KeyError, ValueError):
+            chunk_size = int(self.request.query_params['chunk_size'])
+            if chunk_size > 0:
+                return min(chunk_size, self.max_chunk_size)
+        return DEFAULT_CHUNK_SIZE
+
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """POST /questions/{id}/answers/bulk/ и /answers/bulk/ - массовая загрузка"""
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError('Ожидается массив ответов')
+        if len(items) > self.max_items:
+            raise ValidationError(f'Не больше {self.max_items} ответов за запрос')
+
+        question_id = kwargs.get('question_id')
+        if question_id is not None:
+            if not Question.objects.filter(id=question_id).exists():
+                raise NotFound('Вопрос не найден')
+            serializer: a_ser.AnswerCreateSerialier = a_ser.AnswerCreateSerialier()
+        else:
+            serializer = a_ser.AnswerBulkItemSerializer()
+
+        # Один экземпляр сериализатора на все элементы, без запросов к БД
+        errors: list[dict[str, Any]] = []
+        valid: list[tuple[int, dict[str, Any]]] = []
+        for index, item in enumerate(items):
+            try:
+                valid.append((index, serializer.run_validation(item)))
+            except ValidationError as exc:
+                errors.append({'index': index, 'errors': exc.detail})
+
+        if question_id is None:
+            # Существование всех вопросов проверяется одним запросом
+            existing = set(
+                Question.objects.filter(
+                    id__in={data['question_id'] for _, data in valid}
+                ).values_list('id', flat=True)
+            )
+            errors += [
+                {'index': index, 'errors': {'question_id': ['Вопрос не найден']}}
+                for index, data in valid
+                if data['question_id'] not in existing
+            ]
+            valid = [(index, data) for index, data in valid if data['question_id'] in existing]
+
+        chunk_size = self.get_chunk_size()
+        use_copy = request.query_params.get('method') == 'copy'
+        if request.query_params.get('async') == 'true':
+            job = enqueue(
+                'answers.bulk_ingest',
+                {
+                    'items': valid,
+                    'question_id': question_id,
+                    'chunk_size': chunk_size,
+                    'use_copy': use_copy,
+                    'errors': errors,
+                },
+            )
+            return job_accepted_response(request, job)
+
+        result, chunk_errors = ingest_items(valid, question_id, chunk_size, use_copy)
+        data = summarize(result, errors + chunk_errors)
+
+        logger.info(
+            "Bulk answers request: %s created, %s failed", data['created'], data['failed']
+        )
+        response_status: int
+        if not data['failed']:
+            response_status = status.HTTP_201_CREATED
+        elif data['created']:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(data, status=response_status)
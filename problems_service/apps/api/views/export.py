@@ -0,0 +1,85 @@
+from typing import Any
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework import permissions, views
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.request import Request
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+import logging
+
+from apps.api.export import (
+    EXPORT_FORMATS,
+    EXPORT_TABLES,
+    aiterate,
+    export_table,
+    parse_since,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ExportView(views.APIView):
+    permission_classes = [permissions.IsAdminUser]
+    # Сессия и пользователь; строки читаются серверным курсором уже при отдаче тела
+    query_budget = 3
+
+    @extend_schema(
+        summary='Выгрузить таблицу',
+        description=(
+            'Потоково выгружает все вопросы или ответы в NDJSON или CSV '
+            'в порядке id. Параметр since оставляет только записи, '
+            'созданные начиная с указанного момента. Доступно только '
+            'администраторам.'
+        ),
+        tags=['Export'],
+        parameters=[
+            OpenApiParameter(
+                'table', str, OpenApiParameter.PATH, enum=list(EXPORT_TABLES)
+            ),
+            OpenApiParameter(
+                'output',
+                str,
+                enum=list(EXPORT_FORMATS),
+                description='Формат выгрузки (по умолчанию ndjson)',
+            ),
+            OpenApiParameter(
+                'since',
+                OpenApiTypes.DATETIME,
+                description='Только записи с created_at >= since',
+            ),
+        ],
+        responses={
+            (200, media_type): OpenApiTypes.STR
+            for media_type in EXPORT_FORMATS.values()
+        },
+    )
+    def get(
+        self, request: Request, table: str, *args: Any, **kwargs: Any
+    ) -> StreamingHttpResponse:
+        """GET /export/{table}/ - потоковая выгрузка таблицы"""
+        if table not in EXPORT_TABLES:
+            raise NotFound('Неизвестная таблица')
+        output_format = request.query_params.get('output', 'ndjson')
+        if output_format not in EXPORT_FORMATS:
+            raise ValidationError(
+                {'output': f'Допустимые форматы: {", ".join(EXPORT_FORMATS)}'}
+            )
+        try:
+            since = parse_since(request.query_params.get('since'))
+        except ValueError:
+            raise ValidationError(
+                {'since': 'Ожидается дата и время в формате ISO 8601'}
+            )
+
+        content = export_table(table, output_format, since)
+        response = StreamingHttpResponse(
+            # Под ASGI тело отдается асинхронно, иначе оно читается целиком
+            aiterate(content) if isinstance(request._request, ASGIRequest) else content,
+            content_type=EXPORT_FORMATS[output_format],
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{table}.{output_format}"'
+        )
+        logger.info("Started export of %s as %s", table, output_format)
+        return response
@@ -0,0 +1,87 @@
+import hmac
+import os
+from typing import Any
+from django.conf import settings
+from django.db import connection
+from rest_framework import permissions, views
+from rest_framework.request import Request
+from rest_framework.response import Response
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiResponse, extend_schema
+import logging
+
+from apps.api.metrics import METRICS
+from apps.api.renderers import PrometheusRenderer
+from apps.api.serializers.internal_serializer import DatabasePoolStatsSerializer
+
+logger = logging.getLogger(__name__)
+
+
+class DatabasePoolStatsView(views.APIView):
+    permission_classes = [permissions.IsAdminUser]
+    # Сессия и пользователь
+    query_budget = 2
+
+    @extend_schema(
+        summary='Статистика пула соединений с БД',
+        description=(
+            'Счетчики пула соединений psycopg текущего процесса воркера. '
+            'Каждый воркер gunicorn держит собственный пул. Доступно только '
+            'администраторам.'
+        ),
+        tags=['Internal'],
+        responses={200: DatabasePoolStatsSerializer},
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """GET /internal/db-pool/ - статистика пула соединений"""
+        # Пул есть только у бэкенда postgresql с OPTIONS['pool']
+        pool = getattr(connection, 'pool', None)
+        stats = pool.get_stats() if pool is not None else {}
+        logger.info("Database pool stats: %s", stats)
+        return Response(
+            DatabasePoolStatsSerializer(
+                {
+                    'pid': os.getpid(),
+                    'pool': pool is not None,
+                    'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+                    'stats': stats,
+                }
+            ).data
+        )
+
+
+class HasMetricsToken(permissions.BasePermission):
+    """Authorization: Bearer METRICS_TOKEN (для сборщика метрик)"""
+
+    def has_permission(self, request: Request, view: views.APIView) -> bool:
+        token = settings.METRICS_TOKEN
+        if not token:
+            return False
+        scheme, _, credentials = request.headers.get('Authorization', '').partition(' ')
+        return scheme.lower() == 'bearer' and hmac.compare_digest(
+            credentials.encode(), token.encode()
+        )
+
+
+class MetricsView(views.APIView):
+    permission_classes = [HasMetricsToken | permissions.IsAdminUser]
+    renderer_classes = [PrometheusRenderer]
+    query_budget = 2
+
+    @extend_schema(
+        summary='Метрики запросов',
+        description=(
+            'Гистограммы времени запроса, числа и времени SQL-запросов, '
+            'времени сериализации и размера ответа по маршрутам в текстовом '
+            'формате Prometheus. Ряды суммируются по всем воркерам gunicorn '
+            '(через METRICS_DIR) и отстают не больше чем на '
+            'METRICS_FLUSH_INTERVAL. Доступно администраторам и по METRICS_TOKEN.'
+        ),
+        tags=['Internal'],
+        responses={200: OpenApiResponse(OpenApiTypes.STR)},
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """GET /internal/metrics/ - метрики всех процессов METRICS_DIR"""
+        return Response(
+            METRICS.expose(), content_type='text/plain; version=0.0.4; charset=utf-8'
+        )
@@ -0,0 +1,47 @@
+from typing import Any
+
+from django.urls import reverse
+from rest_framework import generics, status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from drf_spectacular.utils import extend_schema, extend_schema_view
+import logging
+
+from apps.api.serializers.job_serializer import JobSerializer
+from apps.jobs.models import Job
+
+logger = logging.getLogger(__name__)
+
+
+def job_accepted_response(request: Request, job: Job) -> Response:
+    """202 для работы, поставленной в очередь: статус задачи по ссылке Location"""
+    location = request.build_absolute_uri(
+        reverse('api:jobs:job-detail', kwargs={'pk': job.pk})
+    )
+    return Response(
+        JobSerializer(job).data,
+        status=status.HTTP_202_ACCEPTED,
+        headers={'Location': location},
+    )
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary='Статус фоновой задачи',
+        description=(
+            'Состояние задачи очереди: queued, running, succeeded или failed, '
+            'число попыток, прогресс и результат'
+        ),
+        tags=['Jobs'],
+    ),
+)
+class JobDetailView(generics.RetrieveAPIView[Job]):
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+    query_budget = 1
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """GET /jobs/{id}/ - статус фоновой задачи"""
+        response = super().retrieve(request, *args, **kwargs)
+        logger.info("Retrieved job %s", kwargs['pk'])
+        return response
@@ -1,23 +1,131 @@
-from django.db.models import QuerySet
+import contextlib
+
+from asgiref.sync import sync_to_async
+from django.db.models import F, QuerySet, Window
+from django.db.models.functions import RowNumber
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.request import Request
-from django.db import transaction
-from drf_spectacular.utils import extend_schema, extend_schema_view
+from django.http.response import HttpResponseBase
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
 import logging
 from typing import Any, Type
 
-from apps.questions.models import Question
+from apps.questions.cache import QUESTIONS_VERSION_KEY, question_version_key
+from apps.questions.models import Question, QuestionRank
+from apps.answers.models import Answer
+from apps.api.cache import CachedResponseMixin
+from apps.api.generics import AsyncGenericAPIView
+from apps.api.pagination import HotQuestionsPagination, KeysetPaginationMixin
 from apps.api.serializers import question_serializer as q_ser
+from apps.api.serializers.row_serializer import (
+    ANSWER_FIELDS,
+    HOT_QUESTION_FIELDS,
+    QUESTION_FIELDS,
+    Row,
+    answer_to_representation,
+    get_timezone,
+    hot_question_to_representation,
+    question_to_representation,
+)
+from apps.api.throttling import QuestionCreateIPThrottle
 
 logger = logging.getLogger(__name__)
 
+ANSWERS_LIMIT_QUERY_PARAM = "answers_limit"
+MAX_ANSWERS_LIMIT = 100
+
+answers_limit_parameter = OpenApiParameter(
+    ANSWERS_LIMIT_QUERY_PARAM,
+    int,
+    description=(
+        "Встраивать только N последних ответов каждого вопроса; "
+        "остальные доступны через /api/questions/{id}/answers/"
+    ),
+)
+
+
+def get_answers_limit(request: Request) -> int | None:
+    value = request.query_params.get(ANSWERS_LIMIT_QUERY_PARAM)
+    if value is None:
+        return None
+    with contextlib.suppress(ValueError):
+        limit = int(value)
+        if limit >= 0:
+            return min(limit, MAX_ANSWERS_LIMIT)
+    return None
+
+
+def get_answers_queryset(request: Request) -> QuerySet[Answer]:
+    """Встраиваемые ответы: все или только N последних (?answers_limit=N)"""
+    limit = get_answers_limit(request)
+    if limit is None:
+        return Answer.objects.all()
+    # Последние ответы всех вопросов страницы одним запросом:
+    # ROW_NUMBER() OVER (PARTITION BY question_id ORDER BY created_at DESC)
+    return (
+        Answer.objects.annotate(
+            position=Window(
+                RowNumber(),
+                partition_by=F("question_id"),
+                order_by=(F("created_at").desc(), F("id").desc()),
+            )
+        )
+        .filter(position__lte=limit)
+        .order_by("-created_at", "-id")
+    )
+
+
+async def aget_answer_rows(
+    request: Request, question_ids: list[int]
+) -> dict[int, list[Row]]:
+    """Встраиваемые ответы вопросов одним запросом, как prefetch_related"""
+    answers: dict[int, list[Row]] = {question_id: [] for question_id in question_ids}
+    if not question_ids:
+        return answers
+    queryset = get_answers_queryset(request).filter(question_id__in=question_ids)
+    tz = get_timezone()
+    async for row in queryset.values(*ANSWER_FIELDS):
+        answers[row["question_id"]].append(answer_to_representation(row, tz))
+    return answers
+
 
 @extend_schema_view(
     get=extend_schema(
         summary="Получить список всех вопросов",
-        description="Возвращает список всех вопросов с количеством ответов",
+        description=(
+            "Возвращает список всех вопросов с количеством ответов. "
+            "С параметром pagination=cursor используется keyset-пагинация "
+            "без подсчета общего количества."
+        ),
         tags=["Questions"],
+        parameters=[
+            OpenApiParameter(
+                "pagination",
+                str,
+                enum=["page", "cursor"],
+                description="Режим пагинации (по умолчанию page)",
+            ),
+            OpenApiParameter(
+                "cursor", str, description="Курсор страницы (pagination=cursor)"
+            ),
+            OpenApiParameter(
+                "ordering",
+                str,
+                enum=["id", "-id", "created_at", "-created_at"],
+                description="Порядок сортировки (pagination=cursor)",
+            ),
+            answers_limit_parameter,
+            OpenApiParameter(
+                "count",
+                str,
+                enum=["approximate", "exact"],
+                description=(
+                    "Вернуть количество вопросов: оценку планировщика "
+                    "или точное значение (pagination=cursor)"
+                ),
+            ),
+        ],
     ),
     post=extend_schema(
         summary="Создать новый вопрос",
@@ -25,7 +133,15 @@ logger = logging.getLogger(__name__)
         tags=["Questions"],
     ),
 )
-class QuestionListCreateView(generics.ListCreateAPIView[Question]):
+class QuestionListCreateView(
+    CachedResponseMixin,
+    KeysetPaginationMixin,
+    AsyncGenericAPIView[Question],
+    generics.ListCreateAPIView[Question],
+):
+    throttle_classes = [QuestionCreateIPThrottle]
+    query_budget = {"GET": 3, "POST": 1}
+
     def get_serializer_class(
         self,
     ) -> Type[q_ser.QuestionCreateSerializer | q_ser.QuestionDetailSerializer]:
@@ -33,28 +149,52 @@ class QuestionListCreateView(generics.ListCreateAPIView[Question]):
             return q_ser.QuestionCreateSerializer
         return q_ser.QuestionDetailSerializer
 
-    def get_queryset(self) -> QuerySet[Question]:
-        return Question.objects.prefetch_related("answers").all()
+    def get_cache_version_keys(self) -> list[str]:
+        return [QUESTIONS_VERSION_KEY]
 
-    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+    def get_queryset(self) -> QuerySet[Question, Any]:
+        # Быстрый путь чтения: строки вместо моделей, см. aserialize
+        rows: QuerySet[Question, Row] = Question.objects.with_answers_count().values(
+            *QUESTION_FIELDS
+        )
+        return rows
+
+    async def aserialize(self, rows: list[Row]) -> list[Row]:
+        answers = await aget_answer_rows(self.request, [row["id"] for row in rows])
+        tz = get_timezone()
+        return [
+            question_to_representation(row, tz, answers[row["id"]]) for row in rows
+        ]
+
+    async def get(  # type: ignore[override]
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase:
         """GET /questions/ - список всех вопросов"""
-        response = super().list(request, *args, **kwargs)
+        cached = await self.aget_cached_response(request)
+        if cached is not None:
+            return cached
+        response = await self.alist()
         logger.info("Retrieved list of questions")
         return response
 
-    def create(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+    async def post(  # type: ignore[override]
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> Response:
         """POST /questions/ - создать новый вопрос"""
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        with transaction.atomic():
-            question = serializer.save()
-
-        logger.info(f"Question created successfully: {question.id}")
-        return Response(
-            q_ser.QuestionDetailSerializer(question).data,
-            status=status.HTTP_201_CREATED,
-        )
+        # Создание логирует Question.save
+        question = await Question.objects.acreate(**serializer.validated_data)
+        # У нового вопроса ответов нет: данные строятся без запросов к базе
+        row = {
+            "id": question.id,
+            "text": question.text,
+            "created_at": question.created_at,
+            "answers_count": 0,
+        }
+        data = question_to_representation(row, get_timezone(), answers=[])
+        return Response(data, status=status.HTTP_201_CREATED)
 
 
 @extend_schema_view(
@@ -62,27 +202,110 @@ class QuestionListCreateView(generics.ListCreateAPIView[Question]):
         summary="Получить вопрос и ответы",
         description="Возвращает вопрос со всеми ответами на него",
         tags=["Questions"],
+        parameters=[answers_limit_parameter],
     ),
     delete=extend_schema(
         summary="Удалить вопрос",
-        description="Удаляет вопрос и все связанные с ним ответы (каскадно)",
+        description=(
+            "Сразу скрывает вопрос и его ответы из всех эндпоинтов. "
+            "Ответы и сам вопрос удаляет фоновая задача questions.purge"
+        ),
         tags=["Questions"],
     ),
 )
-class QuestionDetailView(generics.RetrieveDestroyAPIView[Question]):
-    queryset = Question.objects.prefetch_related("answers")
+class QuestionDetailView(
+    CachedResponseMixin,
+    AsyncGenericAPIView[Question],
+    generics.RetrieveDestroyAPIView[Question],
+):
     serializer_class = q_ser.QuestionDetailSerializer
+    query_budget = {"GET": 2, "DELETE": 3}
+
+    def get_cache_version_keys(self) -> list[str]:
+        return [question_version_key(self.kwargs["pk"])]
+
+    def get_queryset(self) -> QuerySet[Question]:
+        if self.request.method == "DELETE":
+            # Удалению количество ответов не нужно
+            return Question.objects.all()
+        return Question.objects.with_answers_count()
 
-    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+    async def get(  # type: ignore[override]
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase:
         """GET /questions/{id} - получить вопрос и все ответы на него"""
-        question = self.get_object()
-        logger.info(f"Retrieved question {question.id} with answers")
-        return super().retrieve(request, *args, **kwargs)
+        cached = await self.aget_cached_response(request)
+        if cached is not None:
+            return cached
+        row = await self.aget_row(*QUESTION_FIELDS)
+        answers = await aget_answer_rows(request, [row["id"]])
+        logger.info("Retrieved question %s with answers", row["id"])
+        return Response(
+            question_to_representation(row, get_timezone(), answers[row["id"]])
+        )
 
-    def destroy(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+    async def delete(  # type: ignore[override]
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> Response:
         """DELETE /questions/{id} - удалить вопрос (вместе с ответами)"""
-        question = self.get_object()
-        question_id = question.id
-        self.perform_destroy(question)
-        logger.info(f"Question {question_id} deleted successfully with all its answers")
+        question = await self.aget_object()
+        # Удаление логирует Question.soft_delete
+        await sync_to_async(question.soft_delete)()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="Горячие вопросы",
+        description=(
+            "Вопросы по активности ответов: вклад ответа уменьшается вдвое "
+            "за HOT_QUESTIONS_HALF_LIFE часов. Рейтинг хранится в отдельной "
+            "таблице и обновляется при добавлении и удалении ответов, "
+            "страница читается по индексу. Вопросы без ответов не входят."
+        ),
+        tags=["Questions"],
+        parameters=[
+            OpenApiParameter("cursor", str, description="Курсор страницы"),
+            OpenApiParameter(
+                "ordering",
+                str,
+                enum=["-score", "score"],
+                description="Порядок: самые активные (по умолчанию) или наименее активные первыми",
+            ),
+        ],
+    ),
+)
+class HotQuestionListView(
+    CachedResponseMixin,
+    AsyncGenericAPIView[QuestionRank],
+    generics.ListAPIView[QuestionRank],
+):
+    serializer_class = q_ser.HotQuestionSerializer
+    pagination_class = HotQuestionsPagination
+    query_budget = 1
+
+    def get_cache_version_keys(self) -> list[str]:
+        # Порядок score не зависит от времени, поэтому ответ меняется
+        # только вместе с вопросами и ответами
+        return [QUESTIONS_VERSION_KEY]
+
+    def get_queryset(self) -> QuerySet[QuestionRank, Any]:
+        rows: QuerySet[QuestionRank, Row] = QuestionRank.objects.filter(
+            score__isnull=False, question__deleted_at__isnull=True
+        ).values(*HOT_QUESTION_FIELDS)
+        return rows
+
+    async def aserialize(self, rows: list[Row]) -> list[Row]:
+        tz = get_timezone()
+        return [hot_question_to_representation(row, tz) for row in rows]
+
+    async def get(  # type: ignore[override]
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase:
+        """GET /questions/hot/ - вопросы по активности ответов"""
+        cached = await self.aget_cached_response(request)
+        if cached is not None:
+            return cached
+        response = await self.alist()
+        logger.info("Retrieved hot questions")
+        return response
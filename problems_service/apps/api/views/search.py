@@ -0,0 +1,47 @@
+from typing import Any
+from rest_framework import views
+from rest_framework.request import Request
+from rest_framework.response import Response
+from drf_spectacular.utils import extend_schema
+import logging
+
+from apps.api.search import search
+from apps.api.serializers.search_serializer import (
+    SearchQuerySerializer,
+    SearchResultSerializer,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SearchView(views.APIView):
+    query_budget = 2
+
+    @extend_schema(
+        summary='Полнотекстовый поиск',
+        description=(
+            'Ищет вопросы и ответы по словам запроса с учетом морфологии '
+            'русского языка. Результаты каждого типа упорядочены по '
+            'релевантности (ts_rank) и содержат фрагмент текста с выделенными '
+            'совпадениями. Поддерживается синтаксис websearch: "точная фраза", '
+            'or, -исключение.'
+        ),
+        tags=['Search'],
+        parameters=[SearchQuerySerializer],
+        responses={200: SearchResultSerializer},
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """GET /search/ - поиск по вопросам и ответам"""
+        params = SearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        result = search(
+            params.validated_data['q'],
+            params.validated_data['type'],
+            params.validated_data['limit'],
+        )
+        logger.info(
+            "Search for %r returned %s",
+            params.validated_data['q'],
+            {name: len(hits) for name, hits in result.items()},
+        )
+        return Response(SearchResultSerializer(result).data)
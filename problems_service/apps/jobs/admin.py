@@ -0,0 +1,12 @@
+from django.contrib import admin
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'task', 'status', 'attempts', 'run_at', 'created_at', 'finished_at')
+    list_filter = ('status', 'task')
+    readonly_fields = (
+        'task', 'payload', 'attempts', 'locked_at', 'progress', 'result', 'error',
+        'created_at', 'finished_at',
+    )
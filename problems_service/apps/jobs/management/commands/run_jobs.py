@@ -0,0 +1,67 @@
+import signal
+import threading
+from types import FrameType
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection
+
+from apps.jobs.queue import requeue_stale, run_pending, work
+
+
+class Command(BaseCommand):
+    help = "Воркер фоновых задач из таблицы jobs"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.JOBS_CONCURRENCY,
+            help="Число потоков, каждый со своим соединением с базой",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.JOBS_POLL_INTERVAL,
+            help="Пауза при пустой очереди, секунды",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Выполнить готовые задачи и завершиться",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["burst"]:
+            requeue_stale()
+            processed = run_pending()
+            connection.close()
+            self.stderr.write(f"Processed {processed} jobs")
+            return
+
+        stop = threading.Event()
+
+        def shutdown(signum: int, frame: FrameType | None) -> None:
+            # Текущие задачи дорабатывают, новые не берутся
+            stop.set()
+
+        signal.signal(signal.SIGTERM, shutdown)
+        signal.signal(signal.SIGINT, shutdown)
+
+        threads = [
+            threading.Thread(
+                target=work,
+                args=(stop, options["poll_interval"]),
+                name=f"jobs-worker-{number}",
+            )
+            for number in range(options["concurrency"])
+        ]
+        for thread in threads:
+            thread.start()
+        self.stderr.write(f"Started {len(threads)} job workers")
+        # join с таймаутом, чтобы главный поток получал сигналы
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=1)
+        self.stderr.write("Job workers stopped")
@@ -0,0 +1,71 @@
+from typing import Any
+
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    Фоновая задача в очереди на таблице PostgreSQL. Воркер (run_jobs)
+    забирает задачу через SELECT ... FOR UPDATE SKIP LOCKED, поэтому
+    несколько воркеров не получают одну задачу и не ждут друг друга.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "В очереди"
+        RUNNING = "running", "Выполняется"
+        SUCCEEDED = "succeeded", "Выполнена"
+        FAILED = "failed", "Ошибка"
+
+    task = models.CharField(max_length=100, help_text="Имя зарегистрированной задачи")
+    payload = models.JSONField(default=dict, help_text="Аргументы задачи")
+    status = models.CharField(
+        max_length=16, choices=Status.choices, default=Status.QUEUED
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=1)
+    # Не раньше этого времени: отложенный запуск и пауза перед повтором
+    run_at = models.DateTimeField(default=timezone.now)
+    # Начало текущей попытки; задача, зависшая дольше JOBS_LEASE_TIMEOUT
+    # (воркер упал), возвращается в очередь
+    locked_at = models.DateTimeField(null=True, blank=True)
+    progress = models.JSONField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "jobs"
+        verbose_name = "Фоновая задача"
+        verbose_name_plural = "Фоновые задачи"
+        indexes = [
+            # Выбор следующей задачи читает только задачи в очереди
+            models.Index(
+                fields=["run_at", "id"],
+                name="jobs_queued_idx",
+                condition=models.Q(status="queued"),
+            ),
+            models.Index(
+                fields=["locked_at"],
+                name="jobs_running_idx",
+                condition=models.Q(status="running"),
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Job {self.id} {self.task} ({self.status})"
+
+    def report_progress(self, **progress: Any) -> None:
+        """
+        Сохранить прогресс отдельным UPDATE, видимым до конца задачи.
+        Продлевает locked_at: долгая задача, которая отчитывается чаще
+        JOBS_LEASE_TIMEOUT, не считается зависшей.
+        """
+        lease = self.locked_at
+        self.progress = progress
+        self.locked_at = timezone.now()
+        # Задачу, забранную другой попыткой после истечения аренды, не трогаем
+        Job.objects.filter(pk=self.pk, status=self.Status.RUNNING, locked_at=lease).update(
+            progress=progress, locked_at=self.locked_at
+        )
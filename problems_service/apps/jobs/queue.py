@@ -0,0 +1,203 @@
+"""
+Очередь фоновых задач без внешнего брокера: задачи - строки таблицы
+jobs, воркеры - процессы manage.py run_jobs.
+
+Задача ставится в очередь в той же транзакции, что и данные, которые
+ей нужны (enqueue внутри atomic), и не потеряется при откате. Воркер
+коротко блокирует следующую задачу (FOR UPDATE SKIP LOCKED), помечает
+ее running и выполняет уже вне транзакции, поэтому длинные задачи могут
+коммитить работу частями. Ошибка возвращает задачу в очередь
+с экспоненциальной паузой, пока не кончатся попытки.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, TypeVar
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.jobs.models import Job
+
+logger = logging.getLogger(__name__)
+
+TaskFunction = Callable[..., Any]
+_TF = TypeVar("_TF", bound=TaskFunction)
+
+
+@dataclass(frozen=True)
+class Task:
+    name: str
+    function: TaskFunction
+    max_attempts: int
+
+
+TASKS: dict[str, Task] = {}
+
+
+def task(name: str, max_attempts: int | None = None) -> Callable[[_TF], _TF]:
+    """
+    Регистрирует функцию задачи: function(job, **payload) -> результат
+    (JSON). Задачи должны быть идемпотентными: после ошибки или падения
+    воркера задача выполняется заново; неидемпотентные регистрируются
+    с max_attempts=1.
+    """
+
+    def register(function: _TF) -> _TF:
+        TASKS[name] = Task(
+            name, function, max_attempts or settings.JOBS_MAX_ATTEMPTS
+        )
+        return function
+
+    return register
+
+
+def enqueue(
+    name: str,
+    payload: dict[str, Any] | None = None,
+    run_at: datetime | None = None,
+) -> Job:
+    if name not in TASKS:
+        raise KeyError(f"Unknown task {name!r}")
+    job = Job.objects.create(
+        task=name,
+        payload=payload or {},
+        max_attempts=TASKS[name].max_attempts,
+        run_at=run_at or timezone.now(),
+    )
+    logger.info("Enqueued job %s %s", job.id, name)
+    return job
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Пауза перед повтором: JOBS_RETRY_BACKOFF * 2^(attempts - 1) секунд"""
+    return timedelta(seconds=settings.JOBS_RETRY_BACKOFF * 2 ** (attempts - 1))
+
+
+def claim_job() -> Job | None:
+    """Следующая задача очереди; занятые другими воркерами пропускаются"""
+    now = timezone.now()
+    with transaction.atomic():
+        job = (
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=Job.Status.QUEUED, run_at__lte=now)
+            .order_by("run_at", "id")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = Job.Status.RUNNING
+        job.attempts += 1
+        job.locked_at = now
+        job.save(update_fields=["status", "attempts", "locked_at"])
+    return job
+
+
+def requeue_stale() -> int:
+    """
+    Вернуть в очередь задачи упавших воркеров (дольше JOBS_LEASE_TIMEOUT).
+    Задача без оставшихся попыток завершается ошибкой: неидемпотентные
+    задачи (max_attempts=1) не выполняются повторно.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(
+        status=Job.Status.RUNNING,
+        locked_at__lt=now - timedelta(seconds=settings.JOBS_LEASE_TIMEOUT),
+    )
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status=Job.Status.FAILED,
+        locked_at=None,
+        finished_at=now,
+        error="Worker lost: lease expired",
+    )
+    requeued = stale.update(status=Job.Status.QUEUED, locked_at=None)
+    if failed:
+        logger.error("Failed %s stale jobs without attempts left", failed)
+    if requeued:
+        logger.warning("Requeued %s stale jobs", requeued)
+    return requeued
+
+
+def finish_job(job: Job, lease: datetime | None, fields: list[str]) -> bool:
+    """
+    Сохранить итог попытки, только если задача все еще занята этой
+    попыткой: после истечения аренды задачу могла забрать другая.
+    """
+    updated = Job.objects.filter(
+        pk=job.pk, status=Job.Status.RUNNING, locked_at=lease
+    ).update(**{field: getattr(job, field) for field in fields})
+    if not updated:
+        logger.warning(
+            "Job %s %s lease lost, attempt %s result dropped",
+            job.id, job.task, job.attempts,
+        )
+    return bool(updated)
+
+
+def run_job(job: Job) -> None:
+    """Выполнить занятую задачу и сохранить результат или ошибку"""
+    try:
+        registered = TASKS[job.task]
+        result = registered.function(job, **job.payload)
+    except Exception as exc:
+        # report_progress продлевает аренду и обновляет job.locked_at
+        lease = job.locked_at
+        job.error = f"{type(exc).__name__}: {exc}"
+        job.locked_at = None
+        if job.attempts < job.max_attempts:
+            job.status = Job.Status.QUEUED
+            job.run_at = timezone.now() + retry_delay(job.attempts)
+            logger.warning(
+                "Job %s %s failed (attempt %s/%s), retry at %s",
+                job.id, job.task, job.attempts, job.max_attempts, job.run_at,
+                exc_info=True,
+            )
+        else:
+            job.status = Job.Status.FAILED
+            job.finished_at = timezone.now()
+            logger.error(
+                "Job %s %s failed after %s attempts",
+                job.id, job.task, job.attempts,
+                exc_info=True,
+            )
+        finish_job(
+            job, lease, ["status", "error", "locked_at", "run_at", "finished_at"]
+        )
+        return
+
+    lease = job.locked_at
+    job.status = Job.Status.SUCCEEDED
+    job.result = result
+    job.locked_at = None
+    job.finished_at = timezone.now()
+    if finish_job(job, lease, ["status", "result", "locked_at", "finished_at"]):
+        logger.info("Job %s %s succeeded", job.id, job.task)
+
+
+def run_pending(limit: int | None = None) -> int:
+    """Выполнять задачи, пока очередь не опустеет; число выполненных"""
+    processed = 0
+    while limit is None or processed < limit:
+        job = claim_job()
+        if job is None:
+            break
+        run_job(job)
+        processed += 1
+    return processed
+
+
+def work(stop: threading.Event, poll_interval: float) -> None:
+    """Цикл потока воркера до установки stop"""
+    try:
+        while not stop.is_set():
+            close_old_connections()
+            requeue_stale()
+            if not run_pending(limit=1):
+                stop.wait(poll_interval)
+    finally:
+        # У каждого потока свое соединение с базой
+        connection.close()
@@ -0,0 +1,236 @@
+import threading
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.answers.models import Answer
+from apps.jobs.models import Job
+from apps.jobs.queue import claim_job, enqueue, requeue_stale, run_pending, task
+from apps.questions.models import Question
+
+calls = []
+
+
+@task('tests.echo')
+def echo(job, value):
+    calls.append(value)
+    job.report_progress(done=1)
+    return {'value': value}
+
+
+@task('tests.fail', max_attempts=2)
+def fail(job):
+    raise RuntimeError('сбой')
+
+
+@task('tests.once', max_attempts=1)
+def once(job):
+    calls.append(job.id)
+
+
+@task('tests.reclaimed')
+def reclaimed(job):
+    # Аренда истекла, и задачу забрала другая попытка
+    Job.objects.filter(pk=job.pk).update(
+        attempts=job.attempts + 1, locked_at=timezone.now() + timedelta(seconds=1)
+    )
+    job.report_progress(done=1)
+    return {'stale': True}
+
+
+@pytest.fixture(autouse=True)
+def clear_calls():
+    calls.clear()
+
+
+@pytest.mark.django_db
+class TestQueue:
+    """Тесты очереди фоновых задач"""
+
+    def test_run(self):
+        """Тест выполнения задачи и сохранения результата"""
+        job = enqueue('tests.echo', {'value': 42})
+
+        assert run_pending() == 1
+
+        job.refresh_from_db()
+        assert calls == [42]
+        assert job.status == Job.Status.SUCCEEDED
+        assert job.result == {'value': 42}
+        assert job.progress == {'done': 1}
+        assert job.attempts == 1 and job.finished_at is not None
+
+    def test_unknown_task(self):
+        """Тест постановки незарегистрированной задачи"""
+        with pytest.raises(KeyError):
+            enqueue('tests.missing')
+
+    def test_delayed(self):
+        """Тест отложенной задачи"""
+        enqueue('tests.echo', {'value': 1}, run_at=timezone.now() + timedelta(hours=1))
+
+        assert run_pending() == 0
+
+    def test_retry_with_backoff(self, settings):
+        """Тест повтора с паузой и ошибки после последней попытки"""
+        settings.JOBS_RETRY_BACKOFF = 60
+        job = enqueue('tests.fail')
+
+        run_pending()
+        job.refresh_from_db()
+        assert job.status == Job.Status.QUEUED
+        assert job.error == 'RuntimeError: сбой'
+        assert job.run_at > timezone.now() + timedelta(seconds=50)
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        run_pending()
+        job.refresh_from_db()
+        assert job.status == Job.Status.FAILED
+        assert job.attempts == 2
+
+    def test_requeue_stale(self, settings):
+        """Тест возврата в очередь задачи упавшего воркера"""
+        settings.JOBS_LEASE_TIMEOUT = 60
+        job = enqueue('tests.echo', {'value': 1})
+        claim_job()
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(minutes=5))
+
+        assert requeue_stale() == 1
+        assert run_pending() == 1
+        assert Job.objects.get(pk=job.pk).attempts == 2
+
+    def test_stale_without_attempts_fails(self, settings):
+        """Тест: задача без оставшихся попыток не выполняется повторно"""
+        settings.JOBS_LEASE_TIMEOUT = 60
+        job = enqueue('tests.once')
+        claim_job()
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(minutes=5))
+
+        assert requeue_stale() == 0
+        assert run_pending() == 0
+
+        job.refresh_from_db()
+        assert calls == []
+        assert job.status == Job.Status.FAILED
+        assert job.locked_at is None and job.finished_at is not None
+        assert 'lease expired' in job.error
+
+    def test_lost_lease_result_dropped(self):
+        """Тест: попытка с истекшей арендой не перезаписывает новую"""
+        job = enqueue('tests.reclaimed')
+
+        assert run_pending() == 1
+
+        job.refresh_from_db()
+        assert job.status == Job.Status.RUNNING
+        assert job.attempts == 2
+        assert job.result is None and job.progress is None
+
+    def test_burst_command(self):
+        """Тест команды воркера в режиме --burst"""
+        enqueue('tests.echo', {'value': 1})
+        enqueue('tests.echo', {'value': 2})
+
+        call_command('run_jobs', '--burst')
+
+        assert calls == [1, 2]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_claim_skips_locked_jobs():
+    """Тест пропуска задачи, заблокированной другим воркером"""
+    first = enqueue('tests.echo', {'value': 1})
+    second = enqueue('tests.echo', {'value': 2})
+    locked, release = threading.Event(), threading.Event()
+
+    def hold_lock():
+        with transaction.atomic():
+            Job.objects.select_for_update().get(pk=first.pk)
+            locked.set()
+            release.wait(5)
+        connection.close()
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    locked.wait(5)
+    try:
+        claimed = claim_job()
+    finally:
+        release.set()
+        holder.join()
+
+    assert claimed.pk == second.pk
+
+
+@pytest.mark.django_db
+class TestJobsAPI:
+    """Тесты статуса задач и постановки работы в очередь из API"""
+
+    @pytest.fixture
+    def api_client(self):
+        return APIClient()
+
+    def test_status(self, api_client):
+        """Тест эндпоинта статуса"""
+        job = enqueue('tests.echo', {'value': 1})
+
+        response = api_client.get(reverse('api:jobs:job-detail', kwargs={'pk': job.pk}))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['status'] == 'queued'
+        assert response.data['task'] == 'tests.echo'
+
+    def test_status_not_found(self, api_client):
+        """Тест статуса несуществующей задачи"""
+        response = api_client.get(reverse('api:jobs:job-detail', kwargs={'pk': 999}))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_async_bulk_create(self, api_client):
+        """Тест массовой загрузки через очередь"""
+        question = Question.objects.create(text="Вопрос для загрузки?")
+        items = [
+            {'user_id': 'user_1', 'text': 'Первый'},
+            {'user_id': 'user_2', 'text': ''},
+            {'user_id': 'user_3', 'text': 'Третий'},
+        ]
+
+        response = api_client.post(
+            reverse('api:answers:question-answer-bulk-create', kwargs={'question_id': question.id})
+            + '?async=true',
+            items,
+            format='json',
+        )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response['Location'].endswith(
+            reverse('api:jobs:job-detail', kwargs={'pk': response.data['id']})
+        )
+        assert not Answer.objects.filter(question=question).exists()
+
+        run_pending()
+
+        result = api_client.get(response['Location']).data
+        assert result['status'] == 'succeeded'
+        assert result['result']['created'] == 2
+        assert [error['index'] for error in result['result']['errors']] == [1]
+        assert Answer.objects.filter(question=question).count() == 2
+
+    def test_question_delete_enqueues_purge(self, api_client):
+        """Тест очистки удаленного вопроса фоновой задачей"""
+        question = Question.objects.create(text="Вопрос на удаление?")
+        Answer.objects.create(question=question, user_id='user_1', text='Ответ')
+
+        api_client.delete(reverse('api:questions:question-detail', kwargs={'pk': question.id}))
+        run_pending()
+
+        job = Job.objects.get(task='questions.purge')
+        assert job.status == Job.Status.SUCCEEDED
+        assert job.progress == {'deleted': 1, 'total': 1}
+        assert not Question.all_objects.filter(id=question.id).exists()
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from .cache import invalidate_questions
 from .models import Question
 
 
@@ -26,9 +27,16 @@ class QuestionAdmin(admin.ModelAdmin):
 
     def answers_count(self, obj):
         """Количество ответов на вопрос"""
-        return obj.answers.count()
+        return obj.answers_count
     answers_count.short_description = 'Количество ответов'
+    answers_count.admin_order_field = 'answers_count'
 
     def get_queryset(self, request):
         """Оптимизация запроса с подсчетом ответов"""
-        return super().get_queryset(request).prefetch_related('answers')
\ No newline at end of file
+        return super().get_queryset(request).with_answers_count()
+
+    def delete_queryset(self, request, queryset):
+        """Удаление выбранных одним запросом минует Question.delete: сброс кэша здесь"""
+        question_ids = list(queryset.values_list('id', flat=True))
+        super().delete_queryset(request, queryset)
+        invalidate_questions(question_ids)
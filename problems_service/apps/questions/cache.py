@@ -0,0 +1,62 @@
+import time
+from typing import Iterable
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.db import transaction
+
+# Версия списка вопросов меняется при любом изменении вопросов и ответов,
+# версия вопроса - при изменении самого вопроса или его ответов.
+QUESTIONS_VERSION_KEY = "questions:version"
+
+
+def question_version_key(question_id: int) -> str:
+    return f"question:{question_id}:version"
+
+
+def get_api_cache() -> BaseCache:
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def get_versions(keys: list[str]) -> dict[str, int]:
+    """
+    Текущие версии (время последнего изменения в наносекундах).
+    Вытесненная или истекшая версия создается заново, поэтому старые
+    записи с ней больше не совпадут. Версии живут API_CACHE_VERSION_TIMEOUT:
+    ключ запроса к несуществующему id не остается в кэше навсегда.
+    """
+    cache = get_api_cache()
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        now = time.time_ns()
+        for key in missing:
+            cache.add(key, now, timeout=settings.API_CACHE_VERSION_TIMEOUT)
+        versions.update(cache.get_many(missing))
+    return {key: versions.get(key, 0) for key in keys}
+
+
+def bump_versions(keys: list[str]) -> None:
+    """Смена версий вместо поиска и удаления ключей закэшированных ответов"""
+    cache = get_api_cache()
+
+    def bump() -> None:
+        cache.set_many(
+            {key: time.time_ns() for key in keys},
+            timeout=settings.API_CACHE_VERSION_TIMEOUT,
+        )
+
+    bump()
+    # Повтор после коммита: запросы, прочитавшие данные до коммита,
+    # не должны оставить в кэше устаревший ответ с новой версией
+    transaction.on_commit(bump)
+
+
+def invalidate_questions(question_ids: Iterable[int]) -> None:
+    bump_versions(
+        [QUESTIONS_VERSION_KEY, *(question_version_key(pk) for pk in question_ids)]
+    )
+
+
+def invalidate_question(question_id: int) -> None:
+    invalidate_questions([question_id])
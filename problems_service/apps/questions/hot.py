@@ -0,0 +1,165 @@
+"""
+Рейтинг "горячих" вопросов для GET /api/questions/hot/.
+
+Вклад ответа убывает вдвое за HOT_QUESTIONS_HALF_LIFE часов, и рейтинг
+вопроса в момент now равен Σ 2^(-(now - t_i) / half_life) по его ответам.
+Множитель 2^(-now / half_life) общий для всех вопросов и не меняет
+порядок, поэтому хранится логарифм суммы от фиксированной точки отсчета:
+
+    score = ln Σ exp(x_i),  x_i = (t_i - HOT_EPOCH) * ln 2 / half_life
+
+Такой score не устаревает со временем и меняется одной атомарной
+командой на ответ: добавление - logaddexp(score, x), удаление -
+ln(exp(score) - exp(x)). Лента читается по индексу score, таблица
+ответов при этом не просматривается.
+"""
+
+import math
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Iterable
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from apps.questions.models import QuestionRank
+
+if TYPE_CHECKING:
+    from apps.answers.models import Answer
+
+HOT_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+# Если удаляемый ответ дает почти весь рейтинг, ln(1 - exp(x - score))
+# теряет точность: такой вопрос пересчитывается по своим ответам
+FORGET_PRECISION = 1e-6
+
+TABLE = QuestionRank._meta.db_table
+
+RECORD_SQL = f"""
+    INSERT INTO {TABLE} AS rank (question_id, score, answers_count, last_answer_at)
+    VALUES {{values}}
+    ON CONFLICT (question_id) DO UPDATE SET
+        score = CASE
+            WHEN rank.score IS NULL THEN EXCLUDED.score
+            ELSE GREATEST(rank.score, EXCLUDED.score)
+                + LN(1 + EXP(-ABS(rank.score - EXCLUDED.score)))
+        END,
+        answers_count = rank.answers_count + EXCLUDED.answers_count,
+        last_answer_at = GREATEST(rank.last_answer_at, EXCLUDED.last_answer_at)
+"""
+
+FORGET_SQL = f"""
+    UPDATE {TABLE} SET
+        score = CASE
+            WHEN answers_count <= 1 OR score IS NULL OR %(x)s >= score - %(precision)s
+                THEN NULL
+            ELSE score + LN(1 - EXP(%(x)s - score))
+        END,
+        answers_count = GREATEST(answers_count - 1, 0),
+        last_answer_at = (
+            SELECT MAX(created_at) FROM answers WHERE question_id = %(question_id)s
+        )
+    WHERE question_id = %(question_id)s
+    RETURNING score IS NULL AND answers_count > 0
+"""
+
+# MAX(x) вычитается перед EXP, чтобы не переполнить float8
+REBUILD_SQL = f"""
+    INSERT INTO {TABLE} (question_id, score, answers_count, last_answer_at)
+    SELECT question_id, peak + LN(SUM(EXP(x - peak))), COUNT(*), MAX(created_at)
+    FROM (
+        SELECT question_id, created_at, x, MAX(x) OVER (PARTITION BY question_id) AS peak
+        FROM (
+            SELECT
+                question_id,
+                created_at,
+                EXTRACT(EPOCH FROM created_at - %(epoch)s)::float8 * %(rate)s AS x
+            FROM answers
+            {{where}}
+        ) AS weights
+    ) AS peaks
+    GROUP BY question_id, peak
+"""
+
+
+def decay_rate() -> float:
+    """Показатель экспоненты на секунду"""
+    return math.log(2) / (settings.HOT_QUESTIONS_HALF_LIFE * 3600)
+
+
+def answer_weight(created_at: datetime) -> float:
+    """x_i ответа: логарифм его вклада в рейтинг"""
+    return (created_at - HOT_EPOCH).total_seconds() * decay_rate()
+
+
+def logsumexp(values: list[float]) -> float:
+    peak = max(values)
+    return peak + math.log(sum(math.exp(value - peak) for value in values))
+
+
+def record_answers(answers: Iterable["Answer"]) -> None:
+    """Учесть новые ответы: одна команда INSERT ... ON CONFLICT на пачку"""
+    weights: dict[int, list[float]] = defaultdict(list)
+    last_answer_at: dict[int, datetime] = {}
+    for answer in answers:
+        weights[answer.question_id].append(answer_weight(answer.created_at))
+        last = last_answer_at.get(answer.question_id)
+        if last is None or answer.created_at > last:
+            last_answer_at[answer.question_id] = answer.created_at
+    if not weights:
+        return
+
+    # Строки блокируются в порядке question_id, чтобы параллельные
+    # пачки не ждали друг друга по кругу
+    question_ids = sorted(weights)
+    params: list[Any] = []
+    for question_id in question_ids:
+        params.extend(
+            [
+                question_id,
+                logsumexp(weights[question_id]),
+                len(weights[question_id]),
+                last_answer_at[question_id],
+            ]
+        )
+    values = ", ".join(["(%s, %s, %s, %s)"] * len(question_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(RECORD_SQL.format(values=values), params)
+
+
+def record_answer(answer: "Answer") -> None:
+    record_answers([answer])
+
+
+def forget_answer(question_id: int, created_at: datetime) -> None:
+    """Убрать вклад удаленного ответа (вызывается после удаления)"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            FORGET_SQL,
+            {
+                "question_id": question_id,
+                "x": answer_weight(created_at),
+                "precision": FORGET_PRECISION,
+            },
+        )
+        row = cursor.fetchone()
+    if row is not None and row[0]:
+        rebuild_ranks([question_id])
+
+
+def rebuild_ranks(question_ids: list[int] | None = None) -> int:
+    """
+    Пересчет рейтинга по таблице ответов: всех вопросов или только
+    question_ids. Возвращает число вопросов с ответами.
+    """
+    params: dict[str, Any] = {"epoch": HOT_EPOCH, "rate": decay_rate()}
+    if question_ids is None:
+        delete_sql, where = f"DELETE FROM {TABLE}", ""
+    else:
+        delete_sql = f"DELETE FROM {TABLE} WHERE question_id = ANY(%(question_ids)s)"
+        where = "WHERE question_id = ANY(%(question_ids)s)"
+        params["question_ids"] = list(question_ids)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(delete_sql, params)
+        cursor.execute(REBUILD_SQL.format(where=where), params)
+        return int(cursor.rowcount)
@@ -0,0 +1,44 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from apps.questions.purge import (
+    DEFAULT_PURGE_BATCH_SIZE,
+    PurgeProgress,
+    purge_deleted_questions,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Фоновая очистка удаленных вопросов: ответы удаляются пачками "
+        "по --batch-size строк, каждая в своей транзакции"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_PURGE_BATCH_SIZE)
+        parser.add_argument(
+            "--loop", action="store_true", help="Работать постоянно, как воркер"
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Пауза между проверками в режиме --loop, секунды",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        while True:
+            purged = purge_deleted_questions(options["batch_size"], self.report)
+            if purged:
+                self.stderr.write(f"Purged {len(purged)} questions")
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
+
+    def report(self, progress: PurgeProgress) -> None:
+        self.stderr.write(
+            f"Question {progress.question_id}: "
+            f"{progress.deleted}/{progress.total} answers deleted"
+        )
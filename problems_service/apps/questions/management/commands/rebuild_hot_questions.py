@@ -0,0 +1,19 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from apps.questions.cache import QUESTIONS_VERSION_KEY, bump_versions
+from apps.questions.hot import rebuild_ranks
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчет рейтинга ленты /api/questions/hot/ по всем ответам: "
+        "после первого развертывания, смены HOT_QUESTIONS_HALF_LIFE "
+        "или удаления ответов в обход Answer.delete"
+    )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        ranked = rebuild_ranks()
+        bump_versions([QUESTIONS_VERSION_KEY])
+        self.stderr.write(f"Ranked {ranked} questions")
@@ -0,0 +1,89 @@
+import os
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from apps.questions.seed import (
+    DEFAULT_SEED_CHUNK_SIZE,
+    SeedOptions,
+    SeedProgress,
+    seed,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Тестовые данные: вопросы и ответы через COPY чанками в пуле процессов. "
+        "По умолчанию сначала удаляет все вопросы и ответы (TRUNCATE ... CASCADE); "
+        "при одних --seed и --chunk-size набор данных воспроизводится"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--questions", type=int, default=1000)
+        parser.add_argument("--answers", type=int, default=10000)
+        parser.add_argument(
+            "--users", type=int, default=100000, help="Число разных user_id"
+        )
+        parser.add_argument(
+            "--skew",
+            type=float,
+            default=3.0,
+            help="Неравномерность ответов по вопросам и пользователям; 1 - равномерно",
+        )
+        parser.add_argument(
+            "--days", type=int, default=365, help="Период создания данных"
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_SEED_CHUNK_SIZE)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Процессов загрузки (по умолчанию - число ядер)",
+        )
+        parser.add_argument(
+            "--append", action="store_true", help="Добавить к существующим данным"
+        )
+        parser.add_argument(
+            "--noinput",
+            "--no-input",
+            action="store_false",
+            dest="interactive",
+            help="Не спрашивать подтверждение удаления данных",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if min(options["questions"], options["answers"], options["days"]) < 0:
+            raise CommandError("Объемы и период не могут быть отрицательными")
+        if options["users"] < 1 or options["chunk_size"] < 1 or options["workers"] < 1:
+            raise CommandError("--users, --chunk-size и --workers должны быть больше 0")
+        if options["answers"] and not options["questions"]:
+            raise CommandError("Ответам нужны вопросы: задайте --questions")
+        reset = not options["append"]
+        if reset and options["interactive"]:
+            confirm = input(
+                "Все вопросы и ответы будут удалены. Введите 'yes' для продолжения: "
+            )
+            if confirm != "yes":
+                raise CommandError("Отменено")
+
+        seed(
+            SeedOptions(
+                questions=options["questions"],
+                answers=options["answers"],
+                users=options["users"],
+                skew=options["skew"],
+                days=options["days"],
+                seed=options["seed"],
+                chunk_size=options["chunk_size"],
+                workers=options["workers"],
+            ),
+            reset=reset,
+            progress=self.report,
+        )
+        self.stderr.write(
+            f"Seeded {options['questions']} questions and {options['answers']} answers"
+        )
+
+    def report(self, progress: SeedProgress) -> None:
+        self.stderr.write(f"{progress.table}: {progress.loaded}/{progress.total}")
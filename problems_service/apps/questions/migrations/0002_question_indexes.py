@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:43
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции.
+    # Если построение прервалось, в таблице остается невалидный индекс:
+    # его нужно удалить (DROP INDEX CONCURRENTLY) и повторить миграцию.
+    atomic = False
+
+    dependencies = [
+        ('questions', '0001_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AlterModelOptions(
+            name='question',
+            options={'ordering': ['id'], 'verbose_name': 'Вопрос', 'verbose_name_plural': 'Вопросы'},
+        ),
+        migrations.AlterField(
+            model_name='question',
+            name='text',
+            field=models.TextField(help_text='Текст вопроса', max_length=1000),
+        ),
+        AddIndexConcurrently(
+            model_name='question',
+            index=models.Index(fields=['created_at', 'id'], name='questions_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='question',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('text'), name='gin_trgm_ops'), name='questions_text_trgm_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0003_question_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionRank',
+            fields=[
+                ('question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='hot_rank', serialize=False, to='questions.question')),
+                ('score', models.FloatField(null=True)),
+                ('answers_count', models.PositiveIntegerField(default=0)),
+                ('last_answer_at', models.DateTimeField(null=True)),
+            ],
+            options={
+                'verbose_name': 'Рейтинг вопроса',
+                'verbose_name_plural': 'Рейтинги вопросов',
+                'db_table': 'question_ranks',
+                'indexes': [models.Index(condition=models.Q(('score__isnull', False)), fields=['-score', '-question'], name='question_ranks_score_idx')],
+            },
+        ),
+    ]
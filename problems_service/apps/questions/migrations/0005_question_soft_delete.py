@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:21
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+def foreign_key_sql(table: str, on_delete: str) -> list[str]:
+    """
+    Пересоздать внешний ключ table.question_id -> questions с заданным
+    ON DELETE под тем же именем. NOT VALID не проверяет существующие
+    строки под ACCESS EXCLUSIVE, проверка идет отдельной транзакцией.
+    """
+    find = f"""
+        SELECT conname INTO STRICT constraint_name FROM pg_constraint
+        WHERE conrelid = '{table}'::regclass AND confrelid = 'questions'::regclass
+            AND contype = 'f';
+    """
+    return [
+        f"""
+        DO $$
+        DECLARE constraint_name text;
+        BEGIN
+            {find}
+            EXECUTE format(
+                'ALTER TABLE {table} DROP CONSTRAINT %1$I, ADD CONSTRAINT %1$I '
+                'FOREIGN KEY (question_id) REFERENCES questions (id) {on_delete} '
+                'DEFERRABLE INITIALLY DEFERRED NOT VALID',
+                constraint_name
+            );
+        END $$;
+        """,
+        f"""
+        DO $$
+        DECLARE constraint_name text;
+        BEGIN
+            {find}
+            EXECUTE format('ALTER TABLE {table} VALIDATE CONSTRAINT %I', constraint_name);
+        END $$;
+        """,
+    ]
+
+
+class Migration(migrations.Migration):
+
+    # Индекс строится без блокировки записи, внешние ключи
+    # проверяются отдельно от их пересоздания
+    atomic = False
+
+    dependencies = [
+        ('questions', '0004_question_rank'),
+        ('answers', '0003_answer_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        AddIndexConcurrently(
+            model_name='question',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='questions_deleted_idx'),
+        ),
+        # Очистка удаляет строку вопроса напрямую, без коллектора Django:
+        # оставшиеся ответы и рейтинг удаляются каскадом в базе.
+        # AlterField этих полей пересоздаст ключи без ON DELETE CASCADE
+        migrations.RunSQL(
+            foreign_key_sql('answers', 'ON DELETE CASCADE'),
+            foreign_key_sql('answers', ''),
+        ),
+        migrations.RunSQL(
+            foreign_key_sql('question_ranks', 'ON DELETE CASCADE'),
+            foreign_key_sql('question_ranks', ''),
+        ),
+    ]
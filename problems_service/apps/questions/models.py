@@ -1,22 +1,90 @@
 from typing import Any
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import models, transaction
+from django.db.models.functions import Coalesce, Upper
+from django.utils import timezone
 import logging
 
+from apps.jobs.queue import enqueue
+from apps.questions.cache import invalidate_question
+
 
 logger = logging.getLogger(__name__)
 
+
+class QuestionQuerySet(models.QuerySet["Question"]):
+    def with_answers_count(self) -> "QuestionQuerySet":
+        """Количество ответов коррелированным подзапросом в том же SQL-запросе"""
+        from apps.answers.models import Answer
+
+        answers = (
+            Answer.objects.filter(question=models.OuterRef("pk"))
+            .order_by()
+            .values("question")
+            .annotate(count=models.Count("pk"))
+            .values("count")
+        )
+        return self.annotate(
+            answers_count=Coalesce(models.Subquery(answers), 0)
+        )
+
+
+BaseQuestionManager = models.Manager.from_queryset(QuestionQuerySet)
+
+
+class AllQuestionsManager(BaseQuestionManager["Question"]):
+    """Все вопросы, включая удаленные (soft delete) и еще не вычищенные"""
+
+    def get_queryset(self) -> QuestionQuerySet:
+        # tsvector нужен только поиску, не тянем его в каждый SELECT
+        return QuestionQuerySet(self.model, using=self._db).defer("search_vector")
+
+
+class QuestionManager(AllQuestionsManager):
+    """Вопросы без удаленных: удаленный вопрос скрыт из всех эндпоинтов"""
+
+    def get_queryset(self) -> QuestionQuerySet:
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Question(models.Model):
     text = models.TextField(
         max_length=1000,
         help_text="Текст вопроса"
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    # Время удаления (soft delete): ответы и сам вопрос удаляет
+    # задача questions.purge, см. apps.questions.purge
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+    search_vector = models.GeneratedField(
+        expression=SearchVector("text", config="russian"),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = QuestionManager()
+    all_objects = AllQuestionsManager()
 
     class Meta:
         db_table = 'questions'
         ordering = ['id']
         verbose_name = "Вопрос"
         verbose_name_plural = "Вопросы"
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="questions_created_idx"),
+            GinIndex(
+                OpClass(Upper("text"), name="gin_trgm_ops"),
+                name="questions_text_trgm_idx",
+            ),
+            GinIndex(fields=["search_vector"], name="questions_search_idx"),
+            # Очередь очистки: только удаленные вопросы
+            models.Index(
+                fields=["deleted_at"],
+                name="questions_deleted_idx",
+                condition=models.Q(deleted_at__isnull=False),
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"Question {self.id}"
@@ -24,13 +92,64 @@ class Question(models.Model):
     def save(self, *args: Any, **kwargs: Any) -> None:
         is_new = self.pk is None
         super().save(*args, **kwargs)
+        invalidate_question(self.id)
         if is_new:
-            logger.info(f"Created question {self.id}")
+            logger.info("Created question %s", self.id)
         else:
-            logger.info(f"Updated question {self.id}")
+            logger.info("Updated question %s", self.id)
+
+    def soft_delete(self) -> None:
+        """
+        Скрыть вопрос одной командой UPDATE, без загрузки ответов.
+        Ответы пачками удаляет фоновая задача questions.purge.
+        """
+        self.deleted_at = timezone.now()
+        with transaction.atomic():
+            updated = Question.all_objects.filter(
+                pk=self.pk, deleted_at__isnull=True
+            ).update(deleted_at=self.deleted_at)
+            if updated:
+                enqueue("questions.purge", {"question_id": self.id})
+        invalidate_question(self.id)
+        logger.info("Soft deleted question %s", self.id)
 
     def delete(self, *args: Any, **kwargs: Any) -> tuple[int, dict[str, int]]:
         question_id = self.id
         result = super().delete(*args, **kwargs)
-        logger.info(f"Deleted question {question_id} with all its answers")
-        return result
\ No newline at end of file
+        invalidate_question(question_id)
+        logger.info("Deleted question %s with all its answers", question_id)
+        return result
+
+class QuestionRank(models.Model):
+    """
+    Рейтинг активности вопроса для ленты GET /api/questions/hot/.
+    Обновляется инкрементально при добавлении и удалении ответов,
+    см. apps.questions.hot.
+    """
+
+    question = models.OneToOneField(
+        Question,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="hot_rank",
+    )
+    # ln Σ exp(x_i) по ответам, NULL - у вопроса нет ответов
+    score = models.FloatField(null=True)
+    answers_count = models.PositiveIntegerField(default=0)
+    last_answer_at = models.DateTimeField(null=True)
+
+    class Meta:
+        db_table = "question_ranks"
+        verbose_name = "Рейтинг вопроса"
+        verbose_name_plural = "Рейтинги вопросов"
+        indexes = [
+            # Страница ленты читается из начала индекса, без сортировки
+            models.Index(
+                fields=["-score", "-question"],
+                name="question_ranks_score_idx",
+                condition=models.Q(score__isnull=False),
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Rank of question {self.question_id}"
@@ -0,0 +1,96 @@
+"""
+Очистка удаленных (soft delete) вопросов.
+
+DELETE /api/questions/{id}/ только отмечает вопрос (deleted_at) и добавляет
+в очередь задачу questions.purge (apps.questions.tasks). Коллектор Django
+(on_delete=CASCADE) загрузил бы все ответы в память и удалял их одной
+транзакцией под блокировками, поэтому ответы удаляются здесь пачками
+по batch_size строк, каждая в своей транзакции. Строку вопроса затем
+удаляет одна команда, рейтинг и ответы, добавленные за время очистки,
+удаляются каскадом в базе (ON DELETE CASCADE, миграция questions.0005).
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Callable
+
+from django.db import connection, transaction
+
+from apps.answers.models import Answer
+from apps.questions.models import Question
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PURGE_BATCH_SIZE = 1000
+
+# Подзапрос читает id пачки из индекса (question_id, created_at, id)
+PURGE_BATCH_SQL = f"""
+    DELETE FROM {Answer._meta.db_table} WHERE id IN (
+        SELECT id FROM {Answer._meta.db_table}
+        WHERE question_id = %(question_id)s
+        LIMIT %(batch_size)s
+    )
+"""
+
+# Без коллектора Django и сигналов; условие защищает восстановленный вопрос
+PURGE_QUESTION_SQL = f"""
+    DELETE FROM {Question._meta.db_table}
+    WHERE id = %(question_id)s AND deleted_at IS NOT NULL
+"""
+
+
+@dataclass
+class PurgeProgress:
+    question_id: int
+    total: int
+    deleted: int = 0
+
+
+ProgressCallback = Callable[[PurgeProgress], None]
+
+
+def purge_question(
+    question_id: int,
+    batch_size: int = DEFAULT_PURGE_BATCH_SIZE,
+    progress: ProgressCallback | None = None,
+) -> PurgeProgress:
+    """Удалить ответы удаленного вопроса пачками, затем сам вопрос"""
+    state = PurgeProgress(
+        question_id, Answer.objects.filter(question_id=question_id).count()
+    )
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                PURGE_BATCH_SQL, {"question_id": question_id, "batch_size": batch_size}
+            )
+            deleted = cursor.rowcount
+        state.deleted += deleted
+        logger.info(
+            "Purged %s/%s answers of question %s",
+            state.deleted,
+            state.total,
+            question_id,
+        )
+        if progress is not None:
+            progress(state)
+        if deleted < batch_size:
+            break
+
+    with connection.cursor() as cursor:
+        cursor.execute(PURGE_QUESTION_SQL, {"question_id": question_id})
+    logger.info("Purged question %s", question_id)
+    return state
+
+
+def purge_deleted_questions(
+    batch_size: int = DEFAULT_PURGE_BATCH_SIZE,
+    progress: ProgressCallback | None = None,
+) -> list[PurgeProgress]:
+    """Очистить все удаленные вопросы в порядке удаления"""
+    question_ids = Question.all_objects.filter(deleted_at__isnull=False).order_by(
+        "deleted_at"
+    ).values_list("id", flat=True)
+    return [
+        purge_question(question_id, batch_size, progress)
+        for question_id in list(question_ids)
+    ]
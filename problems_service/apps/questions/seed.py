@@ -0,0 +1,260 @@
+"""
+Генерация тестовых данных (manage.py seed).
+
+Вопросы, затем ответы загружаются через COPY ... FROM STDIN чанками по
+chunk_size строк. Чанки выполняются в пуле из workers процессов, каждый
+чанк - в своей транзакции. Генератор случайных чисел чанка задается
+(seed, таблица, номер чанка), поэтому при одних seed и chunk_size набор
+данных не зависит от числа процессов и порядка выполнения чанков.
+
+id строк резервируются из последовательностей заранее (apps.questions.
+sequences): вопросов - одним запросом, ответов - по запросу на чанк, в
+порядке чанков. Процессы пула вставляют строки с явными id, ответы
+ссылаются на id вопросов этой загрузки. После сброса id идут с 1 и тоже
+воспроизводятся.
+
+Распределение неравномерное, как у живого сервиса: вопрос ответа
+выбирается как int(N * random() ** skew), поэтому при skew 3 почти
+половина ответов приходится на 10% вопросов; так же ответы распределены
+по пользователям. Вопросы создаются по порядку за days дней от
+SEED_EPOCH, ответы - между вопросом и концом периода.
+"""
+
+import contextlib
+import logging
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterator
+
+from django.db import connection, connections, transaction
+from django.db.models import Max
+
+from apps.answers.models import Answer
+from apps.questions.cache import (
+    QUESTIONS_VERSION_KEY,
+    bump_versions,
+    invalidate_questions,
+)
+from apps.questions.hot import rebuild_ranks
+from apps.questions.models import Question, QuestionRank
+from apps.questions.sequences import ReservedIds, reserve_ids
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEED_CHUNK_SIZE = 10000
+
+# Время данных не зависит от момента запуска
+SEED_EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+WORDS = (
+    "как почему что где когда python django postgres индекс запрос ответ "
+    "вопрос кэш очередь транзакция сервер клиент данные таблица поиск "
+    "производительность память поток процесс блокировка миграция тест "
+    "ошибка настройка логирование пагинация сериализация асинхронный"
+).split()
+
+QUESTIONS = "questions"
+ANSWERS = "answers"
+
+
+@dataclass(frozen=True)
+class SeedOptions:
+    questions: int
+    answers: int
+    users: int = 100000
+    skew: float = 3.0
+    days: int = 365
+    seed: int = 0
+    chunk_size: int = DEFAULT_SEED_CHUNK_SIZE
+    workers: int = 1
+
+    @property
+    def period(self) -> timedelta:
+        return timedelta(days=self.days)
+
+
+@dataclass(frozen=True)
+class SeedChunk:
+    table: str
+    number: int
+    start: int
+    stop: int
+    # id строк чанка по порядку и все вопросы загрузки (для ответов)
+    ids: ReservedIds
+    question_ids: ReservedIds
+    options: SeedOptions
+
+
+@dataclass
+class SeedProgress:
+    table: str
+    total: int
+    loaded: int = 0
+
+
+ProgressCallback = Callable[[SeedProgress], None]
+
+
+def chunk_random(options: SeedOptions, table: str, number: int) -> random.Random:
+    # Строковое зерно хэшируется SHA-512 и не зависит от PYTHONHASHSEED
+    return random.Random(f"{options.seed}:{table}:{number}")
+
+
+def sentence(rng: random.Random, words: int, end: str) -> str:
+    return " ".join(rng.choices(WORDS, k=words)).capitalize() + end
+
+
+def skewed(rng: random.Random, size: int, skew: float) -> int:
+    """Индекс из range(size), маленькие индексы встречаются чаще при skew > 1"""
+    return min(int(size * rng.random() ** skew), size - 1)
+
+
+def question_slot(options: SeedOptions, index: int) -> datetime:
+    """Начало интервала, в котором создан вопрос index"""
+    return SEED_EPOCH + options.period * index / options.questions
+
+
+def question_rows(chunk: SeedChunk, rng: random.Random) -> Iterator[tuple[object, ...]]:
+    options = chunk.options
+    step = options.period / options.questions
+    for index in range(chunk.start, chunk.stop):
+        yield (
+            chunk.ids[index - chunk.start],
+            sentence(rng, rng.randint(4, 12), "?"),
+            question_slot(options, index) + step * rng.random(),
+        )
+
+
+def answer_rows(chunk: SeedChunk, rng: random.Random) -> Iterator[tuple[object, ...]]:
+    options = chunk.options
+    end = SEED_EPOCH + options.period
+    for index in range(chunk.start, chunk.stop):
+        question = skewed(rng, options.questions, options.skew)
+        # Позже любого момента в интервале вопроса
+        asked = question_slot(options, question + 1)
+        yield (
+            chunk.ids[index - chunk.start],
+            chunk.question_ids[question],
+            f"user_{skewed(rng, options.users, options.skew)}",
+            sentence(rng, rng.randint(5, 40), "."),
+            asked + (end - asked) * rng.random(),
+        )
+
+
+def load_chunk(chunk: SeedChunk) -> int:
+    """Загрузить чанк через COPY в своей транзакции; выполняется в процессе пула"""
+    rng = chunk_random(chunk.options, chunk.table, chunk.number)
+    if chunk.table == QUESTIONS:
+        table, columns = Question._meta.db_table, "id, text, created_at"
+        rows = question_rows(chunk, rng)
+    else:
+        table, columns = Answer._meta.db_table, "id, question_id, user_id, text, created_at"
+        rows = answer_rows(chunk, rng)
+    with transaction.atomic(), connection.cursor() as cursor:
+        with cursor.copy(f"COPY {table} ({columns}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+    return chunk.stop - chunk.start
+
+
+def split(
+    options: SeedOptions, table: str, total: int, question_ids: ReservedIds
+) -> list[SeedChunk]:
+    """Чанки загрузки; id ответов резервируются здесь же, по запросу на чанк"""
+    chunks = []
+    for number, start in enumerate(range(0, total, options.chunk_size)):
+        stop = min(start + options.chunk_size, total)
+        ids = (
+            question_ids.part(start, stop)
+            if table == QUESTIONS
+            else reserve_ids(Answer, stop - start)
+        )
+        chunks.append(
+            SeedChunk(table, number, start, stop, ids, question_ids, options)
+        )
+    return chunks
+
+
+def load_chunks(
+    chunks: list[SeedChunk], workers: int, progress: ProgressCallback | None
+) -> None:
+    if not chunks:
+        return
+    state = SeedProgress(chunks[0].table, chunks[-1].stop)
+    with contextlib.ExitStack() as stack:
+        loaded: Iterator[int]
+        if workers <= 1:
+            loaded = map(load_chunk, chunks)
+        else:
+            # Соединения не должны наследоваться дочерними процессами
+            connections.close_all()
+            pool = ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context("fork")
+            )
+            # При ошибке оставшиеся чанки не запускаются
+            stack.callback(pool.shutdown, cancel_futures=True)
+            loaded = pool.map(load_chunk, chunks)
+        for rows in loaded:
+            state.loaded += rows
+            if progress is not None:
+                progress(state)
+
+
+def seed_tables() -> str:
+    return ", ".join(
+        model._meta.db_table for model in (Question, Answer, QuestionRank)
+    )
+
+
+def truncate() -> None:
+    """Сброс данных: TRUNCATE без коллектора Django, id снова с 1"""
+    last_id = Question.all_objects.aggregate(last_id=Max("id"))["last_id"] or 0
+    with connection.cursor() as cursor:
+        cursor.execute(f"TRUNCATE {seed_tables()} RESTART IDENTITY CASCADE")
+    # id будут выданы заново: закэшированные ответы старых вопросов не
+    # должны совпасть с новыми. Кэш не очищается целиком - в нем же ведра
+    # ограничения частоты
+    for start in range(1, last_id + 1, DEFAULT_SEED_CHUNK_SIZE):
+        stop = min(start + DEFAULT_SEED_CHUNK_SIZE, last_id + 1)
+        invalidate_questions(range(start, stop))
+
+
+def seed(
+    options: SeedOptions, reset: bool = True, progress: ProgressCallback | None = None
+) -> None:
+    """
+    Загрузить набор данных; reset - сначала удалить все вопросы и ответы.
+    Вызывается вне транзакции: чанки коммитятся отдельно, процессы пула
+    не увидели бы ее данных.
+    """
+    if options.answers and not options.questions:
+        raise ValueError("Ответам нужны вопросы этой же загрузки")
+    if reset:
+        truncate()
+    question_ids = reserve_ids(Question, options.questions)
+
+    load_chunks(
+        split(options, QUESTIONS, options.questions, question_ids),
+        options.workers,
+        progress,
+    )
+    load_chunks(
+        split(options, ANSWERS, options.answers, question_ids),
+        options.workers,
+        progress,
+    )
+
+    if reset:
+        rebuild_ranks()
+    elif options.answers:
+        rebuild_ranks(list(question_ids))
+    bump_versions([QUESTIONS_VERSION_KEY])
+    with connection.cursor() as cursor:
+        # Как после автоочистки: карта видимости для index-only scan и статистика
+        cursor.execute(f"VACUUM ANALYZE {seed_tables()}")
+    logger.info(
+        "Seeded %s questions and %s answers", options.questions, options.answers
+    )
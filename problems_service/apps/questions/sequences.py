@@ -0,0 +1,85 @@
+"""
+Резервирование id из последовательностей PostgreSQL.
+
+COPY ... FROM STDIN не возвращает id вставленных строк. reserve_ids
+выдает блок id одним запросом (nextval по generate_series), строки
+вставляются с явными id, и вызывающий код знает id созданных строк.
+Последовательность уже сдвинута, поэтому обычные INSERT не получат
+выданные id. При параллельных вставках id блока уникальны, но не
+обязательно идут подряд, поэтому блок хранится как отрезки подряд
+идущих значений. id строк, вставка которых откатилась, пропадают, как
+и при обычных INSERT.
+"""
+
+import itertools
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+from django.db import connection
+from django.db.models import Model
+
+RESERVE_SQL = """
+    SELECT nextval(seq.name)
+    FROM (SELECT pg_get_serial_sequence(%(table)s, %(column)s)::regclass AS name) AS seq,
+        generate_series(1, %(count)s)
+    ORDER BY 1
+"""
+
+
+@dataclass(frozen=True)
+class ReservedIds:
+    """Блок зарезервированных id по возрастанию: отрезки подряд идущих значений"""
+
+    runs: tuple[range, ...] = ()
+
+    @classmethod
+    def from_ids(cls, ids: Iterable[int]) -> "ReservedIds":
+        runs: list[range] = []
+        for value in ids:
+            if runs and value == runs[-1].stop:
+                runs[-1] = range(runs[-1].start, value + 1)
+            else:
+                runs.append(range(value, value + 1))
+        return cls(tuple(runs))
+
+    def __len__(self) -> int:
+        return sum(len(run) for run in self.runs)
+
+    def __iter__(self) -> Iterator[int]:
+        return itertools.chain.from_iterable(self.runs)
+
+    def __getitem__(self, index: int) -> int:
+        # Отрезков обычно один: просмотр не зависит от размера блока
+        offset = index
+        for run in self.runs:
+            if 0 <= offset < len(run):
+                return run[offset]
+            offset -= len(run)
+        raise IndexError(index)
+
+    def part(self, start: int, stop: int) -> "ReservedIds":
+        """id с позициями start..stop - 1"""
+        runs: list[range] = []
+        offset = 0
+        for run in self.runs:
+            low, high = max(start - offset, 0), min(stop - offset, len(run))
+            if low < high:
+                runs.append(run[low:high])
+            offset += len(run)
+        return ReservedIds(tuple(runs))
+
+
+def reserve_ids(model: type[Model], count: int) -> ReservedIds:
+    """Зарезервировать count id из последовательности первичного ключа model"""
+    if count <= 0:
+        return ReservedIds()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            RESERVE_SQL,
+            {
+                "table": connection.ops.quote_name(model._meta.db_table),
+                "column": model._meta.pk.column,
+                "count": count,
+            },
+        )
+        return ReservedIds.from_ids(row[0] for row in cursor.fetchall())
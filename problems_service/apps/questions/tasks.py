@@ -0,0 +1,27 @@
+from typing import Any
+
+from apps.jobs.models import Job
+from apps.jobs.queue import task
+from apps.questions.cache import QUESTIONS_VERSION_KEY, bump_versions
+from apps.questions.hot import rebuild_ranks
+from apps.questions.purge import DEFAULT_PURGE_BATCH_SIZE, PurgeProgress, purge_question
+
+
+@task("questions.purge")
+def purge(
+    job: Job, question_id: int, batch_size: int = DEFAULT_PURGE_BATCH_SIZE
+) -> dict[str, Any]:
+    """Очистка удаленного вопроса; повтор продолжает с оставшихся ответов"""
+
+    def report(progress: PurgeProgress) -> None:
+        job.report_progress(deleted=progress.deleted, total=progress.total)
+
+    state = purge_question(question_id, batch_size, report)
+    return {"question_id": question_id, "deleted": state.deleted}
+
+
+@task("questions.rebuild_hot")
+def rebuild_hot(job: Job) -> dict[str, Any]:
+    ranked = rebuild_ranks()
+    bump_versions([QUESTIONS_VERSION_KEY])
+    return {"ranked": ranked}
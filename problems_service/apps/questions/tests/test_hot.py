@@ -0,0 +1,234 @@
+import math
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.answers.bulk import ingest_answers
+from apps.answers.models import Answer
+from apps.api.pagination import HotQuestionsPagination
+from apps.questions.hot import answer_weight, rebuild_ranks
+from apps.questions.models import Question, QuestionRank
+
+HOT_URL = reverse('api:questions:question-hot')
+
+
+def ranks():
+    return {
+        rank.question_id: (rank.score, rank.answers_count, rank.last_answer_at)
+        for rank in QuestionRank.objects.all()
+    }
+
+
+def assert_same_ranks(expected, actual):
+    assert expected.keys() == actual.keys()
+    for question_id, (score, count, last) in expected.items():
+        assert actual[question_id][1:] == (count, last)
+        if score is None:
+            assert actual[question_id][0] is None
+        else:
+            assert actual[question_id][0] == pytest.approx(score, abs=1e-9)
+
+
+@pytest.mark.django_db
+class TestQuestionRank:
+    """Тесты инкрементального обновления рейтинга"""
+
+    @pytest.fixture
+    def question(self):
+        return Question.objects.create(text="Горячий вопрос?")
+
+    def test_answers_update_rank(self, question):
+        """Тест рейтинга после добавления ответов"""
+        first = Answer.objects.create(question=question, user_id='user_1', text='Первый')
+        second = Answer.objects.create(question=question, user_id='user_2', text='Второй')
+
+        rank = QuestionRank.objects.get(question=question)
+        expected = math.log(
+            math.exp(answer_weight(first.created_at)) + math.exp(answer_weight(second.created_at))
+        )
+        assert rank.score == pytest.approx(expected)
+        assert rank.answers_count == 2
+        assert rank.last_answer_at == second.created_at
+
+    def test_incremental_matches_rebuild(self, question):
+        """Тест совпадения инкрементального рейтинга с полным пересчетом"""
+        other = Question.objects.create(text="Другой вопрос?")
+        answers = [
+            Answer.objects.create(question=question if i % 3 else other, user_id='u', text=str(i))
+            for i in range(9)
+        ]
+        answers[4].delete()
+        answers[0].delete()
+        incremental = ranks()
+
+        rebuild_ranks()
+
+        assert_same_ranks(ranks(), incremental)
+
+    def test_delete_last_answer(self, question):
+        """Тест удаления единственного ответа"""
+        answer = Answer.objects.create(question=question, user_id='user_1', text='Ответ')
+
+        answer.delete()
+
+        rank = QuestionRank.objects.get(question=question)
+        assert (rank.score, rank.answers_count, rank.last_answer_at) == (None, 0, None)
+
+    def test_delete_dominant_answer(self, question):
+        """Тест удаления ответа, дающего почти весь рейтинг"""
+        old = Answer.objects.create(question=question, user_id='user_1', text='Старый')
+        Answer.objects.filter(pk=old.pk).update(
+            created_at=datetime(2024, 1, 2, tzinfo=timezone.utc)
+        )
+        rebuild_ranks()
+        Answer.objects.create(question=question, user_id='user_2', text='Новый').delete()
+
+        assert_same_ranks(
+            {question.id: (answer_weight(datetime(2024, 1, 2, tzinfo=timezone.utc)), 1,
+                           datetime(2024, 1, 2, tzinfo=timezone.utc))},
+            ranks(),
+        )
+
+    @pytest.mark.parametrize('use_copy', [False, True])
+    def test_bulk_ingest(self, question, use_copy):
+        """Тест рейтинга после массовой загрузки"""
+        other = Question.objects.create(text="Другой вопрос?")
+        answers = [
+            Answer(question_id=(question.id, other.id)[i % 2], user_id='u', text=str(i))
+            for i in range(7)
+        ]
+
+        ingest_answers(answers, chunk_size=3, use_copy=use_copy)
+        incremental = ranks()
+        rebuild_ranks()
+
+        assert_same_ranks(ranks(), incremental)
+        assert incremental[question.id][1] == 4
+
+    def test_move_answer(self, question):
+        """Тест переноса ответа к другому вопросу (правка в админке)"""
+        other = Question.objects.create(text="Другой вопрос?")
+        answers = [Answer.objects.create(question=question, user_id='u', text=str(i)) for i in range(3)]
+        Answer.objects.create(question=other, user_id='u', text='Ответ')
+
+        answers[1].question = other
+        answers[1].save()
+        incremental = ranks()
+        rebuild_ranks()
+
+        assert_same_ranks(ranks(), incremental)
+        assert incremental[question.id][1] == 2
+        assert incremental[other.id][1] == 2
+
+    def test_admin_bulk_delete(self, question, admin_client):
+        """Тест рейтинга после удаления выбранных ответов в админке"""
+        other = Question.objects.create(text="Другой вопрос?")
+        answers = [
+            Answer.objects.create(question=question if i % 2 else other, user_id='u', text=str(i))
+            for i in range(5)
+        ]
+
+        admin_client.post('/admin/answers/answer/', {
+            'action': 'delete_selected',
+            '_selected_action': [answer.pk for answer in answers[:3]],
+            'post': 'yes',
+        })
+        incremental = ranks()
+        rebuild_ranks()
+
+        assert Answer.objects.count() == 2
+        assert_same_ranks(ranks(), incremental)
+        assert incremental[question.id][1] == 1
+
+    def test_rebuild_command(self, question):
+        """Тест команды пересчета"""
+        Answer.objects.create(question=question, user_id='user_1', text='Ответ')
+        QuestionRank.objects.all().delete()
+
+        call_command('rebuild_hot_questions')
+
+        assert QuestionRank.objects.get(question=question).answers_count == 1
+
+
+@pytest.mark.django_db
+class TestHotQuestionsAPI:
+    """Тесты ленты горячих вопросов"""
+
+    @pytest.fixture
+    def api_client(self):
+        return APIClient()
+
+    def add_answers(self, question, *ages):
+        now = datetime.now(timezone.utc)
+        answers = [
+            Answer(question=question, user_id='u', text='Ответ', created_at=now - age)
+            for age in ages
+        ]
+        # COPY сохраняет заданный created_at, bulk_create заменил бы его
+        ingest_answers(answers, use_copy=True)
+
+    def test_order(self, api_client):
+        """Тест порядка: свежие ответы весят больше старых"""
+        busy_old = Question.objects.create(text="Много старых ответов")
+        fresh = Question.objects.create(text="Пара свежих ответов")
+        quiet = Question.objects.create(text="Без ответов")
+        self.add_answers(busy_old, *[timedelta(days=5)] * 10)
+        self.add_answers(fresh, timedelta(minutes=5), timedelta(hours=1))
+
+        response = api_client.get(HOT_URL)
+
+        assert response.status_code == status.HTTP_200_OK
+        results = response.data['results']
+        assert [item['id'] for item in results] == [fresh.id, busy_old.id]
+        assert quiet.id not in [item['id'] for item in results]
+        assert list(results[0]) == [
+            'id', 'text', 'created_at', 'answers_count', 'last_answer_at', 'score'
+        ]
+        assert results[1]['answers_count'] == 10
+
+    def test_cursor_pagination(self, api_client, monkeypatch):
+        """Тест перехода по страницам"""
+        monkeypatch.setattr(HotQuestionsPagination, 'page_size', 2)
+        questions = [Question.objects.create(text=f"Вопрос {i}") for i in range(5)]
+        for i, question in enumerate(questions):
+            self.add_answers(question, timedelta(hours=i))
+
+        seen = []
+        url = HOT_URL
+        while url:
+            response = api_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            seen.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+
+        assert seen == [question.id for question in questions]
+
+    def test_page_query_uses_rank_table(self, api_client):
+        """Тест чтения страницы без обращения к таблице ответов"""
+        question = Question.objects.create(text="Вопрос")
+        self.add_answers(question, timedelta(hours=1))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(HOT_URL)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not any('"answers"' in query['sql'] for query in queries.captured_queries)
+
+    def test_new_answer_invalidates_cache(self, api_client):
+        """Тест обновления закэшированной ленты после нового ответа"""
+        first = Question.objects.create(text="Первый")
+        second = Question.objects.create(text="Второй")
+        self.add_answers(first, timedelta(minutes=1))
+        self.add_answers(second, timedelta(days=3))
+        assert api_client.get(HOT_URL).data['results'][0]['id'] == first.id
+
+        for _ in range(3):
+            Answer.objects.create(question=second, user_id='u', text='Свежий ответ')
+
+        assert api_client.get(HOT_URL).data['results'][0]['id'] == second.id
@@ -0,0 +1,126 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.answers.models import Answer
+from apps.api.export import export_rows
+from apps.questions.models import Question, QuestionRank
+from apps.questions.purge import purge_deleted_questions, purge_question
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def question():
+    question = Question.objects.create(text="Вопрос про удаление?")
+    for i in range(5):
+        Answer.objects.create(question=question, user_id='user_1', text=f"Ответ про удаление {i}")
+    return question
+
+
+@pytest.mark.django_db
+class TestSoftDelete:
+    """Тесты мгновенного удаления вопроса"""
+
+    def test_delete_does_not_load_answers(self, api_client, question):
+        """Тест удаления без чтения и удаления ответов"""
+        url = reverse('api:questions:question-detail', kwargs={'pk': question.id})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.delete(url)
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert not any('"answers"' in query['sql'] for query in queries.captured_queries)
+        assert Answer.objects.filter(question=question).count() == 5
+        assert Question.all_objects.get(id=question.id).deleted_at is not None
+
+    def test_hidden_from_endpoints(self, api_client, question):
+        """Тест скрытия вопроса и его ответов из всех эндпоинтов"""
+        answer = question.answers.first()
+        question.soft_delete()
+
+        detail = api_client.get(reverse('api:questions:question-detail', kwargs={'pk': question.id}))
+        answers = api_client.get(
+            reverse('api:answers:answer-create', kwargs={'question_id': question.id})
+        )
+        answer_detail = api_client.get(reverse('api:answers:answer-detail', kwargs={'pk': answer.id}))
+        listing = api_client.get(reverse('api:questions:question-list-create'))
+        hot = api_client.get(reverse('api:questions:question-hot'))
+        user_answers = api_client.get(
+            reverse('api:answers:user-answer-list', kwargs={'user_id': 'user_1'})
+        )
+        search = api_client.get(reverse('api:search:search'), {'q': 'удаление'})
+
+        assert detail.status_code == status.HTTP_404_NOT_FOUND
+        assert answers.status_code == status.HTTP_404_NOT_FOUND
+        assert answer_detail.status_code == status.HTTP_404_NOT_FOUND
+        assert listing.data['results'] == []
+        assert hot.data['results'] == []
+        assert user_answers.data['results'] == []
+        assert search.data['questions'] == [] and search.data['answers'] == []
+        assert list(export_rows('answers')) == []
+
+    def test_cannot_answer_deleted(self, api_client, question):
+        """Тест добавления ответа к удаленному вопросу"""
+        question.soft_delete()
+
+        response = api_client.post(
+            reverse('api:answers:answer-create', kwargs={'question_id': question.id}),
+            {'user_id': 'user_2', 'text': 'Поздний ответ'},
+            format='json',
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestPurge:
+    """Тесты фоновой очистки удаленных вопросов"""
+
+    def test_purge_in_batches(self, question):
+        """Тест удаления ответов пачками с отчетом о прогрессе"""
+        question.soft_delete()
+        reports = []
+
+        result = purge_question(question.id, batch_size=2, progress=lambda p: reports.append(p.deleted))
+
+        assert reports == [2, 4, 5]
+        assert (result.total, result.deleted) == (5, 5)
+        assert not Answer.objects.filter(question_id=question.id).exists()
+        assert not Question.all_objects.filter(id=question.id).exists()
+        assert not QuestionRank.objects.filter(question_id=question.id).exists()
+
+    def test_purge_only_deleted(self, question):
+        """Тест очистки только удаленных вопросов"""
+        alive = Question.objects.create(text="Живой вопрос?")
+        Answer.objects.create(question=alive, user_id='user_2', text='Ответ')
+        question.soft_delete()
+
+        purged = purge_deleted_questions()
+
+        assert [progress.question_id for progress in purged] == [question.id]
+        assert Question.objects.filter(id=alive.id).exists()
+        assert alive.answers.count() == 1
+
+    def test_database_cascade(self, question):
+        """Тест каскадного удаления ответов базой при удалении строки вопроса"""
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM questions WHERE id = %s', [question.id])
+
+        assert not Answer.objects.filter(question_id=question.id).exists()
+        assert not QuestionRank.objects.filter(question_id=question.id).exists()
+
+    def test_command(self, question):
+        """Тест команды очистки"""
+        question.soft_delete()
+
+        call_command('purge_deleted_questions', '--batch-size', '3')
+
+        assert not Question.all_objects.filter(id=question.id).exists()
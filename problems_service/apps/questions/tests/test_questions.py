@@ -1,9 +1,12 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
 
 from apps.questions.models import Question
+from apps.answers.models import Answer
 
 
 @pytest.mark.django_db
@@ -104,4 +107,75 @@ class TestQuestionAPI:
             reverse('api:questions:question-detail', kwargs={'pk': question_id})
         )
         assert response.status_code == status.HTTP_204_NO_CONTENT
-        assert not Question.objects.filter(id=question_id).exists()        
\ No newline at end of file
+        assert not Question.objects.filter(id=question_id).exists()        
+
+@pytest.mark.django_db
+class TestQuestionQueryCount:
+    """Регрессионные тесты количества SQL-запросов"""
+
+    @pytest.fixture
+    def api_client(self):
+        return APIClient()
+
+    @pytest.fixture
+    def questions_with_answers(self):
+        questions = [Question.objects.create(text=f"Вопрос {i}?") for i in range(5)]
+        for question in questions:
+            for j in range(3):
+                Answer.objects.create(question=question, user_id=f"user_{j}", text="Ответ")
+        return questions
+
+    def test_list_queries(self, api_client, questions_with_answers, django_assert_num_queries):
+        """Список: COUNT для пагинации, вопросы с количеством ответов, ответы"""
+        with django_assert_num_queries(3):
+            response = api_client.get(reverse('api:questions:question-list-create'))
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['answers_count'] for item in response.data['results']] == [3] * 5
+
+    def test_detail_queries(self, api_client, questions_with_answers, django_assert_num_queries):
+        """Детали: вопрос с количеством ответов и ответы"""
+        question = questions_with_answers[0]
+        with django_assert_num_queries(2):
+            response = api_client.get(
+                reverse('api:questions:question-detail', kwargs={'pk': question.id})
+            )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['answers_count'] == 3
+
+    def test_admin_changelist_queries_do_not_grow(self, admin_client, questions_with_answers):
+        """Админка: число запросов не зависит от количества вопросов"""
+        url = reverse('admin:questions_question_changelist')
+
+        with CaptureQueriesContext(connection) as full_page:
+            response = admin_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+
+        Question.objects.filter(id__in=[q.id for q in questions_with_answers[1:]]).delete()
+        with CaptureQueriesContext(connection) as short_page:
+            admin_client.get(url)
+
+        assert len(full_page.captured_queries) == len(short_page.captured_queries)
+
+
+@pytest.mark.django_db
+class TestQuestionIndexes:
+    """Планировщик использует индексы для типовых запросов к вопросам"""
+
+    @pytest.fixture(autouse=True)
+    def questions(self):
+        Question.objects.bulk_create(Question(text=f"Вопрос номер {i}?") for i in range(500))
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE questions")
+            # На тестовом объеме чтение всей таблицы и сортировка всегда дешевле,
+            # поэтому проверяем, что индекс подходит под форму запроса
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_sort = off")
+
+    def test_latest_first(self):
+        plan = Question.objects.order_by('-created_at', '-id')[:20].explain()
+        assert 'questions_created_idx' in plan
+        assert 'Sort' not in plan
+
+    def test_text_icontains(self):
+        plan = Question.objects.filter(text__icontains='номер 42').order_by().explain()
+        assert 'questions_text_trgm_idx' in plan
@@ -0,0 +1,108 @@
+import io
+from datetime import timedelta
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db.models import Count, F, Min
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.answers.models import Answer
+from apps.questions.cache import get_api_cache
+from apps.questions.models import Question, QuestionRank
+from apps.questions.seed import SEED_EPOCH, SeedOptions, seed
+
+
+def snapshot():
+    return (
+        list(Question.all_objects.order_by('id').values_list('id', 'text', 'created_at')),
+        list(
+            Answer.objects.order_by('id').values_list(
+                'id', 'question_id', 'user_id', 'text', 'created_at'
+            )
+        ),
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSeed:
+    """Тесты генератора тестовых данных"""
+
+    def test_volume_and_distribution(self):
+        """Тест объема, времени и неравномерного распределения ответов"""
+        seed(SeedOptions(questions=50, answers=1000, users=20, days=10, chunk_size=300))
+
+        assert Question.objects.count() == 50
+        assert Answer.objects.count() == 1000
+        assert Answer.objects.values('user_id').distinct().count() <= 20
+        first, last = Question.objects.order_by('id')[:1].get(), Question.objects.order_by('-id')[:1].get()
+        assert SEED_EPOCH <= first.created_at < last.created_at < SEED_EPOCH + timedelta(days=10)
+        assert not Answer.objects.filter(created_at__lt=F('question__created_at')).exists()
+        # skew 3: первые 10% вопросов получают почти половину ответов
+        assert Answer.objects.filter(question_id__lte=first.id + 4).count() > 300
+        ranked = QuestionRank.objects.aggregate(total=Count('question_id'), first=Min('question_id'))
+        assert ranked['first'] == first.id
+        assert ranked['total'] == Answer.objects.values('question_id').distinct().count()
+
+    def test_deterministic(self):
+        """Тест воспроизводимости: один seed - один набор при любом числе процессов"""
+        options = SeedOptions(questions=30, answers=200, chunk_size=40, seed=7)
+        seed(options)
+        first = snapshot()
+
+        seed(SeedOptions(questions=30, answers=200, chunk_size=40, seed=7, workers=3))
+
+        assert snapshot() == first
+        seed(SeedOptions(questions=30, answers=200, chunk_size=40, seed=8))
+        assert snapshot() != first
+
+    def test_reset_and_append(self):
+        """Тест сброса TRUNCATE и добавления к данным, которые меняются параллельно"""
+        Question.objects.create(text="Старый вопрос?")
+
+        seed(SeedOptions(questions=10, answers=20))
+        # Вставка сервиса между загрузками получает свой id из последовательности
+        live = Question.objects.create(text="Вопрос пользователя?")
+        seed(SeedOptions(questions=5, answers=10), reset=False)
+
+        assert not Question.objects.filter(text="Старый вопрос?").exists()
+        assert live.id == 11
+        assert list(Question.objects.order_by('id').values_list('id', flat=True)) == list(range(1, 17))
+        appended = Answer.objects.filter(id__gt=20)
+        assert appended.count() == 10
+        assert set(appended.values_list('question_id', flat=True)) <= set(range(12, 17))
+        assert QuestionRank.objects.filter(question_id__gte=12).exists()
+        # Обычные вставки получают id после зарезервированных
+        question = Question.objects.create(text="Новый вопрос?")
+        assert question.id == 17
+        assert Answer.objects.create(question=question, user_id='user_1', text='Ответ').id == 31
+
+    def test_reset_keeps_other_cache_keys(self):
+        """Тест: сброс меняет версии вопросов, но не очищает кэш целиком"""
+        seed(SeedOptions(questions=1, answers=0, seed=1))
+        url = reverse('api:questions:question-detail', kwargs={'pk': 1})
+        client = APIClient()
+        cached = client.get(url).data['text']
+        get_api_cache().set('throttle:bucket', 1)
+
+        seed(SeedOptions(questions=3, answers=3, seed=2))
+
+        assert get_api_cache().get('throttle:bucket') == 1
+        text = Question.objects.get(pk=1).text
+        assert text != cached
+        assert client.get(url).data['text'] == text
+
+    def test_command(self):
+        """Тест команды seed"""
+        stderr = io.StringIO()
+
+        call_command(
+            'seed', '--questions', '5', '--answers', '15', '--workers', '1', '--noinput',
+            stderr=stderr,
+        )
+
+        assert Question.objects.count() == 5
+        assert Answer.objects.count() == 15
+        assert 'Seeded 5 questions and 15 answers' in stderr.getvalue()
+        with pytest.raises(CommandError):
+            call_command('seed', '--questions', '0', '--answers', '1', '--noinput')
@@ -0,0 +1,52 @@
+import pytest
+
+from apps.answers.models import Answer
+from apps.questions.models import Question
+from apps.questions.sequences import ReservedIds, reserve_ids
+
+
+class TestReservedIds:
+    """Тесты блока зарезервированных id"""
+
+    def test_runs(self):
+        """Тест хранения отрезками и доступа по позиции"""
+        ids = ReservedIds.from_ids([3, 4, 5, 9, 10, 12])
+
+        assert ids.runs == (range(3, 6), range(9, 11), range(12, 13))
+        assert len(ids) == 6
+        assert list(ids) == [3, 4, 5, 9, 10, 12]
+        assert [ids[i] for i in range(6)] == [3, 4, 5, 9, 10, 12]
+        with pytest.raises(IndexError):
+            ids[6]
+
+    def test_part(self):
+        """Тест выделения части блока"""
+        ids = ReservedIds.from_ids([3, 4, 5, 9, 10, 12])
+
+        assert list(ids.part(2, 5)) == [5, 9, 10]
+        assert list(ids.part(0, 0)) == []
+
+
+@pytest.mark.django_db
+class TestReserveIds:
+    """Тесты резервирования id из последовательности"""
+
+    def test_reserve(self):
+        """Тест резервирования блока одним запросом"""
+        before = Question.objects.create(text="До резерва?")
+
+        ids = reserve_ids(Question, 5)
+
+        assert list(ids) == list(range(before.id + 1, before.id + 6))
+        # Обычная вставка получает id после блока
+        assert Question.objects.create(text="После резерва?").id == before.id + 6
+
+    def test_interleaved_inserts(self):
+        """Тест уникальности id при вставках между резервами"""
+        first = reserve_ids(Answer, 3)
+        question = Question.objects.create(text="Вопрос?")
+        answer = Answer.objects.create(question=question, user_id='user_1', text='Ответ')
+        second = reserve_ids(Answer, 3)
+
+        assert len({*first, answer.id, *second}) == 7
+        assert reserve_ids(Answer, 0) == ReservedIds()
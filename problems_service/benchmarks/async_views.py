@@ -0,0 +1,214 @@
+"""
+Бенчмарк async-представлений при медленной базе.
+
+    python -m benchmarks.async_views --delay 0.05 -c 32 -n 512
+
+Каждый SQL-запрос задерживается на --delay секунд (execute_wrapper на
+соединениях), что имитирует нагруженную или удаленную базу. Одни и те же
+GET-запросы к ответам выполняются в процессе, без сети:
+
+- wsgi: WSGI-приложение в пуле из --threads потоков, как один воркер
+  gthread - одновременно обрабатывается не больше --threads запросов;
+- asgi: ASGI-приложение в цикле событий, --concurrency запросов одновременно.
+  Ожидающий базу запрос не занимает воркер, поэтому время прогона
+  определяется задержкой базы, а не числом потоков.
+
+Нужны данные в базе из настроек (python manage.py seed). Каждый одновременный
+запрос держит свое соединение, поэтому --concurrency должен быть меньше
+max_connections PostgreSQL.
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "problems_service.settings")
+# Как при SERVER_MODE=asgi: без постоянных соединений в обоих режимах
+os.environ.setdefault("DB_CONN_MAX_AGE", "0")
+django.setup()
+
+from django.core.asgi import get_asgi_application  # noqa: E402
+from django.core.wsgi import get_wsgi_application  # noqa: E402
+from django.db.backends.signals import connection_created  # noqa: E402
+
+from apps.answers.models import Answer  # noqa: E402
+
+HOST = "localhost"
+
+
+def get_paths() -> list[str]:
+    """Некэшируемые эндпоинты, каждый выполняет несколько запросов к базе"""
+    answer = Answer.objects.order_by("id").first()
+    if answer is None:
+        raise SystemExit("В базе нет ответов: сначала выполните python manage.py seed")
+    return [
+        f"/api/questions/{answer.question_id}/answers/",
+        f"/api/answers/{answer.id}/",
+        f"/api/users/{answer.user_id}/answers/",
+    ]
+
+
+def install_delay(delay: float) -> None:
+    """Задержка каждого запроса на всех новых соединениях"""
+
+    def slow_execute(
+        execute: Callable[..., Any], sql: str, params: Any, many: bool, context: Any
+    ) -> Any:
+        time.sleep(delay)
+        return execute(sql, params, many, context)
+
+    def on_connection_created(sender: Any, connection: Any, **kwargs: Any) -> None:
+        if slow_execute not in connection.execute_wrappers:
+            connection.execute_wrappers.append(slow_execute)
+
+    connection_created.connect(on_connection_created, weak=False)
+
+
+def wsgi_request(application: Any, path: str) -> int:
+    status = ""
+
+    def start_response(value: str, headers: Any, exc_info: Any = None) -> None:
+        nonlocal status
+        status = value
+
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": "",
+        "SERVER_NAME": HOST,
+        "SERVER_PORT": "80",
+        "HTTP_HOST": HOST,
+        "wsgi.input": io.BytesIO(),
+        "wsgi.errors": io.StringIO(),
+        "wsgi.url_scheme": "http",
+    }
+    result = application(environ, start_response)
+    try:
+        for _ in result:
+            pass
+    finally:
+        result.close()
+    return int(status.split()[0])
+
+
+async def asgi_request(application: Any, path: str) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [(b"host", HOST.encode())],
+        "server": (HOST, 80),
+        "client": ("127.0.0.1", 0),
+    }
+    status = 0
+    body_sent = False
+
+    async def receive() -> dict[str, Any]:
+        nonlocal body_sent
+        if body_sent:
+            # Клиент не отключается: Django отменит ожидание после ответа
+            await asyncio.Future()
+        body_sent = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await application(scope, receive, send)
+    return status
+
+
+def timed(request: Callable[[], int], latencies: list[float]) -> int:
+    started = time.perf_counter()
+    status = request()
+    latencies.append(time.perf_counter() - started)
+    return status
+
+
+def run_wsgi(paths: list[str], total: int, threads: int) -> tuple[float, list[float], int]:
+    application = get_wsgi_application()
+    latencies: list[float] = []
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        statuses = list(
+            executor.map(
+                lambda index: timed(
+                    lambda: wsgi_request(application, paths[index % len(paths)]),
+                    latencies,
+                ),
+                range(total),
+            )
+        )
+    elapsed = time.perf_counter() - started
+    return elapsed, latencies, sum(status >= 400 for status in statuses)
+
+
+async def run_asgi(
+    paths: list[str], total: int, concurrency: int
+) -> tuple[float, list[float], int]:
+    application = get_asgi_application()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(index: int) -> int:
+        async with semaphore:
+            started = time.perf_counter()
+            status = await asgi_request(application, paths[index % len(paths)])
+            latencies.append(time.perf_counter() - started)
+            return status
+
+    started = time.perf_counter()
+    statuses = await asyncio.gather(*(one(index) for index in range(total)))
+    elapsed = time.perf_counter() - started
+    return elapsed, latencies, sum(status >= 400 for status in statuses)
+
+
+def percentile(values: list[float], percent: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100)[percent - 1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=(__doc__ or "").split("\n\n")[0])
+    parser.add_argument("--delay", type=float, default=0.05, help="Задержка запроса к базе, с")
+    parser.add_argument("-n", "--requests", type=int, default=256)
+    parser.add_argument("-c", "--concurrency", type=int, default=32)
+    parser.add_argument("-t", "--threads", type=int, default=4, help="Потоки WSGI (GUNICORN_THREADS)")
+    args = parser.parse_args()
+
+    paths = get_paths()
+    install_delay(args.delay)
+
+    results = {
+        f"wsgi, {args.threads} threads": run_wsgi(paths, args.requests, args.threads),
+        f"asgi, {args.concurrency} concurrent": asyncio.run(
+            run_asgi(paths, args.requests, args.concurrency)
+        ),
+    }
+
+    print(f"{'mode':<24} {'seconds':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+    for mode, (elapsed, latencies, errors) in results.items():
+        print(
+            f"{mode:<24} {elapsed:>8.2f} {args.requests / elapsed:>8.1f} "
+            f"{percentile(latencies, 50) * 1000:>8.1f} "
+            f"{percentile(latencies, 95) * 1000:>8.1f} {errors:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
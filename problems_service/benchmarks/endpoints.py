@@ -0,0 +1,374 @@
+"""
+Бенчмарк всех эндпоинтов apps.api.urls на данных из manage.py seed.
+
+    python manage.py seed --questions 1000000 --answers 50000000
+    python -m benchmarks.endpoints -n 200 -c 4 --output before.json
+    python -m benchmarks.endpoints -n 200 -c 4 --compare before.json
+
+Запросы выполняются в процессе через WSGI-приложение (без сети и
+сервера) из --concurrency потоков, у каждого потока свое соединение.
+Для каждого эндпоинта - перцентили задержки, запросы в секунду, число
+SQL-запросов и время базы (из Server-Timing). Пишущие запросы
+выполняются в транзакции, которая откатывается, поэтому данные не
+меняются между прогонами; ограничение частоты отключено. Кэш ответов
+по умолчанию сбрасывается перед каждым запросом (--cache - оставить).
+
+Результаты сохраняются в JSON вместе с коммитом и объемом данных.
+--compare печатает изменение относительно сохраненного прогона и
+завершается с кодом 1, если p95 или пропускная способность ухудшились
+больше чем на --threshold процентов.
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator
+from urllib.parse import urlencode
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "problems_service.settings")
+# Пустой лимит отключает ограничение частоты (apps.api.throttling)
+for name in ("QUESTIONS_IP", "ANSWERS_IP", "ANSWERS_USER", "ANSWERS_BULK_IP"):
+    os.environ.setdefault(f"THROTTLE_{name}", "")
+os.environ.setdefault("SERVER_TIMING", "True")
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.contrib.sessions.backends.db import SessionStore  # noqa: E402
+from django.core.signals import request_finished, request_started  # noqa: E402
+from django.core.wsgi import get_wsgi_application  # noqa: E402
+from django.db import close_old_connections, transaction  # noqa: E402
+from django.urls import URLPattern, URLResolver, get_resolver, reverse  # noqa: E402
+
+from apps.answers.models import Answer  # noqa: E402
+from apps.jobs.models import Job  # noqa: E402
+from apps.jobs.queue import enqueue  # noqa: E402
+from apps.questions.cache import get_api_cache  # noqa: E402
+from apps.questions.models import Question, QuestionRank  # noqa: E402
+
+HOST = "localhost"
+SERVER_TIMING_DB_RE = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+
+@dataclass
+class Endpoint:
+    name: str
+    method: str
+    path: str
+    query: dict[str, str]
+    body: Any = None
+    admin: bool = False
+
+    @property
+    def label(self) -> str:
+        query = "&".join(f"{key}={value}" for key, value in self.query.items())
+        query = f"?{query}" if query else ""
+        return f"{self.method} {self.name}{query}"
+
+
+@dataclass
+class Result:
+    method: str
+    path: str
+    requests: int
+    errors: int
+    statuses: list[int]
+    p50_ms: float
+    p90_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    max_ms: float
+    rps: float
+    queries: float
+    db_ms: float
+
+
+def api_route_names(patterns: Any = None, namespace: str = "") -> Iterator[str]:
+    for pattern in patterns if patterns is not None else get_resolver().url_patterns:
+        if isinstance(pattern, URLResolver):
+            child = f"{namespace}:{pattern.namespace}" if namespace else pattern.namespace or ""
+            yield from api_route_names(pattern.url_patterns, child)
+        elif isinstance(pattern, URLPattern) and namespace.startswith("api"):
+            yield f"{namespace}:{pattern.name}"
+
+
+def get_endpoints(job: Job) -> list[Endpoint]:
+    """Запросы к каждому маршруту API на типичных объектах набора данных"""
+    # Вопрос с наибольшим числом ответов - худший случай для списков ответов
+    top = QuestionRank.objects.order_by("-answers_count").first()
+    answer = (
+        Answer.objects.filter(question_id=top.question_id).order_by("-created_at", "-id").first()
+        if top is not None
+        else None
+    )
+    if top is None or answer is None:
+        raise SystemExit("В базе нет ответов: сначала выполните python manage.py seed")
+    question_id = top.question_id
+    # Выгрузка читается целиком, поэтому только за последние сутки
+    since = answer.created_at.replace(microsecond=0) - timedelta(days=1)
+    item = {"user_id": "bench", "text": "Ответ из бенчмарка"}
+
+    def url(name: str, **kwargs: Any) -> str:
+        return reverse(f"api:{name}", kwargs=kwargs)
+
+    return [
+        Endpoint("questions:question-list-create", "GET", url("questions:question-list-create"), {}),
+        Endpoint("questions:question-list-create", "GET", url("questions:question-list-create"), {"pagination": "cursor"}),
+        Endpoint("questions:question-list-create", "POST", url("questions:question-list-create"), {}, {"text": "Вопрос из бенчмарка?"}),
+        Endpoint("questions:question-hot", "GET", url("questions:question-hot"), {}),
+        Endpoint("questions:question-detail", "GET", url("questions:question-detail", pk=question_id), {}),
+        Endpoint("questions:question-detail", "DELETE", url("questions:question-detail", pk=question_id), {}),
+        Endpoint("answers:answer-create", "GET", url("answers:answer-create", question_id=question_id), {}),
+        Endpoint("answers:answer-create", "POST", url("answers:answer-create", question_id=question_id), {}, item),
+        Endpoint("answers:question-answer-bulk-create", "POST", url("answers:question-answer-bulk-create", question_id=question_id), {}, [item] * 100),
+        Endpoint("answers:answer-bulk-create", "POST", url("answers:answer-bulk-create"), {}, [{**item, "question_id": question_id}] * 100),
+        Endpoint("answers:answer-detail", "GET", url("answers:answer-detail", pk=answer.id), {}),
+        Endpoint("answers:answer-detail", "DELETE", url("answers:answer-detail", pk=answer.id), {}),
+        Endpoint("answers:user-answer-list", "GET", url("answers:user-answer-list", user_id=answer.user_id), {}),
+        Endpoint("answers:user-answer-list", "GET", url("answers:user-answer-list", user_id=answer.user_id), {"group_by": "question"}),
+        Endpoint("export:export", "GET", url("export:export", table="answers"), {"since": since.isoformat()}),
+        Endpoint("search:search", "GET", url("search:search"), {"q": "индекс запрос"}),
+        Endpoint("jobs:job-detail", "GET", url("jobs:job-detail", pk=job.id), {}),
+        Endpoint("internal:db-pool", "GET", url("internal:db-pool"), {}, admin=True),
+        Endpoint("internal:metrics", "GET", url("internal:metrics"), {}, admin=True),
+    ]
+
+
+def admin_cookie() -> str:
+    """Сессия администратора для internal-эндпоинтов"""
+    user, _ = get_user_model().objects.get_or_create(
+        username="benchmark", defaults={"is_staff": True, "is_superuser": True}
+    )
+    session = SessionStore()
+    session["_auth_user_id"] = str(user.pk)
+    session["_auth_user_backend"] = "django.contrib.auth.backends.ModelBackend"
+    session["_auth_user_hash"] = user.get_session_auth_hash()
+    session.create()
+    return f"sessionid={session.session_key}"
+
+
+def wsgi_request(
+    application: Any, endpoint: Endpoint, cookie: str
+) -> tuple[int, dict[str, str]]:
+    status = ""
+    headers: dict[str, str] = {}
+
+    def start_response(value: str, response_headers: Any, exc_info: Any = None) -> None:
+        nonlocal status
+        status = value
+        headers.update(response_headers)
+
+    body = json.dumps(endpoint.body).encode() if endpoint.body is not None else b""
+    environ = {
+        "REQUEST_METHOD": endpoint.method,
+        "PATH_INFO": endpoint.path,
+        "QUERY_STRING": urlencode(endpoint.query),
+        "SERVER_NAME": HOST,
+        "SERVER_PORT": "80",
+        "HTTP_HOST": HOST,
+        "REMOTE_ADDR": "127.0.0.1",
+        "CONTENT_TYPE": "application/json",
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": io.StringIO(),
+        "wsgi.url_scheme": "http",
+    }
+    if endpoint.admin:
+        environ["HTTP_COOKIE"] = cookie
+    result = application(environ, start_response)
+    try:
+        for _ in result:
+            pass
+    finally:
+        result.close()
+    return int(status.split()[0]), headers
+
+
+def run_once(
+    application: Any, endpoint: Endpoint, cookie: str, use_cache: bool
+) -> tuple[float, int, int, float]:
+    """Задержка, статус, SQL-запросы и время базы одного запроса"""
+    if not use_cache:
+        get_api_cache().clear()
+    started = time.perf_counter()
+    if endpoint.method == "GET":
+        status, headers = wsgi_request(application, endpoint, cookie)
+    else:
+        # Откат: atomic представлений становятся точками сохранения
+        with transaction.atomic():
+            status, headers = wsgi_request(application, endpoint, cookie)
+            transaction.set_rollback(True)
+    latency = time.perf_counter() - started
+    match = SERVER_TIMING_DB_RE.search(headers.get("Server-Timing", ""))
+    db_ms, queries = (float(match[1]), int(match[2])) if match else (0.0, 0)
+    return latency, status, queries, db_ms
+
+
+def percentile(values: list[float], percent: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100)[percent - 1]
+
+
+def benchmark(
+    executor: ThreadPoolExecutor,
+    application: Any,
+    endpoint: Endpoint,
+    cookie: str,
+    requests: int,
+    warmup: int,
+    use_cache: bool,
+) -> Result:
+    def one(_: int) -> tuple[float, int, int, float]:
+        return run_once(application, endpoint, cookie, use_cache)
+
+    list(executor.map(one, range(warmup)))
+    started = time.perf_counter()
+    samples = list(executor.map(one, range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency * 1000 for latency, _, _, _ in samples]
+    statuses = sorted({status for _, status, _, _ in samples})
+    return Result(
+        method=endpoint.method,
+        path=endpoint.path,
+        requests=requests,
+        errors=sum(status >= 400 for _, status, _, _ in samples),
+        statuses=statuses,
+        p50_ms=round(percentile(latencies, 50), 3),
+        p90_ms=round(percentile(latencies, 90), 3),
+        p95_ms=round(percentile(latencies, 95), 3),
+        p99_ms=round(percentile(latencies, 99), 3),
+        mean_ms=round(statistics.fmean(latencies), 3),
+        max_ms=round(max(latencies), 3),
+        rps=round(requests / elapsed, 1),
+        queries=statistics.fmean(queries for _, _, queries, _ in samples),
+        db_ms=round(statistics.fmean(db for _, _, _, db in samples), 3),
+    )
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(
+    results: dict[str, dict[str, Any]], baseline: dict[str, Any], threshold: float
+) -> list[str]:
+    """Печатает изменения относительно baseline; возвращает регрессии"""
+    regressions = []
+    print(f"\n{'endpoint':<64} {'p95 ms':>18} {'req/s':>18}")
+    for label, result in results.items():
+        before = baseline["results"].get(label)
+        if before is None:
+            continue
+        p95 = (result["p95_ms"] / before["p95_ms"] - 1) * 100 if before["p95_ms"] else 0.0
+        rps = (result["rps"] / before["rps"] - 1) * 100 if before["rps"] else 0.0
+        print(
+            f"{label:<64} {before['p95_ms']:>7.1f} -> {result['p95_ms']:>7.1f} "
+            f"{before['rps']:>7.1f} -> {result['rps']:>7.1f}  ({p95:+.0f}% / {rps:+.0f}%)"
+        )
+        if p95 > threshold or rps < -threshold:
+            regressions.append(label)
+    return regressions
+
+
+def run(args: argparse.Namespace, endpoints: list[Endpoint]) -> dict[str, dict[str, Any]]:
+    missing = set(api_route_names()) - {f"api:{endpoint.name}" for endpoint in endpoints}
+    if missing:
+        print(f"Маршруты без бенчмарка: {', '.join(sorted(missing))}", file=sys.stderr)
+    application = get_wsgi_application()
+    cookie = admin_cookie()
+
+    results: dict[str, dict[str, Any]] = {}
+    print(f"{'endpoint':<64} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8} {'queries':>7} {'errors':>6}")
+    # Один пул на весь прогон: у каждого потока одно соединение с базой
+    with ThreadPoolExecutor(args.concurrency) as executor:
+        for endpoint in endpoints:
+            if args.filter not in endpoint.label:
+                continue
+            result = benchmark(
+                executor, application, endpoint, cookie,
+                args.requests, args.warmup, args.cache,
+            )
+            results[endpoint.label] = asdict(result)
+            print(
+                f"{endpoint.label:<64} {result.p50_ms:>8.1f} {result.p95_ms:>8.1f} "
+                f"{result.p99_ms:>8.1f} {result.rps:>8.1f} {result.queries:>7.1f} {result.errors:>6}",
+                flush=True,
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=(__doc__ or "").split("\n\n")[0])
+    parser.add_argument("-n", "--requests", type=int, default=100, help="Запросов на эндпоинт")
+    parser.add_argument("-c", "--concurrency", type=int, default=1)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--cache", action="store_true", help="Не сбрасывать кэш ответов")
+    parser.add_argument("-k", "--filter", default="", help="Только эндпоинты, содержащие строку")
+    parser.add_argument("--output", help="Файл JSON с результатами")
+    parser.add_argument("--compare", help="JSON предыдущего прогона")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Допустимое ухудшение, %%")
+    args = parser.parse_args()
+
+    # Строка лога на каждый запрос исказила бы время и вывод
+    logging.disable(logging.INFO)
+    # Как в тестовом клиенте: соединения потоков живут весь прогон, иначе
+    # конец запроса закрыл бы соединение внутри откатываемой транзакции
+    request_started.disconnect(close_old_connections)
+    request_finished.disconnect(close_old_connections)
+
+    job = enqueue("questions.rebuild_hot", run_at=datetime.max.replace(tzinfo=timezone.utc))
+    try:
+        results = run(args, get_endpoints(job))
+    finally:
+        job.delete()
+
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "dataset": {
+            "questions": Question.objects.count(),
+            "answers": Answer.objects.count(),
+        },
+        "options": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "cache": args.cache,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        if regressions:
+            print(f"\nРегрессии: {', '.join(regressions)}", file=sys.stderr)
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Бенчмарк рендеринга JSON: JSONRenderer (stdlib json) против ORJSONRenderer.
+
+    python -m benchmarks.json_rendering --questions 100 --answers 20
+
+Рендерится список QuestionDetailSerializer - вопросы со вложенными ответами,
+как в ответе списка вопросов. Объекты собираются в памяти, база не нужна.
+Печатается время рендеринга уже сериализованных данных и время
+сериализации вместе с рендерингом; строка "rows + orjson" - быстрый путь
+чтения представлений (row_serializer из строк .values()).
+"""
+
+import argparse
+import os
+import timeit
+from datetime import timedelta
+from typing import Any, Callable
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "problems_service.settings")
+django.setup()
+
+from django.utils import timezone  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from apps.answers.models import Answer  # noqa: E402
+from apps.api.renderers import ORJSONRenderer  # noqa: E402
+from apps.api.serializers.question_serializer import QuestionDetailSerializer  # noqa: E402
+from apps.api.serializers.row_serializer import (  # noqa: E402
+    ANSWER_FIELDS,
+    QUESTION_FIELDS,
+    Row,
+    answer_to_representation,
+    get_timezone,
+    question_to_representation,
+)
+from apps.questions.models import Question  # noqa: E402
+
+
+def make_questions(questions: int, answers: int) -> list[Question]:
+    """Вопросы с заполненным кэшем prefetch_related('answers')"""
+    now = timezone.now()
+    result = []
+    for number in range(1, questions + 1):
+        question = Question(
+            id=number,
+            text=f"Вопрос номер {number}: как ускорить сериализацию ответа API?",
+            created_at=now - timedelta(minutes=number),
+        )
+        question_answers = [
+            Answer(
+                id=number * answers + index,
+                question_id=number,
+                user_id=f"user_{index % 50}",
+                text=f"Ответ {index} на вопрос {number}. " * 4,
+                created_at=now - timedelta(seconds=index),
+            )
+            for index in range(answers)
+        ]
+        question._prefetched_objects_cache = {"answers": question_answers}  # type: ignore[attr-defined]
+        question.answers_count = answers  # type: ignore[attr-defined]
+        result.append(question)
+    return result
+
+
+def make_rows(questions: list[Question]) -> list[tuple[Row, list[Row]]]:
+    """Те же вопросы и ответы в виде строк .values()"""
+    return [
+        (
+            {field: getattr(question, field) for field in QUESTION_FIELDS},
+            [
+                {field: getattr(answer, field) for field in ANSWER_FIELDS}
+                for answer in question.answers.all()
+            ],
+        )
+        for question in questions
+    ]
+
+
+def represent_rows(rows: list[tuple[Row, list[Row]]]) -> list[Row]:
+    tz = get_timezone()
+    return [
+        question_to_representation(
+            question, tz, [answer_to_representation(answer, tz) for answer in answers]
+        )
+        for question, answers in rows
+    ]
+
+
+def best_of(function: Callable[[], Any], repeat: int, number: int) -> float:
+    """Лучшее время одного вызова, мс"""
+    return min(timeit.repeat(function, repeat=repeat, number=number)) / number * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=(__doc__ or "").split("\n\n")[0])
+    parser.add_argument("--questions", type=int, default=100)
+    parser.add_argument("--answers", type=int, default=20, help="Ответов на вопрос")
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("-n", "--number", type=int, default=20)
+    args = parser.parse_args()
+
+    questions = make_questions(args.questions, args.answers)
+    data = QuestionDetailSerializer(questions, many=True).data
+    renderers = {"json (stdlib)": JSONRenderer(), "orjson": ORJSONRenderer()}
+    rows = make_rows(questions)
+    outputs = {name: renderer.render(data) for name, renderer in renderers.items()}
+    outputs["rows"] = ORJSONRenderer().render(represent_rows(rows))
+    if len(set(outputs.values())) != 1:
+        raise SystemExit("Рендереры вернули разный JSON")
+
+    print(
+        f"{args.questions} вопросов x {args.answers} ответов, "
+        f"{len(outputs['orjson']) / 1024:.0f} КБ JSON"
+    )
+    print(f"{'renderer':<16} {'render ms':>10} {'serialize+render ms':>20}")
+    for name, renderer in renderers.items():
+        render = best_of(lambda: renderer.render(data), args.repeat, args.number)
+        full = best_of(
+            lambda: renderer.render(QuestionDetailSerializer(questions, many=True).data),
+            args.repeat,
+            max(1, args.number // 10),
+        )
+        print(f"{name:<16} {render:>10.2f} {full:>20.2f}")
+    renderer = ORJSONRenderer()
+    full = best_of(
+        lambda: renderer.render(represent_rows(rows)), args.repeat, max(1, args.number // 10)
+    )
+    print(f"{'rows + orjson':<16} {'':>10} {full:>20.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+from typing import Any, Iterator
+
+import pytest
+
+from apps.questions.cache import get_api_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_api_cache() -> Iterator[None]:
+    """Кэш ответов API не должен переживать тест: база откатывается после каждого"""
+    get_api_cache().clear()
+    yield
+    get_api_cache().clear()
+
+
+@pytest.fixture(autouse=True)
+def query_guard(settings: Any) -> None:
+    """
+    Запрос к API с N+1 или сверх query_budget представления падает
+    с QueryBudgetExceeded (apps.api.queryguard)
+    """
+    settings.QUERY_GUARD = "raise"
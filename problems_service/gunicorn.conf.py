@@ -0,0 +1,77 @@
+"""
+Конфигурация gunicorn для продакшена: gunicorn -c gunicorn.conf.py
+
+SERVER_MODE=wsgi (по умолчанию) - потоковые воркеры gthread с WSGI-приложением,
+SERVER_MODE=asgi - воркеры uvicorn с ASGI-приложением.
+
+Плавный перезапуск воркеров (новый код, без потери запросов): kill -HUP <pid мастера>.
+
+Воркеры сбрасывают метрики запросов в METRICS_DIR, и /api/internal/metrics/
+любого воркера отдает суммы по всем воркерам этого мастера.
+"""
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+from typing import Any
+
+server_mode = os.getenv("SERVER_MODE", "wsgi")
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+
+# Воркеры на ядро: каждый процесс большую часть запроса ждет PostgreSQL
+workers = int(
+    os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1)
+)
+
+if server_mode == "asgi":
+    wsgi_app = "problems_service.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+else:
+    wsgi_app = "problems_service.wsgi:application"
+    worker_class = "gthread"
+    threads = int(os.getenv("GUNICORN_THREADS", 4))
+
+# nginx держит keep-alive соединения к gunicorn (keepalive_timeout 60 с);
+# gunicorn не должен закрывать простаивающее соединение раньше nginx
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 75))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+
+# Периодический перезапуск воркеров ограничивает рост памяти;
+# jitter не дает всем воркерам перезапуститься одновременно
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 10000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 1000))
+
+# Без preload_app HUP перечитывает код приложения
+preload_app = False
+
+# Общий каталог метрик воркеров; наследуется воркерами через окружение
+metrics_dir = os.environ.setdefault(
+    "METRICS_DIR", os.path.join(tempfile.gettempdir(), "problems_service_metrics")
+)
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+def on_starting(server: Any) -> None:
+    # Ряды прошлого запуска мастера не суммируются с новыми.
+    # При HUP каталог сохраняется: суммы не убывают
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+
+def child_exit(server: Any, worker: Any) -> None:
+    # Файл воркера сливается в dead.json: каталог не растет от max_requests,
+    # новый воркер с тем же pid не затрет суммы
+    from apps.api.metrics import mark_process_dead
+
+    try:
+        mark_process_dead(worker.pid, metrics_dir)
+    except OSError:
+        server.log.warning(
+            "Failed to merge metrics of worker %s", worker.pid, exc_info=True
+        )
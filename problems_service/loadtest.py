@@ -0,0 +1,132 @@
+"""
+Нагрузочный тест API: сравнение пропускной способности разных способов запуска.
+
+    # runserver
+    python manage.py runserver 127.0.0.1:8001
+    # gunicorn
+    GUNICORN_BIND=127.0.0.1:8002 gunicorn -c gunicorn.conf.py
+
+    python loadtest.py http://127.0.0.1:8001 http://127.0.0.1:8002 -c 32 -d 30
+
+Каждый клиентский процесс держит keep-alive соединения в нескольких потоках
+и по кругу запрашивает пути из --path. Для каждого адреса печатаются
+запросы в секунду, перцентили задержки и число ошибок.
+"""
+
+import argparse
+import http.client
+import multiprocessing
+import statistics
+import threading
+import time
+from urllib.parse import quote, urlsplit
+
+DEFAULT_PATHS = [
+    "/api/questions/",
+    "/api/questions/?pagination=cursor",
+    "/api/search/?q=вопрос",
+]
+
+
+def run_thread(
+    base_url: str, paths: list[str], deadline: float, latencies: list[float]
+) -> int:
+    """Запросы по одному соединению до deadline; возвращает число ошибок"""
+    url = urlsplit(base_url)
+    connection_class = (
+        http.client.HTTPSConnection
+        if url.scheme == "https"
+        else http.client.HTTPConnection
+    )
+    connection = connection_class(url.netloc, timeout=30)
+    errors = 0
+    index = 0
+    while time.monotonic() < deadline:
+        path = quote(paths[index % len(paths)], safe="/?=&")
+        index += 1
+        started = time.perf_counter()
+        try:
+            connection.request("GET", url.path.rstrip("/") + path)
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 400:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            connection.close()
+            continue
+        latencies.append(time.perf_counter() - started)
+    connection.close()
+    return errors
+
+
+def run_process(
+    base_url: str, paths: list[str], threads: int, duration: float
+) -> tuple[list[float], int]:
+    deadline = time.monotonic() + duration
+    latencies: list[list[float]] = [[] for _ in range(threads)]
+    errors = [0] * threads
+
+    def target(number: int) -> None:
+        errors[number] = run_thread(base_url, paths, deadline, latencies[number])
+
+    workers = [
+        threading.Thread(target=target, args=(number,)) for number in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return [value for chunk in latencies for value in chunk], sum(errors)
+
+
+def percentile(values: list[float], percent: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100)[percent - 1]
+
+
+def benchmark(
+    base_url: str, paths: list[str], concurrency: int, processes: int, duration: float
+) -> dict[str, float]:
+    threads = max(1, concurrency // processes)
+    with multiprocessing.Pool(processes) as pool:
+        results = pool.starmap(
+            run_process, [(base_url, paths, threads, duration)] * processes
+        )
+    latencies = [value for chunk, _ in results for value in chunk]
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / duration,
+        "p50": percentile(latencies, 50) * 1000,
+        "p95": percentile(latencies, 95) * 1000,
+        "p99": percentile(latencies, 99) * 1000,
+        "errors": sum(errors for _, errors in results),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("targets", nargs="+", help="Базовые адреса сервера")
+    parser.add_argument("-c", "--concurrency", type=int, default=16)
+    parser.add_argument("-p", "--processes", type=int, default=4)
+    parser.add_argument("-d", "--duration", type=float, default=20)
+    parser.add_argument(
+        "--path", action="append", dest="paths", help="Путь для запросов (повторяемый)"
+    )
+    args = parser.parse_args()
+    paths = args.paths or DEFAULT_PATHS
+
+    print(f"{'target':<32} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for target in args.targets:
+        result = benchmark(
+            target, paths, args.concurrency, args.processes, args.duration
+        )
+        print(
+            f"{target:<32} {result['rps']:>9.1f} {result['p50']:>8.1f} "
+            f"{result['p95']:>8.1f} {result['p99']:>8.1f} {result['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
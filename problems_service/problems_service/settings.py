@@ -1,5 +1,6 @@
 import os
 from pathlib import Path
+from typing import Any
 
 from dotenv import load_dotenv
 
@@ -19,6 +20,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 # apps
@@ -26,6 +28,7 @@ INSTALLED_APPS += [
     "apps.api",
     "apps.questions",
     "apps.answers",
+    "apps.jobs",
 ]
 
 # packages
@@ -36,6 +39,9 @@ INSTALLED_APPS += [
 ]
 
 MIDDLEWARE = [
+    # Первым: время запроса с учетом остальных middleware
+    "apps.api.middleware.PerformanceMiddleware",
+    "apps.api.middleware.QueryGuardMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -68,15 +74,27 @@ WSGI_APPLICATION = "problems_service.wsgi.application"
 # DJANGO REST FRAMEWORK
 #######################
 REST_FRAMEWORK = {
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "apps.api.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "apps.api.renderers.ORJSONRenderer",
     ],
     "DEFAULT_PARSER_CLASSES": [
-        "rest_framework.parsers.JSONParser",
+        "apps.api.parsers.ORJSONParser",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # Token bucket на создание вопросов и ответов (apps.api.throttling):
+    # "N/период" - N жетонов, пополняемых N за период; пустое значение
+    # отключает ограничение
+    "DEFAULT_THROTTLE_RATES": {
+        "questions_ip": os.getenv("THROTTLE_QUESTIONS_IP", "30/min") or None,
+        "answers_ip": os.getenv("THROTTLE_ANSWERS_IP", "120/min") or None,
+        "answers_user": os.getenv("THROTTLE_ANSWERS_USER", "30/min") or None,
+        "answers_bulk_ip": os.getenv("THROTTLE_ANSWERS_BULK_IP", "10/min") or None,
+    },
+    # Число прокси перед приложением (nginx - 1): IP клиента берется
+    # из X-Forwarded-For, иначе REMOTE_ADDR
+    "NUM_PROXIES": int(os.environ["NUM_PROXIES"]) if os.getenv("NUM_PROXIES") else None,
 }
 
 #######################
@@ -101,11 +119,31 @@ SPECTACULAR_SETTINGS = {
             "unique",
             "max_length",
             "min_length",
-        ]
+        ],
+        "JobStatusEnum": "apps.jobs.models.Job.Status",
     },
 }
 
 
+# Пул соединений psycopg (по одному на процесс воркера) или постоянные
+# соединения с временем жизни DB_CONN_MAX_AGE секунд; вместе не используются.
+# Под ASGI запросы к базе из async-представлений выполняются в новом потоке
+# на каждый запрос, и постоянное соединение не переиспользуется, а остается
+# открытым - там по умолчанию соединение закрывается после запроса.
+DB_POOL = os.getenv("DB_POOL", "False") == "True"
+DB_CONN_MAX_AGE = int(
+    os.getenv("DB_CONN_MAX_AGE", "0" if os.getenv("SERVER_MODE") == "asgi" else "60")
+)
+DB_OPTIONS: dict[str, Any] = {}
+if DB_POOL:
+    DB_OPTIONS["pool"] = {
+        "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+        "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+        # Сколько ждать свободное соединение до PoolTimeout
+        "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+        "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+    }
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -114,6 +152,11 @@ DATABASES = {
         "PASSWORD": os.getenv("PG_PASSWORD"),
         "HOST": os.getenv("DB_HOST"),
         "PORT": os.getenv("DB_PORT"),
+        "CONN_MAX_AGE": 0 if DB_POOL else DB_CONN_MAX_AGE,
+        # Проверка соединения перед повторным использованием в новом запросе
+        # (с пулом - проверка при выдаче соединения из пула)
+        "CONN_HEALTH_CHECKS": os.getenv("DB_CONN_HEALTH_CHECKS", "True") == "True",
+        "OPTIONS": DB_OPTIONS,
     }
 }
 
@@ -147,7 +190,8 @@ USE_I18N = True
 # STATIC AND MEDIA
 ######################
 STATIC_URL = "static/"
-STATIC_ROOT = BASE_DIR / "staticdev"
+# В docker-compose статику из STATIC_ROOT раздает nginx
+STATIC_ROOT = Path(os.getenv("STATIC_ROOT", BASE_DIR / "staticdev"))
 MEDIA_URL = "media/"
 MEDIA_ROOT = BASE_DIR / "mediadev"
 
@@ -155,6 +199,81 @@ MEDIA_ROOT = BASE_DIR / "mediadev"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 
+######################
+# CACHE
+######################
+# Кэш ответов API: Redis при заданном API_CACHE_URL, иначе память процесса
+API_CACHE_ALIAS = "api"
+API_CACHE_URL = os.getenv("API_CACHE_URL")
+API_CACHE_TIMEOUT = int(os.getenv("API_CACHE_TIMEOUT", "300"))
+# Срок версий данных (apps.questions.cache): версии запрошенных
+# несуществующих вопросов не копятся; не меньше срока ответов
+API_CACHE_VERSION_TIMEOUT = max(
+    int(os.getenv("API_CACHE_VERSION_TIMEOUT", "86400")), API_CACHE_TIMEOUT
+)
+
+# Ведра ограничения частоты запросов; общие для воркеров только в Redis
+THROTTLE_CACHE_ALIAS = API_CACHE_ALIAS
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    API_CACHE_ALIAS: {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": API_CACHE_URL,
+        "KEY_PREFIX": "api",
+    }
+    if API_CACHE_URL
+    else {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "api",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+}
+
+
+######################
+# HOT QUESTIONS
+######################
+# Период полураспада вклада ответа в рейтинг ленты /api/questions/hot/, часы.
+# После изменения нужно пересчитать рейтинг: manage.py rebuild_hot_questions
+HOT_QUESTIONS_HALF_LIFE = float(os.getenv("HOT_QUESTIONS_HALF_LIFE", "24"))
+
+
+######################
+# JOBS
+######################
+# Очередь фоновых задач в таблице jobs, воркер - manage.py run_jobs
+JOBS_CONCURRENCY = int(os.getenv("JOBS_CONCURRENCY", "2"))
+JOBS_POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", "1"))
+JOBS_MAX_ATTEMPTS = int(os.getenv("JOBS_MAX_ATTEMPTS", "5"))
+# Пауза перед повтором: JOBS_RETRY_BACKOFF * 2^(попытка - 1) секунд
+JOBS_RETRY_BACKOFF = float(os.getenv("JOBS_RETRY_BACKOFF", "10"))
+# Задача без отчета о прогрессе дольше этого времени считается зависшей
+JOBS_LEASE_TIMEOUT = int(os.getenv("JOBS_LEASE_TIMEOUT", "600"))
+
+
+######################
+# METRICS
+######################
+# Заголовок Server-Timing (время SQL, сериализации и запроса целиком)
+SERVER_TIMING = os.getenv("SERVER_TIMING", "True") == "True"
+# Токен для GET /api/internal/metrics/ (Authorization: Bearer <токен>);
+# без токена метрики доступны только администраторам
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+# Каталог, куда процессы сбрасывают свои ряды метрик для общей выдачи
+# (gunicorn.conf.py задает его воркерам); пусто - только ряды процесса
+METRICS_DIR = os.getenv("METRICS_DIR") or None
+# Не чаще чем раз в столько секунд процесс перезаписывает свой файл
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "1.0"))
+# Проверка N+1 и бюджета запросов представлений (apps.api.queryguard):
+# "warn" - предупреждение в лог, "raise" - ошибка, пусто - выключено
+QUERY_GUARD = os.getenv("QUERY_GUARD", "warn" if DEBUG else "")
+# Сколько одинаковых по форме запросов за запрос считается N+1
+QUERY_GUARD_REPEAT = int(os.getenv("QUERY_GUARD_REPEAT", "3"))
+
+
 ######################
 # CORS
 ######################
@@ -169,7 +288,20 @@ CORS_ALLOWED_ORIGINS = [
 LOG_DIR = BASE_DIR / "logs"
 LOG_DIR.mkdir(exist_ok=True)
 
-LOGGING = {
+# LOG_FORMAT=json - одна JSON-строка на запись вместо текста.
+# LOG_QUEUE=True - обработчики вызываются из фонового потока QueueListener,
+# запрос только кладет запись в очередь (нужен Python 3.12+).
+# LOG_SAMPLE_RATE - доля записываемых частых сообщений "Retrieved ..."
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+LOG_QUEUE = os.getenv("LOG_QUEUE", "False") == "True"
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+LOG_FORMATTER = "json" if LOG_FORMAT == "json" else "verbose"
+# Выборка делается до постановки в очередь, чтобы не форматировать лишнее
+LOG_OUTPUT_FILTERS = [] if LOG_QUEUE else ["sampling"]
+LOG_HANDLERS = ["queue"] if LOG_QUEUE else ["file", "console"]
+
+LOGGING_CONFIG = "apps.api.log.configure_logging"
+LOGGING: dict[str, Any] = {
     "version": 1,
     "disable_existing_loggers": False,
     "formatters": {
@@ -177,29 +309,53 @@ LOGGING = {
             "format": "{levelname} {asctime} {module} {message}",
             "style": "{",
         },
+        "json": {
+            "()": "apps.api.log.JsonFormatter",
+        },
+    },
+    "filters": {
+        "sampling": {
+            "()": "apps.api.log.SamplingFilter",
+            "rate": LOG_SAMPLE_RATE,
+            "prefixes": ["Retrieved"],
+        },
     },
     "handlers": {
         "file": {
             "level": "INFO",
-            "class": "logging.FileHandler",
+            # Файл пишут все воркеры gunicorn (O_APPEND), а ротирует внешний
+            # logrotate (logrotate.conf): обработчик переоткрывает файл после
+            # переименования. RotatingFileHandler в каждом процессе ротировал
+            # бы файл сам по себе, и записи после ротации терялись бы
+            "class": "logging.handlers.WatchedFileHandler",
             "filename": os.path.join(BASE_DIR, "logs/app.log"),
-            "formatter": "verbose",
+            "encoding": "utf-8",
+            "formatter": LOG_FORMATTER,
+            "filters": LOG_OUTPUT_FILTERS,
         },
         "console": {
             "level": "INFO",
             "class": "logging.StreamHandler",
-            "formatter": "verbose",
+            "formatter": LOG_FORMATTER,
+            "filters": LOG_OUTPUT_FILTERS,
         },
     },
     "root": {
-        "handlers": ["file", "console"],
+        "handlers": LOG_HANDLERS,
         "level": "INFO",
     },
     "loggers": {
         "django": {
-            "handlers": ["file", "console"],
+            "handlers": LOG_HANDLERS,
             "level": "INFO",
             "propagate": False,
         },
     },
 }
+if LOG_QUEUE:
+    LOGGING["handlers"]["queue"] = {
+        "class": "logging.handlers.QueueHandler",
+        "handlers": ["file", "console"],
+        "respect_handler_level": True,
+        "filters": ["sampling"],
+    }